@@ -0,0 +1,204 @@
+# Benchmarks for schedule loading, event lookup and display refresh
+#
+# Usage:
+#   python -m benchmarks.bench_schedules [--quick] [--save baseline.json]
+#                                        [--compare baseline.json] [--tolerance 0.25]
+#
+# Each benchmark reports ops/sec and p50/p99 latency. --compare exits with
+# status 1 if any benchmark's p50 latency regressed by more than the tolerance.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+from constants import REGULAR_SCHEDULE
+from core.schedule_manager import ScheduleManager
+from core.schedule_snapshot import snapshot_path
+
+# (number of schedules, events per schedule)
+SCENARIOS = [(3, 10), (3, 1000), (3, 100000), (50, 100), (500, 10), (500, 200)]
+QUICK_SCENARIOS = [(3, 10), (3, 1000), (50, 100)]
+
+
+def synthetic_schedules(schedule_count, event_count):
+    """Build schedule data with evenly spread, partially overlapping events"""
+    schedules = {}
+    for s in range(schedule_count):
+        events = []
+        for i in range(event_count):
+            start = (i * 1440 // event_count + s) % 1380
+            end = start + 1 + (i % 45)
+            events.append({
+                'name': f"Event {i}",
+                'start': f"{start // 60:02d}:{start % 60:02d}",
+                'end': f"{end // 60:02d}:{end % 60:02d}",
+                'minutes': end - start
+            })
+        schedules[f"schedule_{s + 1}"] = {'name': f"Schedule {s + 1}", 'events': events}
+    return schedules
+
+
+def write_schedule_file(schedules, directory):
+    path = os.path.join(directory, 'schedules.json')
+    with open(path, 'w') as f:
+        json.dump({'southampton_high_school': schedules}, f)
+    return path
+
+
+def measure(func, repeat):
+    """Call func repeat times; return per-call latencies in seconds"""
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def summarize(latencies, ops_per_call=1):
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    p99_index = min(len(latencies) - 1, int(len(latencies) * 0.99))
+    return {
+        'calls': len(latencies),
+        'ops_per_sec': len(latencies) * ops_per_call / total if total else float('inf'),
+        'p50_us': statistics.median(latencies) / ops_per_call * 1e6,
+        'p99_us': latencies[p99_index] / ops_per_call * 1e6
+    }
+
+
+def bench_load(path, repeat):
+    manager = ScheduleManager(path)
+
+    def cold_init():
+        os.remove(snapshot_path(path))  # Force a full parse and recompile
+        ScheduleManager(path)
+
+    return {
+        'load_schedules': summarize(measure(manager.load_schedules, repeat)),
+        'manager_init': summarize(measure(lambda: ScheduleManager(path), repeat)),
+        'manager_init_cold': summarize(measure(cold_init, repeat))
+    }
+
+
+def bench_lookup(path):
+    manager = ScheduleManager(path)
+    times = [f"{m // 60:02d}:{m % 60:02d}" for m in range(1440)]
+    latencies = []
+    for time_str in times:
+        start = time.perf_counter()
+        manager.get_current_event(REGULAR_SCHEDULE, time_str)
+        latencies.append(time.perf_counter() - start)
+    return {'get_current_event': summarize(latencies)}
+
+
+_app = None
+
+
+def bench_update_events(path, repeat):
+    global _app
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from utils.settings_manager import SettingsStore
+    from windows.schedule_window import ScheduleWindow
+
+    # Leave the user's own settings alone
+    SettingsStore.use_file(os.path.join(os.path.dirname(path), 'settings.ini'))
+
+    # Keep one QApplication alive for every scenario
+    app = _app = QApplication.instance() or QApplication(sys.argv[:1])
+    from core.clock import SimulatedClock
+    window = ScheduleWindow(path)
+    clock = SimulatedClock()
+    window.set_clock(clock)
+    minutes = [datetime.now().replace(hour=m // 60, minute=m % 60) for m in range(0, 1440, 7)]
+    latencies = []
+    for i in range(repeat):
+        clock.set_time(minutes[i % len(minutes)])
+        start = time.perf_counter()
+        window.update_events()
+        latencies.append(time.perf_counter() - start)
+    window.update_scheduler.stop()
+    if window.tray_icon is not None:
+        window.tray_icon.hide()
+    window.deleteLater()
+    app.processEvents()
+    return {'update_events': summarize(latencies)}
+
+
+def run(scenarios, repeat, include_ui=True):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for schedule_count, event_count in scenarios:
+            path = write_schedule_file(synthetic_schedules(schedule_count, event_count), directory)
+            name = f"{schedule_count}x{event_count}"
+            load_repeat = max(3, min(repeat, 200000 // (schedule_count * event_count)))
+            scenario = {}
+            scenario.update(bench_load(path, load_repeat))
+            scenario.update(bench_lookup(path))
+            if include_ui:
+                scenario.update(bench_update_events(path, repeat))
+            results[name] = scenario
+            print(f"{name}:")
+            for bench, stats in scenario.items():
+                print(f"  {bench:<20} {stats['ops_per_sec']:>14,.0f} ops/s"
+                      f"  p50 {stats['p50_us']:>12,.1f} us  p99 {stats['p99_us']:>12,.1f} us")
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of regression descriptions (empty if none)"""
+    regressions = []
+    for scenario, benches in results.items():
+        for bench, stats in benches.items():
+            base = baseline.get(scenario, {}).get(bench)
+            if not base:
+                continue
+            limit = base['p50_us'] * (1 + tolerance)
+            if stats['p50_us'] > limit:
+                regressions.append(f"{scenario}/{bench}: p50 {stats['p50_us']:.1f} us "
+                                   f"> baseline {base['p50_us']:.1f} us (+{tolerance:.0%})")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule Minder benchmarks")
+    parser.add_argument('--quick', action='store_true', help="run the small scenarios only")
+    parser.add_argument('--repeat', type=int, default=200, help="calls per timed benchmark")
+    parser.add_argument('--no-ui', action='store_true', help="skip the Qt update_events benchmark")
+    parser.add_argument('--save', metavar='FILE', help="write results as a JSON baseline")
+    parser.add_argument('--compare', metavar='FILE', help="fail if slower than this baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed p50 slowdown before --compare fails (default 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run(QUICK_SCENARIOS if args.quick else SCENARIOS, args.repeat, not args.no_ui)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(),
+                       'machine': platform.machine(),
+                       'results': results}, f, indent=4)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
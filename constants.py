@@ -1,5 +1,4 @@
 import os
-from PyQt6.QtCore import QSize
 
 # Base paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -10,6 +9,15 @@ DATA_DIR = os.path.join(BASE_DIR, 'data')
 ICON_PATH = os.path.join(ASSETS_DIR, 'icons', 'clock.png')
 TEST_FILES_DIR = os.path.join(ASSETS_DIR, 'test_files')
 SCHEDULES_FILE = os.path.join(DATA_DIR, 'schedules.json')
+CALENDAR_FILE = os.path.join(DATA_DIR, 'calendar.json')
+
+# Instrumentation output (Debug menu)
+METRICS_FILE = os.path.join(DATA_DIR, 'metrics.json')
+PROFILES_DIR = os.path.join(DATA_DIR, 'profiles')
+
+# Status server ports (--serve / --connect)
+STATUS_PORT = 8765
+STATUS_HTTP_PORT = 8766
 
 # Add to existing paths
 ABOUT_FILE = os.path.join(DATA_DIR, 'about.json')
@@ -22,12 +30,12 @@ DEFAULT_COLORS = {
     "message_text_color": "#FFFFFF"
 }
 
-# Window sizes
+# Window sizes as (width, height); constants.py stays free of Qt imports
 WINDOW_SIZES = {
-    'small': QSize(305, 230),
-    'medium': QSize(445, 355),
-    'large': QSize(675, 555),
-    'test_mode': QSize(385, 320)
+    'small': (305, 230),
+    'medium': (445, 355),
+    'large': (675, 555),
+    'test_mode': (385, 320)
 }
 
 DEFAULT_WINDOW_SIZE = WINDOW_SIZES['small']
@@ -44,10 +52,10 @@ COMMON_STYLES = """
         background-color: %(window_bg_color)s;
         color: %(window_text_color)s;
     }
-    QLabel {
+    QLabel, QWidget#countdown {
         color: %(window_text_color)s;
     }
-    QLabel#regular_label, QLabel#delay_label, QLabel#homeroom_label {
+    QLabel[eventDisplay="true"] {
         background-color: %(message_bg_color)s;
         color: %(message_text_color)s;
         border: 1px solid #0000cc;
@@ -55,6 +63,10 @@ COMMON_STYLES = """
         padding: 2px 5px;
         qproperty-alignment: 'AlignLeft | AlignVCenter';
     }
+    QScrollArea, QWidget#schedule_container {
+        background: transparent;
+        border: none;
+    }
 """
 
 # Schedule types
@@ -62,6 +74,16 @@ REGULAR_SCHEDULE = "Regular Schedule"
 DELAY_SCHEDULE = "Two Hour Delay"
 HOMEROOM_SCHEDULE = "Homeroom Schedule"
 
+# Organization (root key of the schedule file) used when none is selected
+DEFAULT_ORGANIZATION = "southampton_high_school"
+
+# Short display labels for the default schedules; others use their name
+DEFAULT_SCHEDULE_LABELS = {
+    "schedule_1": "Regular",
+    "schedule_2": "2-Hr Delay",
+    "schedule_3": "Homeroom"
+}
+
 # Add to existing constants
 DEFAULT_MESSAGES = {
     "before_schedule": "Before Schedule",
@@ -71,6 +93,29 @@ DEFAULT_MESSAGES = {
 }
 
 # Update Intervals
-# Event check: Every 60 seconds
+# Event check: At each event start/end (at least every 5 minutes)
 # UI refresh: Every 1000ms
-# Test mode: User-defined 
\ No newline at end of file
+# Test mode: User-defined 
+# Test mode simulation speeds: (label, simulated seconds per real second).
+# None jumps from transition to transition, pausing "Delay" seconds at each
+SIMULATION_SPEEDS = [
+    ('Paused', 0),
+    ('1x', 1),
+    ('60x', 60),
+    ('3600x', 3600),
+    ('Transitions', None),
+]
+
+# Pre-bell alarms. schedules maps a schedule key to the minutes before each
+# event 'start'/'end' to alarm at, e.g. {'schedule_1': {'start': [2], 'end': []}}
+DEFAULT_ALARM_SETTINGS = {
+    'enabled': False,
+    'schedules': {},
+    'tray': True,
+    'sound': False,
+    'sound_file': '',
+    'command': '',
+    'webhook': '',
+}
+# How long a tray balloon stays up
+ALARM_BALLOON_MS = 10000
@@ -0,0 +1 @@
+# Qt-free schedule engine: model, lookups, messages and storage
@@ -0,0 +1,254 @@
+# Pre-bell alarms: a heap of upcoming alarm instants and pluggable sinks
+
+import heapq
+import itertools
+import json
+import shlex
+import subprocess
+import sys
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from core.clock import system_clock
+from core.instrumentation import instrumentation
+
+# Longest single wait; bounds how late a wall-clock jump or resume is noticed
+MAX_WAIT_SECONDS = 60.0
+# Alarms missed by more than this (suspend, clock change) are dropped
+LATE_LIMIT_SECONDS = 60.0
+# Sinks run on this many worker threads, so a slow one never holds up the rest
+SINK_WORKERS = 4
+# Give up on a command or webhook after this many seconds
+SINK_TIMEOUT_SECONDS = 10
+
+
+class Alarm:
+    """One alarm: offset minutes before an event's start or end"""
+    __slots__ = ('when', 'schedule_key', 'label', 'event', 'kind', 'offset')
+
+    def __init__(self, when, schedule_key, label, event, kind, offset):
+        self.when = when
+        self.schedule_key = schedule_key
+        self.label = label
+        self.event = event
+        self.kind = kind  # 'start' or 'end'
+        self.offset = offset
+
+    def __lt__(self, other):
+        return self.when < other.when
+
+    def __repr__(self):
+        return f"Alarm({self.when:%Y-%m-%d %H:%M}, {self.label!r}, {self.message!r})"
+
+    @property
+    def message(self):
+        verb = 'starts' if self.kind == 'start' else 'ends'
+        if not self.offset:
+            return f"{self.event} {verb} now"
+        unit = 'minute' if self.offset == 1 else 'minutes'
+        return f"{self.event} {verb} in {self.offset} {unit}"
+
+    def to_dict(self):
+        return {'time': self.when.isoformat(timespec='seconds'),
+                'schedule': self.schedule_key, 'label': self.label, 'event': self.event,
+                'kind': self.kind, 'offset': self.offset, 'message': self.message}
+
+
+def build_alarms(schedule_manager, day, offsets):
+    """Return the alarms of a date, unsorted
+
+    offsets maps a schedule key to {'start': [minutes, ...], 'end': [...]},
+    the minutes before each event start or end to alarm at. When the
+    organization has a school calendar, only the schedule it assigns to the
+    date rings (none on days off); otherwise every schedule in offsets does.
+    """
+    if schedule_manager.get_calendar() is not None:
+        active = schedule_manager.active_schedule(day)
+        keys = [active] if active in offsets else []
+    else:
+        keys = [key for key in offsets if key in schedule_manager.schedules]
+
+    midnight = datetime(day.year, day.month, day.day)
+    alarms = []
+    for key in keys:
+        label = schedule_manager.schedule_label(key)
+        for event in schedule_manager.schedules[key]:
+            for kind, minute in (('start', event.start), ('end', event.end)):
+                if minute is None:
+                    continue
+                for offset in offsets[key].get(kind, ()):
+                    if offset <= minute:  # Alarms of the previous day are skipped
+                        alarms.append(Alarm(midnight + timedelta(minutes=minute - offset),
+                                            key, label, event.name, kind, offset))
+    return alarms
+
+
+def parse_offsets(text):
+    """Parse '5, 1, 0' into a sorted list of minutes; raises ValueError"""
+    offsets = set()
+    for part in text.replace(',', ' ').split():
+        offset = int(part)
+        if not 0 <= offset < 24 * 60:
+            raise ValueError(f"{offset} is not between 0 and {24 * 60 - 1} minutes")
+        offsets.add(offset)
+    return sorted(offsets, reverse=True)
+
+
+def format_offsets(offsets):
+    return ", ".join(str(offset) for offset in offsets)
+
+
+class AlarmSink:
+    """Something that delivers alarms: a tray balloon, a sound, a command...
+
+    deliver() is called on a worker thread and may block; sinks that touch
+    Qt widgets must hand the alarm over to the GUI thread. Sinks that reach
+    outside the app set external, and are skipped while the clock is
+    simulated so a test run at 3600x does not set off real commands.
+    """
+    external = False
+
+    def deliver(self, alarm):
+        raise NotImplementedError
+
+
+class CommandSink(AlarmSink):
+    """Runs a local command; {label}, {event}, {message} etc. are filled in per argument"""
+    external = True
+
+    def __init__(self, command, timeout=SINK_TIMEOUT_SECONDS):
+        self.arguments = shlex.split(command)
+        self.timeout = timeout
+
+    def deliver(self, alarm):
+        values = alarm.to_dict()
+        subprocess.run([argument.format(**values) for argument in self.arguments],
+                       timeout=self.timeout, check=True)
+
+
+class WebhookSink(AlarmSink):
+    """POSTs the alarm as JSON to a URL, e.g. a local relay for phones or chat"""
+    external = True
+
+    def __init__(self, url, timeout=SINK_TIMEOUT_SECONDS):
+        self.url = url
+        self.timeout = timeout
+
+    def deliver(self, alarm):
+        request = urllib.request.Request(
+            self.url, data=json.dumps(alarm.to_dict()).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}, method='POST')
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class AlarmDispatcher:
+    """Rings alarms ahead of schedule bells.
+
+    The alarms of the current day are precomputed into a min-heap of
+    instants, with a sentinel at midnight that builds the next day. One
+    thread sleeps until the earliest instant and hands each due alarm to
+    every sink on a thread pool, so the GUI thread never waits and a slow
+    or hung sink does not delay other alarms or sinks. Time comes from
+    clock; call reschedule() after the schedules, the offsets or the clock
+    change.
+    """
+
+    def __init__(self, schedule_manager, sinks=(), offsets=None, clock=None):
+        self.schedule_manager = schedule_manager
+        self.sinks = list(sinks)
+        self.offsets = offsets or {}
+        self.clock = clock or system_clock
+        self._heap = []
+        self._sequence = itertools.count()  # Keeps heap entries for the same instant apart
+        self._condition = threading.Condition()
+        self._rebuild_since = None
+        self._thread = None
+        self._stopped = False
+        self._executor = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self):
+        """Start the dispatch thread (a daemon)"""
+        if self._thread is not None:
+            return
+        self._stopped = False
+        self._executor = ThreadPoolExecutor(SINK_WORKERS, thread_name_prefix='alarm-sink')
+        self.reschedule()
+        self._thread = threading.Thread(target=self._run, name='alarm-dispatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(1)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def reschedule(self):
+        """Rebuild the heap from now, e.g. after the schedules changed"""
+        now = self.clock.now()
+        heap = self._build(now)
+        with self._condition:
+            self._heap = heap
+            self._rebuild_since = None
+            self._condition.notify()
+
+    def pending(self):
+        """Return the alarms still to ring today, in order"""
+        with self._condition:
+            return sorted(alarm for _, _, alarm in self._heap if alarm is not None)
+
+    def _build(self, since):
+        """Return a heap of the alarms at or after since, plus the next midnight"""
+        heap = [(alarm.when, next(self._sequence), alarm)
+                for alarm in build_alarms(self.schedule_manager, since.date(), self.offsets)
+                if alarm.when >= since]
+        midnight = datetime(since.year, since.month, since.day) + timedelta(days=1)
+        heap.append((midnight, next(self._sequence), None))
+        heapq.heapify(heap)
+        return heap
+
+    def _run(self):
+        with self._condition:
+            while not self._stopped:
+                if self._rebuild_since is not None:
+                    self._heap = self._build(self._rebuild_since)
+                    self._rebuild_since = None
+                now = self.clock.now()
+                while self._heap and self._heap[0][0] <= now:
+                    when, _, alarm = heapq.heappop(self._heap)
+                    if alarm is None:
+                        self._rebuild_since = when  # Midnight: on to the next day
+                    else:
+                        self._ring(alarm, now)
+                if self._rebuild_since is not None:
+                    continue
+                timeout = self.clock.real_seconds((self._heap[0][0] - now).total_seconds())
+                self._condition.wait(None if timeout is None else min(timeout, MAX_WAIT_SECONDS))
+
+    def _ring(self, alarm, now):
+        late = (now - alarm.when).total_seconds()
+        simulated = self.clock.simulated
+        if not simulated:
+            if late > LATE_LIMIT_SECONDS:
+                return  # Slept through it; a stale alarm would only confuse
+            instrumentation.record('alarm.lateness', late)
+        for sink in self.sinks:
+            if simulated and getattr(sink, 'external', False):
+                continue
+            self._executor.submit(self._deliver, sink, alarm)
+
+    def _deliver(self, sink, alarm):
+        try:
+            sink.deliver(alarm)
+        except Exception as e:
+            print(f"Alarm sink {type(sink).__name__} failed: {e}", file=sys.stderr)
@@ -0,0 +1,84 @@
+# Clocks the app reads the time from: the system clock or a simulated one
+
+import time
+from datetime import datetime, timedelta
+
+
+class Clock:
+    """The system clock.
+
+    Everything that needs the current time (ScheduleManager, UpdateScheduler,
+    the window and the status server) asks a clock instead of calling
+    datetime.now(), so test mode can swap in a SimulatedClock.
+    """
+    simulated = False
+    stepping = False
+
+    def now(self):
+        return datetime.now()
+
+    def real_seconds(self, seconds):
+        """Return how many real seconds pass while this clock advances by seconds
+
+        None means the clock is not moving on its own (paused).
+        """
+        return seconds
+
+    def advance_to(self, when):
+        """Move a stepping clock to when; the system clock ignores this"""
+
+
+system_clock = Clock()
+
+
+class SimulatedClock(Clock):
+    """A clock that runs from a chosen time, faster than real time or paused.
+
+    rate is the number of simulated seconds per real second: 1 runs at real
+    speed, 60 runs an hour a minute, 3600 a day in 24 seconds, and 0 pauses.
+    step() stops the clock instead and lets UpdateScheduler jump it from one
+    schedule boundary to the next, step_seconds of real time apart.
+    """
+    simulated = True
+
+    def __init__(self, start=None, rate=0):
+        self.rate = rate
+        self.step_seconds = None
+        self.set_time(start or datetime.now())
+
+    @property
+    def stepping(self):
+        return self.step_seconds is not None
+
+    def now(self):
+        if not self.rate:
+            return self._start
+        elapsed = (time.monotonic() - self._anchor) * self.rate
+        return self._start + timedelta(seconds=elapsed)
+
+    def set_time(self, when):
+        """Jump to when; the clock keeps running from there at its rate"""
+        self._start = when
+        self._anchor = time.monotonic()
+
+    def set_rate(self, rate):
+        """Run at rate times real time from now on (0 pauses)"""
+        self.set_time(self.now())
+        self.rate = rate
+        self.step_seconds = None
+
+    def step(self, step_seconds):
+        """Stop the clock and jump from boundary to boundary every step_seconds"""
+        self.set_rate(0)
+        self.step_seconds = step_seconds
+
+    def real_seconds(self, seconds):
+        if self.stepping:
+            return self.step_seconds
+        if not self.rate:
+            return None
+        return seconds / self.rate
+
+    def advance_to(self, when):
+        if self.stepping and when > self._start:
+            self.set_time(when)
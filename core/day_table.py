@@ -0,0 +1,44 @@
+# Precomputed per-minute status table for one schedule
+
+from array import array
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class DayTable:
+    """Status of a schedule for every minute of the day.
+
+    codes holds one status code per minute and messages is the interned
+    table of distinct display strings, so a lookup is a single array index.
+    """
+
+    def __init__(self, codes, messages):
+        self.codes = codes
+        self.messages = messages
+
+    @classmethod
+    def build(cls, status_at, next_boundary):
+        """Build a table from a status function and a boundary function
+
+        status_at(minute) returns the display string for a minute and
+        next_boundary(minute) the next minute the status may change (or
+        None), so the status is only evaluated once per constant run.
+        """
+        codes = array('H', bytes(2 * MINUTES_PER_DAY))
+        messages = []
+        interned = {}
+        minute = 0
+        while minute < MINUTES_PER_DAY:
+            status = status_at(minute)
+            code = interned.get(status)
+            if code is None:
+                code = interned[status] = len(messages)
+                messages.append(status)
+            boundary = next_boundary(minute)
+            end = MINUTES_PER_DAY if boundary is None else min(boundary, MINUTES_PER_DAY)
+            codes[minute:end] = array('H', [code]) * (end - minute)
+            minute = end
+        return cls(codes, messages)
+
+    def status(self, minute):
+        return self.messages[self.codes[minute]]
@@ -0,0 +1,225 @@
+# Hot-path instrumentation: call counts, latency histograms, timer drift and profile captures
+
+import functools
+import json
+import os
+import time
+from bisect import bisect_left
+from datetime import datetime
+from core.atomic_write import atomic_write
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+BUCKET_BOUNDS_MS = (0.01, 0.05, 0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+# How often the window writes the metrics file while instrumentation is on
+DUMP_INTERVAL_SECONDS = 60
+# Allocation sites listed in a tracemalloc capture
+TRACEMALLOC_TOP = 25
+
+
+class Histogram:
+    """Count, total, maximum and bucketed distribution of one timing"""
+    __slots__ = ('count', 'total', 'maximum', 'buckets')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+    def add(self, seconds):
+        milliseconds = seconds * 1000
+        self.count += 1
+        self.total += milliseconds
+        if milliseconds > self.maximum:
+            self.maximum = milliseconds
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, milliseconds)] += 1
+
+    def to_dict(self):
+        labels = [f"<={bound}ms" for bound in BUCKET_BOUNDS_MS] + [f">{BUCKET_BOUNDS_MS[-1]}ms"]
+        return {
+            'count': self.count,
+            'total_ms': round(self.total, 3),
+            'mean_ms': round(self.total / self.count, 4) if self.count else 0.0,
+            'max_ms': round(self.maximum, 3),
+            'histogram': {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+
+class Instrumentation:
+    """Times the methods marked with @hot_path and records timer drift.
+
+    Disabled, it costs nothing: marked methods are plain methods and
+    record() returns at once. enable() swaps each marked method on its
+    class for a timing wrapper and disable() puts the original back, so
+    callers must look methods up on each call (a slot connected to a
+    bound method keeps the unwrapped one). Timings are kept in
+    milliseconds per metric name; snapshot() and dump() give them as JSON,
+    along with the counters of any add_counters() source (e.g. how many UI
+    updates the render cache skipped).
+    start_capture()/stop_capture() wrap a cProfile and tracemalloc session.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.histograms = {}
+        self.started = None
+        self.profile = None
+        self._targets = []  # (owner, attribute, name, function)
+        self._counters = {}  # name -> (stats, reset_stats)
+        self._owns_tracemalloc = False
+
+    def histogram(self, name):
+        if name not in self.histograms:
+            self.histograms[name] = Histogram()
+        return self.histograms[name]
+
+    def register(self, owner, attribute, name, function):
+        self._targets.append((owner, attribute, name, function))
+        if self.enabled:
+            setattr(owner, attribute, self._timed(name, function))
+
+    def add_counters(self, name, stats, reset_stats=None):
+        """Report stats() (a dict of counts) as name.<key> in snapshots"""
+        self._counters[name] = (stats, reset_stats)
+
+    def _timed(self, name, function):
+        histogram = self.histogram(name)
+        perf_counter = time.perf_counter
+
+        @functools.wraps(function)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                histogram.add(perf_counter() - start)
+        return timed
+
+    def enable(self):
+        if self.enabled:
+            return
+        self.enabled = True
+        self.started = self.started or datetime.now()
+        for owner, attribute, name, function in self._targets:
+            setattr(owner, attribute, self._timed(name, function))
+
+    def disable(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        for owner, attribute, name, function in self._targets:
+            setattr(owner, attribute, function)
+
+    def record(self, name, seconds):
+        """Add one measurement, e.g. timer drift; ignored while disabled"""
+        if self.enabled:
+            self.histogram(name).add(seconds)
+
+    def reset(self):
+        # Wrappers hold their histogram, so clear in place
+        for histogram in self.histograms.values():
+            histogram.reset()
+        for _, reset_stats in self._counters.values():
+            if reset_stats is not None:
+                reset_stats()
+        self.started = datetime.now() if self.enabled else None
+
+    def snapshot(self):
+        return {
+            'enabled': self.enabled,
+            'since': self.started.isoformat(timespec='seconds') if self.started else None,
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'metrics': {name: histogram.to_dict()
+                        for name, histogram in sorted(self.histograms.items())},
+            'counters': {f"{name}.{key}": value
+                         for name, (stats, _) in sorted(self._counters.items())
+                         for key, value in stats().items()},
+        }
+
+    def dump(self, path):
+        """Write snapshot() to a JSON file; returns False if it cannot be written"""
+        try:
+            atomic_write(path, json.dumps(self.snapshot(), indent=4).encode('utf-8'))
+        except OSError:
+            return False
+        return True
+
+    def report(self):
+        """Return the metrics as a plain-text table"""
+        snapshot = self.snapshot()
+        lines = [f"{'metric':<28} {'count':>8} {'mean ms':>10} {'max ms':>10}"]
+        for name, metric in snapshot['metrics'].items():
+            lines.append(f"{name:<28} {metric['count']:>8} {metric['mean_ms']:>10.3f} {metric['max_ms']:>10.3f}")
+        if len(lines) == 1:
+            lines.append("No measurements yet")
+        if snapshot['counters']:
+            lines.append("")
+            lines.append(f"{'counter':<28} {'count':>8}")
+            for name, value in snapshot['counters'].items():
+                lines.append(f"{name:<28} {value:>8}")
+        return "\n".join(lines)
+
+    @property
+    def capturing(self):
+        return self.profile is not None
+
+    def start_capture(self):
+        """Start profiling the calling thread and tracing allocations"""
+        import cProfile
+        import tracemalloc
+        if self.profile is not None:
+            return
+        self._owns_tracemalloc = not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start()
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop_capture(self, directory):
+        """Stop a capture and save it; returns the (.prof, memory .txt) paths
+
+        The .prof file opens in pstats or snakeviz; the text file lists the
+        lines that allocated the most memory still held.
+        """
+        import tracemalloc
+        profile, self.profile = self.profile, None
+        profile.disable()
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        profile_path = os.path.join(directory, f"profile-{stamp}.prof")
+        memory_path = os.path.join(directory, f"memory-{stamp}.txt")
+        os.makedirs(directory, exist_ok=True)
+        profile.dump_stats(profile_path)
+
+        statistics = tracemalloc.take_snapshot().statistics('lineno')
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+        lines = [str(statistic) for statistic in statistics[:TRACEMALLOC_TOP]]
+        with open(memory_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        return profile_path, memory_path
+
+
+instrumentation = Instrumentation()
+
+
+class hot_path:
+    """Method decorator that has instrumentation time the method under a name
+
+    The method itself is left undecorated on its class until
+    instrumentation is enabled.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.function = None
+
+    def __call__(self, function):
+        self.function = function
+        return self
+
+    def __set_name__(self, owner, attribute):
+        setattr(owner, attribute, self.function)
+        instrumentation.register(owner, attribute, self.name, self.function)
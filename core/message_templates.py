@@ -0,0 +1,112 @@
+# Validated, pre-compiled schedule message templates
+
+import sys
+from string import Formatter
+from constants import DEFAULT_MESSAGES
+
+# Placeholders each message may use; the others are shown literally
+TEMPLATE_FIELDS = {
+    'during_event': ('event_name',),
+    'between_events': ('prev_event', 'next_event')
+}
+
+MESSAGE_LABELS = {
+    'before_schedule': 'Before Schedule',
+    'during_event': 'During Event',
+    'between_events': 'Between Events',
+    'after_schedule': 'After Schedule'
+}
+
+_CONVERSIONS = {'s': str, 'r': repr, 'a': ascii}
+
+
+def compile_template(key, template):
+    """Parse a message template into (literal, field, format_spec, conversion) parts
+
+    Raises ValueError if the template is malformed or uses a placeholder
+    other than the ones allowed for that message.
+    """
+    allowed = TEMPLATE_FIELDS.get(key, ())
+    label = MESSAGE_LABELS.get(key, key)
+    try:
+        parts = list(Formatter().parse(template))
+    except ValueError as e:
+        raise ValueError(f"{label}: {e}") from None
+    for _, field, spec, conversion in parts:
+        if field is None:
+            continue
+        if field not in allowed:
+            names = ", ".join("{%s}" % name for name in allowed) or "none"
+            raise ValueError(f"{label}: unknown placeholder {{{field}}} (allowed: {names})")
+        if spec and ('{' in spec or '}' in spec):
+            raise ValueError(f"{label}: nested placeholders are not supported")
+        if conversion and conversion not in _CONVERSIONS:
+            raise ValueError(f"{label}: invalid conversion !{conversion}")
+        try:
+            format('', spec)
+        except ValueError as e:
+            raise ValueError(f"{label}: invalid format '{spec}' ({e})") from None
+    return parts
+
+
+def _render(parts, fields):
+    out = []
+    for literal, field, spec, conversion in parts:
+        out.append(literal)
+        if field is not None:
+            value = fields[field]
+            if conversion:
+                value = _CONVERSIONS[conversion](value)
+            out.append(format(value, spec))
+    return ''.join(out)
+
+
+class MessageTemplates:
+    """Compiled schedule messages with a per-event render cache.
+
+    Only during_event and between_events are templates; the other messages
+    are shown as typed. With strict=False an invalid template is replaced
+    by its default instead of raising, so bad stored settings can never
+    break the live display.
+    """
+
+    def __init__(self, messages, strict=True):
+        self.messages = {}
+        self._compiled = {}
+        self._rendered = {}
+        for key, default in DEFAULT_MESSAGES.items():
+            message = messages.get(key, default)
+            if key in TEMPLATE_FIELDS:
+                try:
+                    self._compiled[key] = compile_template(key, message)
+                except ValueError as e:
+                    if strict:
+                        raise
+                    print(f"Invalid message template, using default: {e}", file=sys.stderr)
+                    message = default
+                    self._compiled[key] = compile_template(key, message)
+            self.messages[key] = message
+
+    def __getitem__(self, key):
+        return self.messages[key]
+
+    def render(self, key, **fields):
+        """Render a message, reusing the cached string for repeat arguments"""
+        cache_key = (key, tuple(fields.get(name) for name in TEMPLATE_FIELDS.get(key, ())))
+        rendered = self._rendered.get(cache_key)
+        if rendered is None:
+            parts = self._compiled.get(key)
+            rendered = self.messages[key] if parts is None else _render(parts, fields)
+            self._rendered[cache_key] = rendered
+        return rendered
+
+    def during_event(self, event_name):
+        return self.render('during_event', event_name=event_name)
+
+    def between_events(self, prev_event, next_event):
+        return self.render('between_events', prev_event=prev_event, next_event=next_event)
+
+
+def validate_messages(messages):
+    """Raise ValueError describing the first invalid template in messages"""
+    MessageTemplates(messages, strict=True)
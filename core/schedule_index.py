@@ -0,0 +1,179 @@
+# Compiled per-schedule event index for O(log n) event lookups
+
+import heapq
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+
+_TIME_PATTERN = re.compile(r'^\d\d:\d\d$')
+
+# Status kinds stored in the slot table
+BEFORE_SCHEDULE = 0
+DURING_EVENT = 1
+BETWEEN_EVENTS = 2
+AFTER_SCHEDULE = 3
+NOT_IN_SESSION = 4
+
+
+def time_to_minutes(value):
+    """Convert an 'HH:MM' string to minutes past midnight, or None if malformed"""
+    if not isinstance(value, str) or not _TIME_PATTERN.match(value):
+        return None
+    hours, minutes = int(value[:2]), int(value[3:])
+    if hours >= 24 or minutes >= 60:
+        return None
+    return hours * 60 + minutes
+
+
+def _stab_min(intervals, slot_count):
+    """For each slot, return the lowest interval id covering it (or -1)
+
+    intervals is a list of (first_slot, last_slot, interval_id) tuples.
+    """
+    result = array('l', [-1]) * slot_count
+    pending = sorted(intervals)
+    active = []
+    pos = 0
+    for slot in range(slot_count):
+        while pos < len(pending) and pending[pos][0] == slot:
+            first, last, interval_id = pending[pos]
+            heapq.heappush(active, (interval_id, last))
+            pos += 1
+        while active and active[0][1] < slot:
+            heapq.heappop(active)
+        if active:
+            result[slot] = active[0][0]
+    return result
+
+
+class ScheduleIndex:
+    """Compiled lookup structure for one schedule's event list.
+
+    Every start/end time is converted to an integer minute of the day once.
+    The sorted set of distinct times (the breakpoints) splits the day into
+    slots: one slot for each breakpoint minute and one for each gap between
+    consecutive breakpoints. The status shown is constant within a slot, so
+    the slot table is precomputed and a lookup is a single bisect.
+
+    The table reproduces the rules of the original linear scan exactly,
+    including unsorted and overlapping events: the first matching event in
+    list order wins, and "between" pairs are consecutive list entries.
+    It is built from the columns of a Schedule record (see
+    Schedule.columns()): event names and start/end minutes, None where a
+    time is not set.
+    """
+
+    def __init__(self, names, starts, ends):
+        self.names = names
+
+        # Sorted start/end columns for previous/next event queries
+        timed = [i for i in range(len(names))
+                 if starts[i] is not None and ends[i] is not None]
+        by_start = sorted(timed, key=lambda i: (starts[i], i))
+        by_end = sorted(timed, key=lambda i: (ends[i], i))
+        self.starts = array('l', (starts[i] for i in by_start))
+        self.start_order = array('l', by_start)
+        self.ends = array('l', (ends[i] for i in by_end))
+        self.end_order = array('l', by_end)
+
+        first_start = next((s for s in starts if s is not None), None)
+        last_end = next((e for e in reversed(ends) if e is not None), None)
+
+        during = [(starts[i], ends[i], i) for i in timed if starts[i] <= ends[i]]
+        between = []
+        for i in range(len(names) - 1):
+            gap_start, gap_end = ends[i], starts[i + 1]
+            if gap_start is not None and gap_end is not None and gap_start <= gap_end:
+                between.append((gap_start, gap_end, i))
+
+        points = {first_start, last_end}
+        for first, last, _ in during + between:
+            points.add(first)
+            points.add(last)
+        points.discard(None)
+        self.breakpoints = array('l', sorted(points))
+
+        # Breakpoint k lives in slot 2k+1, the gap below it in slot 2k
+        slot_of = {minute: 2 * k + 1 for k, minute in enumerate(self.breakpoints)}
+        slot_count = 2 * len(self.breakpoints) + 1
+
+        during_slots = _stab_min(
+            [(slot_of[s], slot_of[e], i) for s, e, i in during], slot_count)
+        between_slots = _stab_min(
+            [(slot_of[s], slot_of[e], i) for s, e, i in between], slot_count)
+
+        self.slot_kind = array('B', [NOT_IN_SESSION]) * slot_count
+        self.slot_arg = array('l', [-1]) * slot_count
+        for slot in range(slot_count):
+            if first_start is None or slot < slot_of[first_start]:
+                self.slot_kind[slot] = BEFORE_SCHEDULE
+            elif during_slots[slot] >= 0:
+                self.slot_kind[slot] = DURING_EVENT
+                self.slot_arg[slot] = during_slots[slot]
+            elif last_end is not None and slot > slot_of[last_end]:
+                self.slot_kind[slot] = AFTER_SCHEDULE
+            elif between_slots[slot] >= 0:
+                self.slot_kind[slot] = BETWEEN_EVENTS
+                self.slot_arg[slot] = between_slots[slot]
+
+    # Compiled arrays saved by state() and restored by from_state()
+    STATE_FIELDS = {'starts': 'l', 'start_order': 'l', 'ends': 'l', 'end_order': 'l',
+                    'breakpoints': 'l', 'slot_kind': 'B', 'slot_arg': 'l'}
+
+    def state(self):
+        """Return the compiled arrays as a dict of bytes (for snapshots)"""
+        return {field: getattr(self, field).tobytes() for field in self.STATE_FIELDS}
+
+    @classmethod
+    def from_state(cls, names, state):
+        """Rebuild an index from state() without recompiling the events"""
+        index = cls.__new__(cls)
+        index.names = names
+        for field, typecode in cls.STATE_FIELDS.items():
+            values = array(typecode)
+            values.frombytes(state[field])
+            setattr(index, field, values)
+        return index
+
+    def slot(self, minute):
+        """Return the slot number containing the given minute of the day"""
+        k = bisect_left(self.breakpoints, minute)
+        if k < len(self.breakpoints) and self.breakpoints[k] == minute:
+            return 2 * k + 1
+        return 2 * k
+
+    def lookup(self, minute):
+        """Return (status kind, event index) for the given minute of the day
+
+        The event index is the current event for DURING_EVENT and the
+        index of the earlier event of the pair for BETWEEN_EVENTS.
+        """
+        slot = self.slot(minute)
+        return self.slot_kind[slot], self.slot_arg[slot]
+
+    def next_boundary(self, minute):
+        """Return the first minute after `minute` where the status may change
+
+        Returns None when nothing changes for the rest of the day.
+        """
+        k = bisect_right(self.breakpoints, minute)
+        if k > 0 and self.breakpoints[k - 1] == minute:
+            return minute + 1
+        if k < len(self.breakpoints):
+            return self.breakpoints[k]
+        return None
+
+    def next_bell(self, minute):
+        """Return the first event start or end after `minute`, or None"""
+        k = bisect_right(self.breakpoints, minute)
+        return self.breakpoints[k] if k < len(self.breakpoints) else None
+
+    def next_event(self, minute):
+        """Return the index of the first event starting after `minute`, or None"""
+        k = bisect_right(self.starts, minute)
+        return self.start_order[k] if k < len(self.starts) else None
+
+    def previous_event(self, minute):
+        """Return the index of the last event that ended before `minute`, or None"""
+        k = bisect_left(self.ends, minute)
+        return self.end_order[k - 1] if k > 0 else None
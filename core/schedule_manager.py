@@ -0,0 +1,518 @@
+# Schedule loading, saving, and period calculations 
+
+import copy
+import os
+import sys
+from datetime import datetime, timedelta
+from numbers import Integral
+from constants import (SCHEDULES_FILE, CALENDAR_FILE, REGULAR_SCHEDULE, DELAY_SCHEDULE, HOMEROOM_SCHEDULE,
+                       DEFAULT_ORGANIZATION, DEFAULT_SCHEDULE_LABELS)
+from core.clock import system_clock
+from core.settings import MemorySettings
+from core.schedule_index import (ScheduleIndex, DURING_EVENT, BETWEEN_EVENTS,
+                                  AFTER_SCHEDULE, BEFORE_SCHEDULE, time_to_minutes)
+from core.day_table import DayTable
+from core.message_templates import MessageTemplates
+from core.school_calendar import SchoolCalendar, load_calendars
+from core.schedule_storage import open_store
+from core.schedule_records import Schedule, parse_schedules, schedules_to_json
+from core.instrumentation import hot_path
+
+_numpy = False  # Not imported yet
+
+
+def load_numpy():
+    """Return the numpy module, or None if it is not installed
+
+    NumPy is optional (evaluate_many falls back to lists) and only
+    imported on first use, which keeps importing the engine cheap.
+    """
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+# Legacy display names accepted by get_current_event and their schedule keys
+SCHEDULE_TYPE_KEYS = {
+    REGULAR_SCHEDULE: 'schedule_1',
+    DELAY_SCHEDULE: 'schedule_2',
+    HOMEROOM_SCHEDULE: 'schedule_3'
+}
+
+class ScheduleManager:
+    """Loads an organization's schedules and answers status lookups.
+
+    settings (a core.settings.ScheduleSettings) supplies the selected
+    organization and the message templates; it defaults to MemorySettings,
+    so the engine never needs Qt. The GUI passes its SettingsManager.
+    clock (a core.clock.Clock) is where "now" and "today" come from.
+    """
+
+    def __init__(self, schedule_file=None, use_day_table=True, organization=None,
+                 calendar_file=None, settings=None, clock=None):
+        self.schedule_file = schedule_file or SCHEDULES_FILE
+        self.calendar_file = calendar_file or CALENDAR_FILE
+        self.use_day_table = use_day_table
+        self.settings = settings if settings is not None else MemorySettings()
+        self.clock = clock or system_clock
+        self.organization = organization or self.settings.get_organization()
+        self.organizations = []
+        self.loaded_signature = None
+        self.store = open_store(self.schedule_file)
+        self.schedules = self.load_schedules()
+        self.restore_indexes()
+        self.messages = self.settings.get_schedule_messages()
+        self.calendars = self.load_calendars()
+        # Day tables are built on each schedule's first lookup
+        self.save_index_cache()
+
+    @property
+    def schedules(self):
+        return self._schedules
+
+    @schedules.setter
+    def schedules(self, schedules):
+        """Set the schedules from Schedule records or the JSON layout (parsed here)"""
+        schedules = parse_schedules(schedules)
+        # Ensure default schedules exist with names
+        if not schedules:
+            schedules.update({
+                'schedule_1': Schedule({'name': REGULAR_SCHEDULE}),
+                'schedule_2': Schedule({'name': DELAY_SCHEDULE}),
+                'schedule_3': Schedule({'name': HOMEROOM_SCHEDULE})
+            })
+        legacy_names = {key: name for name, key in SCHEDULE_TYPE_KEYS.items()}
+        for key, schedule in schedules.items():
+            if 'name' not in schedule.properties:
+                schedule.name = legacy_names.get(key, key)
+        
+        self._schedules = schedules
+        self.invalidate_index()
+
+    def invalidate_index(self):
+        """Drop compiled indexes; call after mutating schedules in place"""
+        self._indexes = {}
+        self._day_tables = {}
+        self._calendars = {}
+        
+        # Registry of every name a schedule can be looked up by
+        self._schedule_keys = dict(SCHEDULE_TYPE_KEYS)
+        for key, schedule in self._schedules.items():
+            self._schedule_keys.setdefault(schedule.name, key)
+            self._schedule_keys[key] = key
+
+    def resolve_schedule_key(self, schedule_id):
+        """Return the schedule key for a key or display name, or None"""
+        schedule_key = self._schedule_keys.get(schedule_id)
+        return schedule_key if schedule_key in self._schedules else None
+
+    def schedule_label(self, schedule_key):
+        """Return the short label shown above a schedule's display"""
+        schedule = self._schedules[schedule_key]
+        return (schedule.label or DEFAULT_SCHEDULE_LABELS.get(schedule_key)
+                or schedule.name or schedule_key)
+
+    def set_organization(self, organization):
+        """Switch to another organization in the schedule file and remember it"""
+        self.organization = organization
+        self.schedules = self.load_schedules()
+        self.restore_indexes()
+        self.save_index_cache()
+        self.settings.save_organization(organization)
+
+    @property
+    def messages(self):
+        return self._messages
+
+    @messages.setter
+    def messages(self, messages):
+        self._messages = messages
+        # Compile once here; lookups reuse the rendered strings
+        self.templates = MessageTemplates(messages, strict=False)
+        self._day_tables = {}
+
+    def get_index(self, schedule_key):
+        """Return the compiled index for a schedule, rebuilding it if stale
+
+        Returns None if the schedule contains malformed times and has to be
+        evaluated with the linear scan instead.
+        """
+        schedule = self.schedules[schedule_key]
+        cached = self._indexes.get(schedule_key)
+        if cached is not None and cached[0] is schedule:
+            return cached[1]
+        try:
+            index = ScheduleIndex(*schedule.columns())
+        except ValueError:
+            index = None
+        self._indexes[schedule_key] = (schedule, index)
+        return index
+
+    def get_day_table(self, schedule_key):
+        """Return the per-minute status table for a schedule, building it if stale
+
+        Tables are built on first use rather than at load, so a file with
+        hundreds of schedules only pays for the ones that are looked up.
+        """
+        schedule = self.schedules[schedule_key]
+        cached = self._day_tables.get(schedule_key)
+        if cached is not None and cached[0] is schedule:
+            return cached[1]
+        index = self.get_index(schedule_key) if len(schedule) else None
+        if index is not None:
+            next_boundary = index.next_boundary
+        elif len(schedule):
+            next_boundary = lambda minute: minute + 1
+        else:
+            next_boundary = lambda minute: None
+        table = DayTable.build(lambda minute: self._status_at(schedule_key, minute),
+                               next_boundary)
+        self._day_tables[schedule_key] = (schedule, table)
+        return table
+
+    def build_day_tables(self):
+        """Precompute day tables for every loaded schedule"""
+        for schedule_key in self.schedules:
+            self.get_day_table(schedule_key)
+
+    def next_boundary(self, minute):
+        """Return the next minute of the day at which any schedule's status may change
+
+        Returns None if no schedule changes again before midnight.
+        """
+        boundaries = []
+        for schedule_key, schedule in self.schedules.items():
+            if not len(schedule):
+                continue
+            index = self.get_index(schedule_key)
+            if index is None:
+                boundaries.append(minute + 1)  # Scanned schedules are checked every minute
+                continue
+            boundary = index.next_boundary(minute)
+            if boundary is not None:
+                boundaries.append(boundary)
+        return min(boundaries, default=None)
+
+    def next_bell(self, schedule_key, minute):
+        """Return the minute of a schedule's next event start or end after minute
+
+        Returns None after the last bell of the day and for schedules whose
+        times cannot be compiled.
+        """
+        schedule = self.schedules.get(schedule_key)
+        index = self.get_index(schedule_key) if schedule is not None and len(schedule) else None
+        return index.next_bell(minute) if index is not None else None
+
+    def file_signature(self):
+        """Return (mtime, size) of the schedule file, or None if it is missing"""
+        try:
+            stat = os.stat(self.schedule_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def calendar_signature(self):
+        """Return (mtime, size) of the calendar file, or None if it is missing"""
+        try:
+            stat = os.stat(self.calendar_file)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def load_calendars(self):
+        """Read every organization's calendar definition; {} if unusable"""
+        self.loaded_calendar_signature = self.calendar_signature()
+        self._calendars = {}
+        try:
+            return load_calendars(self.calendar_file)
+        except (OSError, ValueError) as e:
+            print(f"Error loading calendar: {e}", file=sys.stderr)
+            return {}
+
+    def get_calendar(self, organization=None):
+        """Return the compiled calendar of an organization, or None if it has none"""
+        organization = organization or self.organization
+        if organization not in self._calendars:
+            calendar = None
+            definition = self.calendars.get(organization)
+            if definition is not None:
+                # Only the active organization's schedule keys are loaded
+                schedule_keys = self._schedules if organization == self.organization else None
+                try:
+                    calendar = SchoolCalendar(definition, schedule_keys)
+                except (ValueError, KeyError, TypeError) as e:
+                    print(f"Invalid calendar for {organization}: {e}", file=sys.stderr)
+            self._calendars[organization] = calendar
+        return self._calendars[organization]
+
+    def active_schedule(self, day=None):
+        """Return the key of the schedule the calendar assigns to a date (default today)
+
+        Returns None when there is no calendar, on days off and outside the
+        school year.
+        """
+        calendar = self.get_calendar()
+        if calendar is None:
+            return None
+        return calendar.schedule_for(day or self.clock.now().date())
+
+    @hot_path('schedule.load_schedules')
+    def load_schedules(self):
+        """Read the active organization and parse it into Schedule records
+
+        Raises OSError or ValueError if the store cannot be read or the
+        schedules do not have the expected shape.
+        """
+        signature = self.file_signature()
+        self.organizations = self.store.read_organizations()
+        if self.organization not in self.organizations:
+            # Fall back when the remembered organization is not in this file
+            fallback = (DEFAULT_ORGANIZATION if DEFAULT_ORGANIZATION in self.organizations
+                        else next(iter(self.organizations), None))
+            self.organization = fallback or DEFAULT_ORGANIZATION
+        if self.organization in self.organizations:
+            schedules = self.store.load(self.organization)
+        else:
+            schedules = {}
+        schedules = parse_schedules(schedules)
+        self.loaded_signature = signature
+        return schedules
+
+    def restore_indexes(self):
+        """Reuse the compiled indexes cached by the store for the loaded schedules"""
+        states = self.store.cached_indexes(self.organization)
+        for schedule_key, schedule in self._schedules.items():
+            if schedule_key in states:
+                state = states[schedule_key]
+                index = ScheduleIndex.from_state(schedule.names, state) if state is not None else None
+                self._indexes[schedule_key] = (schedule, index)
+
+    def save_index_cache(self):
+        """Let the store cache the loaded organization's compiled indexes
+
+        The JSON store writes them to its snapshot when it was stale; call
+        right after loading, before the schedules are edited.
+        """
+        states = {}
+        for schedule_key in self._schedules:
+            index = self.get_index(schedule_key)
+            states[schedule_key] = index.state() if index is not None else None
+        self.store.cache_indexes(self.organization, states)
+            
+    @hot_path('schedule.save_schedules')
+    def save_schedules(self, schedules, organization=None):
+        """Write schedules for an organization (default: the active one)
+
+        schedules may be Schedule records or the JSON layout. The JSON store
+        rewrites the file atomically; the SQLite store only writes the rows
+        that changed.
+        """
+        organization = organization or self.organization
+        self.store.save(organization, schedules_to_json(schedules))
+        if organization not in self.organizations:
+            self.organizations = self.organizations + [organization]
+        self.loaded_signature = self.file_signature()
+
+    def save_event(self, schedule_key, position, event=None, organization=None):
+        """Write one event of the loaded schedules in a single transaction
+
+        If event (in the JSON layout) is given, it first replaces the loaded event.
+        """
+        organization = organization or self.organization
+        schedule = self._schedules[schedule_key]
+        if event is not None:
+            schedule.set_event(position, event, schedule_key)
+            self.invalidate_index()
+        event = schedule.event_dict(position)
+        self.store.update_event(organization, schedule_key, position, event)
+        self.loaded_signature = self.file_signature()
+
+    def prepare_reload(self):
+        """Load and compile the schedule file into a staging copy of this manager
+
+        Safe to call off the GUI thread: the live schedules and indexes are
+        not touched. Raises OSError/ValueError if the file cannot be used.
+        Pass the result to adopt() to swap it in.
+        """
+        staging = copy.copy(self)
+        staging.store = open_store(self.schedule_file)
+        staging.schedules = staging.load_schedules()
+        staging.restore_indexes()
+        staging.calendars = staging.load_calendars()
+        staging.get_calendar()
+        staging.save_index_cache()  # Compiles every index
+        return staging
+
+    def adopt(self, staging):
+        """Swap in the schedules and indexes prepared by prepare_reload()"""
+        if staging.messages is not self.messages:
+            staging.messages = self.messages  # Messages changed meanwhile
+        self.organization = staging.organization
+        self.organizations = staging.organizations
+        self.loaded_signature = staging.loaded_signature
+        self.store = staging.store
+        self.loaded_calendar_signature = staging.loaded_calendar_signature
+        self.calendars = staging.calendars
+        self._calendars = staging._calendars
+        self._schedules = staging._schedules
+        self._schedule_keys = staging._schedule_keys
+        self._indexes = staging._indexes
+        self._day_tables = staging._day_tables
+            
+    @hot_path('schedule.get_current_event')
+    def get_current_event(self, schedule_type, current_time=None):
+        """Get the current event based on the time
+
+        schedule_type may be a schedule key ('schedule_1') or display name.
+        """
+        schedule_key = self.resolve_schedule_key(schedule_type)
+        if schedule_key is None:
+            return "Not in Session"
+            
+        if current_time is None:
+            current_time = self.clock.now()
+            
+        minute = self._minute_of_day(current_time)
+        if minute is None:
+            return "Invalid Time Format"
+        
+        if self.use_day_table:
+            return self.get_day_table(schedule_key).status(minute)
+        return self._status_at(schedule_key, minute)
+
+    def evaluate_many(self, schedule_keys, times):
+        """Evaluate several schedules at many times in one pass
+
+        schedule_keys may be schedule keys ('schedule_1') or display names.
+        times may be minutes of the day, 'HH:MM' strings, datetimes or a
+        NumPy integer array of minutes. Returns one row per time holding
+        the status of each schedule, in the order of schedule_keys.
+        Raises ValueError for anything else, e.g. fractional minutes.
+        """
+        np = load_numpy()
+        if np is not None and isinstance(times, np.ndarray):
+            if times.dtype.kind not in 'iu':
+                raise ValueError(f"Times must be integer minutes or 'HH:MM' strings, "
+                                 f"not a {times.dtype} array")
+            minutes = times
+            valid = (minutes >= 0) & (minutes < 24 * 60)
+        else:
+            minutes = [self._batch_minute(time) for time in times]
+            valid = [minute is not None and 0 <= minute < 24 * 60 for minute in minutes]
+            if np is not None:
+                valid = np.array(valid, dtype=bool)
+                minutes = np.array([minute if ok else 0 for minute, ok in zip(minutes, valid)],
+                                   dtype=np.intp)
+
+        columns = []
+        for key in schedule_keys:
+            schedule_key = self.resolve_schedule_key(key)
+            if schedule_key is None:
+                columns.append(["Not in Session"] * len(minutes))
+                continue
+            table = self.get_day_table(schedule_key)
+            if np is not None:
+                codes = np.frombuffer(table.codes, dtype=np.uint16)
+                statuses = np.array(table.messages + ["Invalid Time Format"], dtype=object)
+                column_codes = np.where(valid, codes[np.where(valid, minutes, 0)],
+                                        len(table.messages))
+                columns.append(statuses[column_codes].tolist())
+            else:
+                codes, messages = table.codes, table.messages
+                columns.append([messages[codes[minute]] if ok else "Invalid Time Format"
+                                for minute, ok in zip(minutes, valid)])
+        return [list(row) for row in zip(*columns)] if columns else [[] for _ in minutes]
+
+    def _batch_minute(self, time):
+        """Return the minute of the day of one evaluate_many() time"""
+        if isinstance(time, Integral):
+            return int(time)
+        if isinstance(time, (str, datetime)):
+            return self._minute_of_day(time)
+        raise ValueError(f"Times must be integer minutes, 'HH:MM' strings or datetimes, "
+                         f"not {time!r}")
+
+    def _minute_of_day(self, current_time):
+        """Return the minute of the day for a datetime or 'HH:MM' string"""
+        if isinstance(current_time, str):
+            minute = time_to_minutes(current_time)
+            if minute is not None:
+                return minute
+            try:
+                current_time = datetime.strptime(current_time, "%H:%M")
+            except ValueError:
+                return None
+        return current_time.hour * 60 + current_time.minute
+
+    def _status_at(self, schedule_key, minute):
+        """Evaluate a schedule's status at a minute of the day"""
+        schedule = self.schedules[schedule_key]
+        if not schedule.has_events:
+            return "Schedule Not Configured"
+        
+        if not len(schedule):
+            return "No Events Defined"
+        
+        index = self.get_index(schedule_key)
+        if index is None:
+            return self._scan_events(schedule.event_dicts(), f"{minute // 60:02d}:{minute % 60:02d}")
+
+        kind, event_index = index.lookup(minute)
+        names = schedule.names
+        if kind == BEFORE_SCHEDULE:
+            return self.templates['before_schedule']
+        if kind == DURING_EVENT:
+            return self.templates.during_event(names[event_index])
+        if kind == AFTER_SCHEDULE:
+            return self.templates['after_schedule']
+        if kind == BETWEEN_EVENTS:
+            return self.templates.between_events(names[event_index], names[event_index + 1])
+        return "Not in Session"
+
+    def _scan_events(self, events, current_time_str):
+        """Linear scan used for schedules whose times cannot be compiled"""
+        # Before school check
+        first_event = next((e for e in events if e.get('start')), None)
+        if not first_event or current_time_str < first_event['start']:
+            return self.templates['before_schedule']
+        
+        # During event check
+        for event in events:
+            start = event.get('start')
+            end = event.get('end')
+            
+            if not start or not end:
+                continue
+                
+            if start <= current_time_str <= end:
+                return self.templates.during_event(event['name'])
+                
+        # After school check
+        last_event = next((e for e in reversed(events) if e.get('end')), None)
+        if last_event and current_time_str > last_event['end']:
+            return self.templates['after_schedule']
+        
+        # Between events check
+        for i in range(len(events) - 1):
+            current_end = events[i].get('end')
+            next_start = events[i + 1].get('start')
+            if (current_end and next_start and 
+                current_end <= current_time_str <= next_start):
+                return self.templates.between_events(events[i]['name'],
+                                                     events[i + 1]['name'])
+        
+        return "Not in Session"
+
+
+def next_deadline(schedule_manager, now):
+    """Return the datetime of the next schedule boundary after now (or midnight)"""
+    minute = now.hour * 60 + now.minute
+    boundary = schedule_manager.next_boundary(minute)
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if boundary is None or boundary >= 24 * 60:
+        return midnight + timedelta(days=1)
+    return midnight + timedelta(minutes=boundary)
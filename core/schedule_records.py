@@ -0,0 +1,229 @@
+# Compact in-memory schedule records, parsed once from the JSON layout
+
+import copy
+import sys
+from array import array
+from core.schedule_index import time_to_minutes
+
+# Sentinels in the start/end minute columns
+NO_TIME = 0xFFFF    # Missing or empty time
+BAD_TIME = 0xFFFE   # Malformed time (kept verbatim in Schedule.irregular)
+
+_CANONICAL_KEYS = (('name', 'start', 'end'), ('name', 'start', 'end', 'minutes'))
+
+
+def format_minutes(minute):
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+# Minute of every time of the day (plus '' for unset), for the parse fast path
+_DAY_TIMES = {format_minutes(minute): minute for minute in range(24 * 60 + 1)}
+_DAY_TIMES[''] = NO_TIME
+
+
+def _parse_time(value, field, schedule_key):
+    if not isinstance(value, str):
+        raise ValueError(f"Event field {field!r} in schedule {schedule_key!r} must be text")
+    if not value:
+        return NO_TIME
+    minute = time_to_minutes(value)
+    return BAD_TIME if minute is None else minute
+
+
+class Event:
+    """One event of a Schedule: its name and start/end minute (None if unset or malformed)"""
+    __slots__ = ('name', 'start', 'end')
+
+    def __init__(self, name, start, end):
+        self.name = name
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"Event({self.name!r}, {self.start!r}, {self.end!r})"
+
+
+class Schedule:
+    """One schedule's events as parallel columns.
+
+    names holds the interned event names and starts/ends the minutes of
+    the day in array('H') columns, with NO_TIME for a missing time and
+    BAD_TIME for a malformed one. The 'minutes' key of the JSON layout is
+    not stored, only whether it was present, since it is always end minus
+    start; an event that does not fit this layout (a different 'minutes',
+    extra keys, unusual times) is also kept verbatim in irregular, so
+    to_dict() gives back exactly what from_dict() read. properties holds
+    the other schedule keys (name, label, ...).
+
+    ScheduleManager notices a record replaced by a new one and rebuilds its
+    indexes; after changing one in place with set_event(), call
+    ScheduleManager.invalidate_index().
+    """
+    __slots__ = ('properties', 'names', 'starts', 'ends', 'derived_minutes',
+                 'irregular', 'has_events')
+
+    def __init__(self, properties=None):
+        self.properties = properties if properties is not None else {}
+        self.names = []
+        self.starts = array('H')
+        self.ends = array('H')
+        self.derived_minutes = bytearray()  # 1 where the JSON had 'minutes'
+        self.irregular = {}  # position -> event dict as read
+        self.has_events = True
+
+    @classmethod
+    def from_dict(cls, data, schedule_key=None):
+        """Parse one schedule of the JSON layout; ValueError if it is unusable"""
+        if not isinstance(data, dict):
+            raise ValueError(f"Schedule {schedule_key!r} must be an object")
+        schedule = cls({key: value for key, value in data.items() if key != 'events'})
+        schedule.has_events = 'events' in data
+        events = data.get('events', [])
+        if not isinstance(events, list) or not all(isinstance(e, dict) for e in events):
+            raise ValueError(f"Events of schedule {schedule_key!r} must be a list of objects")
+
+        # Fast path for the usual shape; anything else goes through set_event()
+        names, starts, ends = [''] * len(events), [NO_TIME] * len(events), [NO_TIME] * len(events)
+        derived = bytearray(len(events))
+        irregular = []
+        day_times, intern = _DAY_TIMES, sys.intern
+        for position, event in enumerate(events):
+            keys = tuple(event)
+            if keys in _CANONICAL_KEYS:
+                name = event['name']
+                start = day_times.get(event['start'])
+                end = day_times.get(event['end'])
+                if type(name) is str and start is not None and end is not None:
+                    if len(keys) == 3:
+                        names[position], starts[position], ends[position] = intern(name), start, end
+                        continue
+                    minutes = event['minutes']
+                    if (type(minutes) is int and minutes == end - start
+                            and start != NO_TIME and end != NO_TIME):
+                        names[position], starts[position], ends[position] = intern(name), start, end
+                        derived[position] = 1
+                        continue
+            irregular.append(position)
+
+        schedule.names = names
+        schedule.starts = array('H', starts)
+        schedule.ends = array('H', ends)
+        schedule.derived_minutes = derived
+        for position in irregular:
+            schedule.set_event(position, events[position], schedule_key)
+        return schedule
+
+    def append(self, event, schedule_key=None):
+        """Add an event given in the JSON layout"""
+        self.names.append('')
+        self.starts.append(NO_TIME)
+        self.ends.append(NO_TIME)
+        self.derived_minutes.append(0)
+        self.set_event(len(self.names) - 1, event, schedule_key)
+
+    def set_event(self, position, event, schedule_key=None):
+        """Replace an event with one given in the JSON layout"""
+        name = event.get('name', '')
+        if not isinstance(name, str):
+            raise ValueError(f"Event field 'name' in schedule {schedule_key!r} must be text")
+        start = _parse_time(event.get('start', ''), 'start', schedule_key)
+        end = _parse_time(event.get('end', ''), 'end', schedule_key)
+        minutes = event.get('minutes')
+
+        timed = start < BAD_TIME and end < BAD_TIME
+        canonical = (tuple(event) in _CANONICAL_KEYS and BAD_TIME not in (start, end)
+                     and (minutes is None or (timed and type(minutes) is int and minutes == end - start)))
+        if canonical:
+            self.irregular.pop(position, None)
+        else:
+            self.irregular[position] = copy.deepcopy(event)
+        self.names[position] = sys.intern(name)
+        self.starts[position] = start
+        self.ends[position] = end
+        self.derived_minutes[position] = canonical and minutes is not None
+
+    @property
+    def name(self):
+        return self.properties.get('name')
+
+    @name.setter
+    def name(self, name):
+        self.properties['name'] = name
+
+    @property
+    def label(self):
+        return self.properties.get('label')
+
+    def __len__(self):
+        return len(self.names)
+
+    def __eq__(self, other):
+        if not isinstance(other, Schedule):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __repr__(self):
+        return f"Schedule({self.name!r}, {len(self)} events)"
+
+    def __getitem__(self, position):
+        start, end = self.starts[position], self.ends[position]
+        return Event(self.names[position],
+                     start if start < BAD_TIME else None,
+                     end if end < BAD_TIME else None)
+
+    def __iter__(self):
+        return (self[position] for position in range(len(self.names)))
+
+    def has_malformed_times(self):
+        return BAD_TIME in self.starts or BAD_TIME in self.ends
+
+    def columns(self):
+        """Return (names, starts, ends) with None for unset times, for ScheduleIndex
+
+        Raises ValueError if any time is malformed.
+        """
+        if self.has_malformed_times():
+            raise ValueError("Schedule has malformed times")
+        starts = [None if minute == NO_TIME else minute for minute in self.starts]
+        ends = [None if minute == NO_TIME else minute for minute in self.ends]
+        return self.names, starts, ends
+
+    def event_dict(self, position):
+        """Return one event in the JSON layout"""
+        if position in self.irregular:
+            return copy.deepcopy(self.irregular[position])
+        start, end = self.starts[position], self.ends[position]
+        event = {'name': self.names[position],
+                 'start': '' if start == NO_TIME else format_minutes(start),
+                 'end': '' if end == NO_TIME else format_minutes(end)}
+        if self.derived_minutes[position]:
+            event['minutes'] = end - start
+        return event
+
+    def event_dicts(self):
+        return [self.event_dict(position) for position in range(len(self.names))]
+
+    def to_dict(self):
+        """Return the schedule in the JSON layout"""
+        data = copy.deepcopy(self.properties)
+        if self.has_events:
+            data['events'] = self.event_dicts()
+        return data
+
+
+def parse_schedules(schedules):
+    """Parse an organization's schedules ({key: JSON schedule}) into Schedule records
+
+    Records already parsed are kept as they are. Raises ValueError if the
+    data does not have the shape the display relies on.
+    """
+    if not isinstance(schedules, dict):
+        raise ValueError("Organization must map schedule keys to schedules")
+    return {key: schedule if isinstance(schedule, Schedule) else Schedule.from_dict(schedule, key)
+            for key, schedule in schedules.items()}
+
+
+def schedules_to_json(schedules):
+    """Return an organization's schedules in the JSON layout (records or JSON)"""
+    return {key: schedule.to_dict() if isinstance(schedule, Schedule) else schedule
+            for key, schedule in schedules.items()}
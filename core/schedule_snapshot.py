@@ -0,0 +1,135 @@
+# Compiled snapshot of the schedule file for fast startup
+
+import hashlib
+import json
+import marshal
+import os
+from array import array
+from core.atomic_write import atomic_write
+
+# Bump when the payload layout or ScheduleIndex fields change
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MAGIC = 'schedule-minder-snapshot'
+# A snapshot is only valid for the same marshal format and array item sizes
+SNAPSHOT_FORMAT = (SNAPSHOT_VERSION, marshal.version, array('l').itemsize)
+
+
+def snapshot_path(schedule_file):
+    """Return the snapshot file stored next to a schedule file"""
+    return os.path.splitext(schedule_file)[0] + '.snapshot'
+
+
+def content_digest(data_bytes):
+    return hashlib.blake2b(data_bytes, digest_size=16).digest()
+
+
+class ScheduleSnapshot:
+    """Parsed schedule file plus compiled indexes, cached in a marshal file.
+
+    The snapshot header records the mtime, size and content hash of the
+    JSON it was built from. load() uses the snapshot without reading the
+    JSON when mtime and size match, and after hashing the JSON when only
+    the mtime changed (a touch or copy). Otherwise it parses the JSON and
+    marks the snapshot stale so the caller regenerates it with save().
+
+    Each organization is stored as its own marshal blob and only decoded
+    when schedules() asks for it, so a district-wide file costs little
+    more to open than a single school. index_states maps organization ->
+    schedule key -> ScheduleIndex state (None for schedules that cannot be
+    indexed).
+    """
+
+    def __init__(self, schedule_file, snapshot_file=None):
+        self.schedule_file = schedule_file
+        self.snapshot_file = snapshot_file or snapshot_path(schedule_file)
+        self.organizations = []
+        self.index_states = {}
+        self.stale = True
+        self._blobs = {}    # organization -> marshal bytes
+        self._parsed = {}   # organization -> decoded schedules
+        self._source = None  # (mtime_ns, size, digest) of the loaded JSON
+
+    def _read_snapshot(self):
+        try:
+            with open(self.snapshot_file, 'rb') as f:
+                snapshot = marshal.loads(f.read())
+            magic, file_format, mtime_ns, size, digest, payload = snapshot
+            if magic != SNAPSHOT_MAGIC or file_format != SNAPSHOT_FORMAT:
+                return None
+            payload = {'organizations': dict(payload['organizations']),
+                       'indexes': dict(payload['indexes'])}
+        except (OSError, EOFError, ValueError, TypeError, KeyError):
+            return None  # Missing, corrupt or from another version
+        return mtime_ns, size, digest, payload
+
+    def load(self):
+        """Load the schedule file, from the snapshot when it is current
+
+        Returns the list of organizations; raises OSError or ValueError if
+        the JSON has to be parsed and cannot be.
+        """
+        stat = os.stat(self.schedule_file)
+        snapshot = self._read_snapshot()
+        if snapshot is not None:
+            mtime_ns, size, digest, payload = snapshot
+            if (mtime_ns, size) == (stat.st_mtime_ns, stat.st_size):
+                self._use(payload, {}, (mtime_ns, size, digest), stale=False)
+                return self.organizations
+
+        with open(self.schedule_file, 'rb') as f:
+            data_bytes = f.read()
+        source = (stat.st_mtime_ns, len(data_bytes), content_digest(data_bytes))
+        if snapshot is not None and snapshot[1:3] == source[1:]:
+            # Same content, new mtime: reuse it and refresh the header
+            self._use(snapshot[3], {}, source, stale=True)
+            return self.organizations
+
+        data = json.loads(data_bytes)
+        if not isinstance(data, dict):
+            raise ValueError("Schedule file must map organizations to schedules")
+        self._use({'organizations': {}, 'indexes': {}}, data, source, stale=True)
+        self.organizations = list(data)
+        return self.organizations
+
+    def _use(self, payload, parsed, source, stale):
+        self._blobs = payload['organizations']
+        self._parsed = parsed
+        self.organizations = list(self._blobs)
+        self.index_states = payload['indexes']
+        self._source = source
+        self.stale = stale
+
+    def schedules(self, organization):
+        """Return the schedules of one organization from the last load()"""
+        if organization not in self._parsed:
+            self._parsed[organization] = marshal.loads(self._blobs[organization])
+        return self._parsed[organization]
+
+    def set_index_states(self, organization, states):
+        """Record the compiled indexes of an organization for the next save()"""
+        if self.index_states.get(organization) != states:
+            self.index_states[organization] = states
+            self.stale = True
+
+    def save(self):
+        """Write the snapshot of the JSON last read by load()
+
+        Does nothing if the snapshot is current. Call before the loaded
+        schedules are edited. A snapshot that cannot be written (e.g. a
+        read-only data directory) is skipped silently; the next start simply
+        parses the JSON again.
+        """
+        if not self.stale or self._source is None:
+            return
+        try:
+            blobs = {organization: self._blobs.get(organization)
+                     or marshal.dumps(self._parsed[organization])
+                     for organization in self.organizations}
+            mtime_ns, size, digest = self._source
+            snapshot = (SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, mtime_ns, size, digest,
+                        {'organizations': blobs, 'indexes': self.index_states})
+            atomic_write(self.snapshot_file, marshal.dumps(snapshot))
+        except (OSError, ValueError):
+            return
+        self._blobs = blobs
+        self.stale = False
@@ -0,0 +1,266 @@
+# Storage backends for schedule data: the JSON file and an SQLite database
+
+import json
+import os
+import sqlite3
+from contextlib import closing
+from core.atomic_write import atomic_write
+from core.schedule_snapshot import ScheduleSnapshot
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+SQLITE_SCHEMA_VERSION = 1
+EVENT_FIELDS = ('name', 'start', 'end')
+
+
+def open_store(path):
+    """Return the storage backend for a schedule file, chosen by its extension"""
+    if os.path.splitext(path)[1].lower() in SQLITE_EXTENSIONS:
+        return SqliteScheduleStore(path)
+    return JsonScheduleStore(path)
+
+
+class JsonScheduleStore:
+    """All organizations in one JSON file, rewritten in full on save.
+
+    Every backend provides the same methods: read_organizations(), load(),
+    save(), update_event(), and cached_indexes()/cache_indexes() for
+    backends that keep compiled indexes. Here the parsed file and the
+    indexes come from a ScheduleSnapshot when it is current.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.snapshot = ScheduleSnapshot(path)
+
+    def read_organizations(self):
+        """Re-read the store and return its organization names in order"""
+        return list(self.snapshot.load())
+
+    def load(self, organization):
+        """Return one organization's schedules as read by read_organizations()"""
+        return self.snapshot.schedules(organization)
+
+    def _read_for_rewrite(self):
+        """Return the whole file ({} if missing) before it is rewritten
+
+        Raises ValueError if it cannot be read, since rewriting it would
+        drop the other organizations.
+        """
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Not saving: {self.path} could not be read ({e}); "
+                             f"saving would drop its other organizations") from e
+        if not isinstance(data, dict):
+            raise ValueError(f"Not saving: {self.path} does not hold organizations")
+        return data
+
+    def save(self, organization, schedules):
+        """Replace one organization's schedules, keeping the others
+
+        Raises ValueError (and leaves the file alone) if the existing file
+        cannot be read.
+        """
+        data = self._read_for_rewrite()
+        data[organization] = schedules
+        atomic_write(self.path, json.dumps(data, indent=4).encode('utf-8'))
+
+    def update_event(self, organization, schedule_key, position, event):
+        """Replace one event; the JSON file is still rewritten in full
+
+        Raises KeyError if the event does not exist and ValueError if the
+        file cannot be read, leaving the file alone.
+        """
+        data = self._read_for_rewrite()
+        try:
+            events = data[organization][schedule_key]['events']
+            if not 0 <= position < len(events):
+                raise IndexError(position)
+        except (KeyError, TypeError, IndexError):
+            raise KeyError(f"No event {position} in {organization}/{schedule_key}") from None
+        events[position] = event
+        atomic_write(self.path, json.dumps(data, indent=4).encode('utf-8'))
+
+    def cached_indexes(self, organization):
+        return self.snapshot.index_states.get(organization, {})
+
+    def cache_indexes(self, organization, states):
+        self.snapshot.set_index_states(organization, states)
+        self.snapshot.save()
+
+
+class SqliteScheduleStore:
+    """Organizations, schedules and events as rows of an SQLite database.
+
+    Loading an organization reads only its rows. save() compares the new
+    schedules with the stored rows and writes only the differences, in one
+    transaction, so editing one event updates one row. Event keys other
+    than name, start and end (e.g. minutes) and schedule properties are
+    kept as JSON so the data round-trips losslessly to the JSON format; a
+    schedule without an events key is marked with "events": null in its
+    properties, so it is loaded without one.
+    A connection is opened per call, so the store can be used from the
+    background writer and reload threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS organizations (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL UNIQUE,
+                    position INTEGER NOT NULL);
+                CREATE TABLE IF NOT EXISTS schedules (
+                    id INTEGER PRIMARY KEY,
+                    organization_id INTEGER NOT NULL REFERENCES organizations(id) ON DELETE CASCADE,
+                    key TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    properties TEXT NOT NULL,
+                    UNIQUE (organization_id, key));
+                CREATE TABLE IF NOT EXISTS events (
+                    id INTEGER PRIMARY KEY,
+                    schedule_id INTEGER NOT NULL REFERENCES schedules(id) ON DELETE CASCADE,
+                    position INTEGER NOT NULL,
+                    name TEXT NOT NULL,
+                    start_time TEXT NOT NULL,
+                    end_time TEXT NOT NULL,
+                    extra TEXT,
+                    UNIQUE (schedule_id, position));
+            """)
+            conn.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def read_organizations(self):
+        with closing(self._connect()) as conn:
+            return [name for name, in conn.execute(
+                "SELECT name FROM organizations ORDER BY position, id")]
+
+    def load(self, organization):
+        with closing(self._connect()) as conn:
+            rows = conn.execute("""
+                SELECT s.key, s.properties, e.name, e.start_time, e.end_time, e.extra
+                FROM organizations o
+                JOIN schedules s ON s.organization_id = o.id
+                LEFT JOIN events e ON e.schedule_id = s.id
+                WHERE o.name = ?
+                ORDER BY s.position, s.id, e.position""", (organization,))
+            schedules = {}
+            for key, properties, name, start, end, extra in rows:
+                if key not in schedules:
+                    schedules[key] = json.loads(properties)
+                    if schedules[key].get('events', []) is None:
+                        del schedules[key]['events']  # Saved without an events key
+                    else:
+                        schedules[key]['events'] = []
+                if name is not None:
+                    event = {'name': name, 'start': start, 'end': end}
+                    if extra:
+                        event.update(json.loads(extra))
+                    schedules[key]['events'].append(event)
+        return schedules
+
+    @staticmethod
+    def _event_row(event):
+        extra = {k: v for k, v in event.items() if k not in EVENT_FIELDS}
+        return (event.get('name', ''), event.get('start', ''), event.get('end', ''),
+                json.dumps(extra) if extra else None)
+
+    def _organization_id(self, conn, organization):
+        row = conn.execute("SELECT id FROM organizations WHERE name = ?", (organization,)).fetchone()
+        if row is not None:
+            return row[0]
+        position = conn.execute("SELECT COUNT(*) FROM organizations").fetchone()[0]
+        return conn.execute("INSERT INTO organizations (name, position) VALUES (?, ?)",
+                            (organization, position)).lastrowid
+
+    def save(self, organization, schedules):
+        """Store one organization's schedules, writing only changed rows
+
+        Returns the number of rows inserted, updated or deleted.
+        """
+        with closing(self._connect()) as conn, conn:
+            before = conn.total_changes
+            organization_id = self._organization_id(conn, organization)
+            stored = {key: (schedule_id, position, properties) for schedule_id, key, position, properties
+                      in conn.execute("SELECT id, key, position, properties FROM schedules "
+                                      "WHERE organization_id = ?", (organization_id,))}
+
+            for key in set(stored) - set(schedules):
+                conn.execute("DELETE FROM schedules WHERE id = ?", (stored[key][0],))
+
+            for position, (key, schedule) in enumerate(schedules.items()):
+                properties = {k: v for k, v in schedule.items() if k != 'events'}
+                if 'events' not in schedule:
+                    properties['events'] = None
+                properties = json.dumps(properties)
+                if key not in stored:
+                    schedule_id = conn.execute(
+                        "INSERT INTO schedules (organization_id, key, position, properties) "
+                        "VALUES (?, ?, ?, ?)", (organization_id, key, position, properties)).lastrowid
+                else:
+                    schedule_id = stored[key][0]
+                    if stored[key][1:] != (position, properties):
+                        conn.execute("UPDATE schedules SET position = ?, properties = ? WHERE id = ?",
+                                     (position, properties, schedule_id))
+                self._save_events(conn, schedule_id, schedule.get('events', []))
+            return conn.total_changes - before
+
+    def _save_events(self, conn, schedule_id, events):
+        stored = {position: (name, start, end, extra) for position, name, start, end, extra
+                  in conn.execute("SELECT position, name, start_time, end_time, extra FROM events "
+                                  "WHERE schedule_id = ?", (schedule_id,))}
+        for position, event in enumerate(events):
+            row = self._event_row(event)
+            if position not in stored:
+                conn.execute("INSERT INTO events (schedule_id, position, name, start_time, end_time, extra) "
+                             "VALUES (?, ?, ?, ?, ?, ?)", (schedule_id, position) + row)
+            elif stored[position] != row:
+                conn.execute("UPDATE events SET name = ?, start_time = ?, end_time = ?, extra = ? "
+                             "WHERE schedule_id = ? AND position = ?", row + (schedule_id, position))
+        if len(stored) > len(events):
+            conn.execute("DELETE FROM events WHERE schedule_id = ? AND position >= ?",
+                         (schedule_id, len(events)))
+
+    def update_event(self, organization, schedule_key, position, event):
+        """Replace one event in a single-row transaction; KeyError if it does not exist"""
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute("""
+                UPDATE events SET name = ?, start_time = ?, end_time = ?, extra = ?
+                WHERE position = ? AND schedule_id = (
+                    SELECT s.id FROM schedules s JOIN organizations o ON s.organization_id = o.id
+                    WHERE o.name = ? AND s.key = ?)""",
+                self._event_row(event) + (position, organization, schedule_key))
+            if cursor.rowcount != 1:
+                raise KeyError(f"No event {position} in {organization}/{schedule_key}")
+
+    def cached_indexes(self, organization):
+        return {}
+
+    def cache_indexes(self, organization, states):
+        pass
+
+
+def import_json(store, json_file):
+    """Copy every organization from a JSON schedule file into a store"""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError("Schedule file must map organizations to schedules")
+    for organization, schedules in data.items():
+        store.save(organization, schedules)
+    return list(data)
+
+
+def export_json(store, json_file):
+    """Write every organization in a store to a JSON schedule file"""
+    data = {organization: store.load(organization) for organization in store.read_organizations()}
+    atomic_write(json_file, json.dumps(data, indent=4).encode('utf-8'))
+    return list(data)
@@ -0,0 +1,139 @@
+# Schedule validation: overlaps, gaps, ordering, minutes and malformed times
+
+import heapq
+import sqlite3
+import sys
+from core.schedule_index import time_to_minutes
+from core.schedule_storage import open_store
+
+ERROR = 'error'
+WARNING = 'warning'
+INFO = 'info'
+
+
+class ScheduleIssue:
+    """One problem found in a schedule
+
+    kind is one of 'malformed', 'end_before_start', 'overlap', 'order',
+    'minutes' or 'gap'; events holds the indexes of the events involved.
+    """
+
+    def __init__(self, severity, kind, schedule_key, events, message):
+        self.severity = severity
+        self.kind = kind
+        self.schedule_key = schedule_key
+        self.events = events
+        self.message = message
+
+    def __repr__(self):
+        return f"ScheduleIssue({self.severity!r}, {self.kind!r}, {self.schedule_key!r}, {self.events!r})"
+
+    def __str__(self):
+        return f"{self.severity}: {self.schedule_key}: {self.message}"
+
+
+def _format_minutes(minute):
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def validate_events(events, schedule_key=None):
+    """Return the issues found in one schedule's event list
+
+    Events are treated as half-open intervals [start, end), so one event
+    ending at the minute the next one starts is a handoff, not an overlap.
+    The events are sorted once and swept with a heap of the intervals still
+    open, which takes O(n log n + k) for k overlapping pairs.
+    """
+    issues = []
+
+    def report(severity, kind, indexes, message):
+        issues.append(ScheduleIssue(severity, kind, schedule_key, indexes, message))
+
+    def label(i):
+        return f"'{events[i].get('name', '')}' ({events[i].get('start', '')}-{events[i].get('end', '')})"
+
+    intervals = []
+    for i, event in enumerate(events):
+        start = time_to_minutes(event.get('start'))
+        end = time_to_minutes(event.get('end'))
+        bad = [field for field, value in (('start', start), ('end', end)) if value is None]
+        if bad:
+            values = ", ".join(f"{field} {event.get(field, '')!r}" for field in bad)
+            report(ERROR, 'malformed', [i], f"'{event.get('name', '')}' has a malformed {values}")
+            continue
+        if end < start:
+            report(ERROR, 'end_before_start', [i], f"{label(i)} ends before it starts")
+            continue
+        minutes = event.get('minutes')
+        if minutes is not None and minutes != end - start:
+            report(WARNING, 'minutes', [i],
+                   f"{label(i)} lasts {end - start} minutes but 'minutes' is {minutes}")
+        intervals.append((start, end, i))
+
+    # The display scans events in list order, so out-of-order lists give
+    # surprising "between" messages
+    for previous, current in zip(intervals, intervals[1:]):
+        if current[0] < previous[0]:
+            report(WARNING, 'order', [previous[2], current[2]],
+                   f"{label(current[2])} is listed after {label(previous[2])}")
+
+    intervals.sort()
+    active = []  # (end, index) of the events still open
+    covered_until = None
+    for start, end, i in intervals:
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+        for _, other in sorted(active, key=lambda item: item[1]):
+            report(ERROR, 'overlap', [other, i], f"{label(other)} overlaps {label(i)}")
+        if covered_until is not None and start > covered_until:
+            report(INFO, 'gap', [], f"no event from {_format_minutes(covered_until)} "
+                                    f"to {_format_minutes(start)}")
+        if start < end:
+            heapq.heappush(active, (end, i))
+        covered_until = end if covered_until is None else max(covered_until, end)
+    return issues
+
+
+def validate_schedules(schedules):
+    """Return the issues found in every schedule of an organization"""
+    issues = []
+    for key, schedule in schedules.items():
+        issues.extend(validate_events(schedule.get('events', []), key))
+    return issues
+
+
+def has_errors(issues):
+    return any(issue.severity == ERROR for issue in issues)
+
+
+def run_check(schedule_file, output=None, organization=None):
+    """Validate the schedules of every organization (or just one) in a schedule store
+
+    Prints one line per issue and a summary. Returns the process exit code:
+    0 when there are no errors, 1 otherwise.
+    """
+    output = output or sys.stdout
+    try:
+        store = open_store(schedule_file)
+        organizations = store.read_organizations()
+        if organization is not None:
+            if organization not in organizations:
+                print(f"Error: Unknown organization {organization!r}", file=sys.stderr)
+                return 1
+            organizations = [organization]
+        data = {name: store.load(name) for name in organizations}
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    counts = {ERROR: 0, WARNING: 0, INFO: 0}
+    for name, schedules in data.items():
+        if not isinstance(schedules, dict):
+            print(f"error: {name}: not a set of schedules", file=output)
+            counts[ERROR] += 1
+            continue
+        for issue in validate_schedules(schedules):
+            print(f"{issue.severity}: {name}/{issue.schedule_key}: {issue.message}", file=output)
+            counts[issue.severity] += 1
+    print(f"{counts[ERROR]} errors, {counts[WARNING]} warnings, {counts[INFO]} gaps", file=output)
+    return 1 if counts[ERROR] else 0
@@ -0,0 +1,205 @@
+# School calendar: which schedule applies on which date
+
+import json
+from array import array
+from datetime import date, timedelta
+
+WEEKDAYS = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
+NO_SCHEDULE = -1
+
+
+def parse_date(value):
+    """Convert a 'YYYY-MM-DD' string to a date, raising ValueError if malformed"""
+    if not isinstance(value, str):
+        raise ValueError(f"Malformed date: {value!r}")
+    return date.fromisoformat(value)
+
+
+def load_calendars(calendar_file):
+    """Read the calendar file, mapping organizations to calendar definitions
+
+    Returns an empty dict when the file does not exist.
+    """
+    try:
+        with open(calendar_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError("Calendar file must map organizations to calendars")
+    return data
+
+
+def _month_starts(first, last):
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _days_in_month(year, month):
+    following = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return (following - date(year, month, 1)).days
+
+
+def _whole_number(rule, field, default):
+    value = rule.get(field, default)
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f"Rule {field} must be a whole number: {value!r}")
+    return value
+
+
+def _entries(definition, field):
+    """Return the list of rules, exceptions or overrides of a definition"""
+    entries = definition.get(field, [])
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+        raise ValueError(f"Calendar {field} must be a list of objects")
+    return entries
+
+
+def _rule_dates(rule, first, last):
+    """Yield every date from first to last (inclusive) that the rule matches"""
+    freq = rule.get('freq')
+    interval = _whole_number(rule, 'interval', 1)
+    if interval < 1:
+        raise ValueError(f"Rule interval must be a positive whole number: {interval!r}")
+
+    if freq == 'daily':
+        for offset in range(0, (last - first).days + 1, interval):
+            yield first + timedelta(days=offset)
+
+    elif freq == 'weekly':
+        weekdays = rule.get('weekdays', WEEKDAYS[:5])
+        if not isinstance(weekdays, list):
+            raise ValueError(f"Rule weekdays must be a list: {weekdays!r}")
+        week_start = first - timedelta(days=first.weekday())
+        for name in weekdays:
+            if name not in WEEKDAYS:
+                raise ValueError(f"Unknown weekday: {name!r}")
+            day = week_start + timedelta(days=WEEKDAYS.index(name))
+            while day <= last:
+                if day >= first:
+                    yield day
+                day += timedelta(weeks=interval)
+
+    elif freq == 'monthly':
+        for index, (year, month) in enumerate(_month_starts(first, last)):
+            if index % interval:
+                continue
+            length = _days_in_month(year, month)
+            if 'weekday' in rule:
+                # nth weekday of the month, e.g. nth=1 weekday='wed'; nth=-1 is the last
+                if rule['weekday'] not in WEEKDAYS:
+                    raise ValueError(f"Unknown weekday: {rule['weekday']!r}")
+                target = WEEKDAYS.index(rule['weekday'])
+                matches = [d for d in range(1, length + 1)
+                           if date(year, month, d).weekday() == target]
+                nth = _whole_number(rule, 'nth', 1)
+                if nth and -len(matches) <= nth <= len(matches):
+                    days = [matches[nth - 1 if nth > 0 else nth]]
+                else:
+                    days = []
+            else:
+                day_of_month = _whole_number(rule, 'day', 1)
+                days = [day_of_month] if 1 <= day_of_month <= length else []
+            for d in days:
+                day = date(year, month, d)
+                if first <= day <= last:
+                    yield day
+
+    elif freq == 'yearly':
+        month, day_of_month = rule.get('month'), rule.get('day')
+        for year in range(first.year, last.year + 1):
+            try:
+                day = date(year, month, day_of_month)
+            except (TypeError, ValueError):
+                raise ValueError(f"Yearly rule needs a valid month and day: {rule!r}")
+            if first <= day <= last:
+                yield day
+
+    else:
+        raise ValueError(f"Unknown rule frequency: {freq!r}")
+
+
+class SchoolCalendar:
+    """Compiled date -> schedule assignment for one organization.
+
+    A calendar definition looks like:
+
+        {"start": "2026-09-08", "end": "2027-06-25",
+         "rules": [{"schedule": "schedule_1", "freq": "weekly",
+                    "weekdays": ["mon", "tue", "thu", "fri"]},
+                   {"schedule": "schedule_3", "freq": "weekly", "weekdays": ["wed"]}],
+         "exceptions": [{"name": "Winter Break", "start": "2026-12-21", "end": "2027-01-01"}],
+         "overrides": [{"date": "2027-01-15", "schedule": "schedule_2"}]}
+
+    Rules are applied in order, so a later rule wins over an earlier one on
+    the dates both match. Exceptions (days off) are applied next and
+    overrides last. The whole school year is expanded once into an array
+    with one schedule number per day, so schedule_for() is a subtraction
+    and an array read. Raises ValueError for a malformed definition or,
+    when schedule_keys is given, a schedule that does not exist.
+    """
+
+    def __init__(self, definition, schedule_keys=None):
+        if not isinstance(definition, dict):
+            raise ValueError("Calendar must be an object")
+        self.start = parse_date(definition.get('start'))
+        self.end = parse_date(definition.get('end'))
+        if self.end < self.start:
+            raise ValueError("Calendar ends before it starts")
+        self.first_ordinal = self.start.toordinal()
+        self.keys = []
+        self._key_codes = {}
+        self._known_keys = set(schedule_keys) if schedule_keys is not None else None
+        self.codes = array('h', [NO_SCHEDULE]) * ((self.end - self.start).days + 1)
+
+        for rule in _entries(definition, 'rules'):
+            code = self._code(rule.get('schedule'))
+            first = max(self.start, parse_date(rule['start'])) if 'start' in rule else self.start
+            last = min(self.end, parse_date(rule['end'])) if 'end' in rule else self.end
+            for day in _rule_dates(rule, first, last):
+                self.codes[(day - self.start).days] = code
+
+        for exception in _entries(definition, 'exceptions'):
+            first = parse_date(exception.get('start', exception.get('date')))
+            last = parse_date(exception['end']) if 'end' in exception else first
+            self._fill(first, last, NO_SCHEDULE)
+
+        for override in _entries(definition, 'overrides'):
+            day = parse_date(override.get('date'))
+            self._fill(day, day, self._code(override.get('schedule')))
+
+    def _code(self, schedule_key):
+        if not isinstance(schedule_key, str):
+            raise ValueError(f"Calendar entry needs a schedule: {schedule_key!r}")
+        if self._known_keys is not None and schedule_key not in self._known_keys:
+            raise ValueError(f"Unknown schedule in calendar: {schedule_key!r}")
+        if schedule_key not in self._key_codes:
+            self._key_codes[schedule_key] = len(self.keys)
+            self.keys.append(schedule_key)
+        return self._key_codes[schedule_key]
+
+    def _fill(self, first, last, code):
+        first = max(first, self.start)
+        last = min(last, self.end)
+        for offset in range((first - self.start).days, (last - self.start).days + 1):
+            self.codes[offset] = code
+
+    def schedule_for(self, day):
+        """Return the schedule key that applies on a date, or None
+
+        None means a day off or a date outside the school year.
+        """
+        offset = day.toordinal() - self.first_ordinal
+        if 0 <= offset < len(self.codes):
+            code = self.codes[offset]
+            if code != NO_SCHEDULE:
+                return self.keys[code]
+        return None
+
+    def assignments(self):
+        """Yield (date, schedule key or None) for every day of the school year"""
+        for offset, code in enumerate(self.codes):
+            yield (self.start + timedelta(days=offset),
+                   self.keys[code] if code != NO_SCHEDULE else None)
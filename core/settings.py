@@ -0,0 +1,40 @@
+# Settings interface of the schedule engine
+
+import copy
+from constants import DEFAULT_MESSAGES, DEFAULT_ORGANIZATION
+
+
+class ScheduleSettings:
+    """The settings ScheduleManager reads and writes.
+
+    The GUI passes its QSettings-backed SettingsManager; headless tools and
+    tests can pass MemorySettings or any object with these methods.
+    """
+
+    def get_organization(self):
+        """Return the selected organization (schedule file root key)"""
+        raise NotImplementedError
+
+    def save_organization(self, organization):
+        raise NotImplementedError
+
+    def get_schedule_messages(self):
+        """Return the message templates, customized or default"""
+        raise NotImplementedError
+
+
+class MemorySettings(ScheduleSettings):
+    """Settings kept in memory, starting from the defaults"""
+
+    def __init__(self, organization=DEFAULT_ORGANIZATION, messages=None):
+        self.organization = organization
+        self.messages = dict(DEFAULT_MESSAGES, **(messages or {}))
+
+    def get_organization(self):
+        return self.organization
+
+    def save_organization(self, organization):
+        self.organization = organization
+
+    def get_schedule_messages(self):
+        return copy.copy(self.messages)
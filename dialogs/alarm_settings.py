@@ -0,0 +1,111 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QFormLayout, QGroupBox, QCheckBox,
+                            QLineEdit, QPushButton, QLabel, QHBoxLayout, QMessageBox,
+                            QFileDialog)
+from core.alarms import parse_offsets, format_offsets
+
+class AlarmSettingsDialog(QDialog):
+    """Edits the pre-bell alarms: minutes before each bell, and how they ring"""
+
+    def __init__(self, settings_manager, schedule_manager, parent=None):
+        super().__init__(parent)
+        self.settings_manager = settings_manager
+        self.schedule_manager = schedule_manager
+        self.setWindowTitle("Alarm Settings")
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        alarms = self.settings_manager.get_alarm_settings()
+
+        self.enabled_check = QCheckBox("Enable alarms")
+        self.enabled_check.setChecked(alarms['enabled'])
+        layout.addWidget(self.enabled_check)
+
+        # Minutes before event starts and ends, per schedule
+        offsets_group = QGroupBox("Minutes before (e.g. 5, 0)")
+        offsets_layout = QFormLayout(offsets_group)
+        self.offset_inputs = {}
+        for key in self.schedule_manager.schedules:
+            offsets = alarms['schedules'].get(key, {})
+            start_input = QLineEdit(format_offsets(offsets.get('start', [])))
+            start_input.setPlaceholderText("Event starts")
+            end_input = QLineEdit(format_offsets(offsets.get('end', [])))
+            end_input.setPlaceholderText("Event ends")
+            row = QHBoxLayout()
+            row.addWidget(start_input)
+            row.addWidget(end_input)
+            offsets_layout.addRow(self.schedule_manager.schedule_label(key), row)
+            self.offset_inputs[key] = (start_input, end_input)
+        layout.addWidget(offsets_group)
+
+        # Where alarms go
+        sinks_group = QGroupBox("Notify with")
+        sinks_layout = QFormLayout(sinks_group)
+        self.tray_check = QCheckBox("Tray balloon")
+        self.tray_check.setChecked(alarms['tray'])
+        sinks_layout.addRow(self.tray_check)
+
+        self.sound_check = QCheckBox("Sound")
+        self.sound_check.setChecked(alarms['sound'])
+        self.sound_file_input = QLineEdit(alarms['sound_file'])
+        self.sound_file_input.setPlaceholderText("System beep")
+        browse_btn = QPushButton("Browse...")
+        browse_btn.clicked.connect(self.browse_sound_file)
+        sound_row = QHBoxLayout()
+        sound_row.addWidget(self.sound_file_input)
+        sound_row.addWidget(browse_btn)
+        sinks_layout.addRow(self.sound_check, sound_row)
+
+        self.command_input = QLineEdit(alarms['command'])
+        sinks_layout.addRow("Command", self.command_input)
+        sinks_layout.addRow('', QLabel("Use {label}, {event} and {message}"))
+
+        self.webhook_input = QLineEdit(alarms['webhook'])
+        self.webhook_input.setPlaceholderText("http://localhost:8080/alarm")
+        sinks_layout.addRow("Webhook URL", self.webhook_input)
+        layout.addWidget(sinks_group)
+
+        # Buttons
+        button_layout = QHBoxLayout()
+        save_btn = QPushButton("Save")
+        cancel_btn = QPushButton("Cancel")
+        save_btn.clicked.connect(self.save_alarms)
+        cancel_btn.clicked.connect(self.reject)
+        button_layout.addStretch()
+        button_layout.addWidget(save_btn)
+        button_layout.addWidget(cancel_btn)
+        layout.addLayout(button_layout)
+
+    def browse_sound_file(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Select Sound", "", "Sounds (*.wav)")
+        if file_path:
+            self.sound_file_input.setText(file_path)
+
+    def save_alarms(self):
+        schedules = {}
+        try:
+            for key, (start_input, end_input) in self.offset_inputs.items():
+                offsets = {'start': parse_offsets(start_input.text()),
+                           'end': parse_offsets(end_input.text())}
+                if offsets['start'] or offsets['end']:
+                    schedules[key] = offsets
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Minutes", str(e))
+            return
+
+        # Keep the offsets of schedules in other organizations
+        alarms = self.settings_manager.get_alarm_settings()
+        saved = {key: offsets for key, offsets in alarms['schedules'].items()
+                 if key not in self.offset_inputs}
+        saved.update(schedules)
+        alarms.update({
+            'enabled': self.enabled_check.isChecked(),
+            'schedules': saved,
+            'tray': self.tray_check.isChecked(),
+            'sound': self.sound_check.isChecked(),
+            'sound_file': self.sound_file_input.text().strip(),
+            'command': self.command_input.text().strip(),
+            'webhook': self.webhook_input.text().strip(),
+        })
+        self.settings_manager.save_alarm_settings(alarms)
+        self.accept()
@@ -0,0 +1,244 @@
+# Table model that edits a schedule's event list in place
+import csv
+import io
+from PyQt6.QtCore import Qt, QAbstractTableModel, QAbstractProxyModel, QModelIndex
+from PyQt6.QtGui import QColor
+from core.schedule_index import time_to_minutes
+from core.schedule_validator import ERROR, WARNING
+
+# Row highlights for validation issues
+ISSUE_COLORS = {ERROR: QColor("#f8d0d0"), WARNING: QColor("#fbefc4")}
+ISSUE_ROLES = [Qt.ItemDataRole.BackgroundRole, Qt.ItemDataRole.ToolTipRole]
+
+COLUMNS = [('name', "Event"), ('start', "Start Time"), ('end', "End Time")]
+
+
+def parse_event_rows(text):
+    """Parse pasted or imported text (tab- or comma-separated) into event dicts
+
+    Each row is name, start, end; blank rows and a header row are skipped.
+    """
+    dialect = 'excel-tab' if '\t' in text else 'excel'
+    events = []
+    for row in csv.reader(io.StringIO(text), dialect):
+        cells = [cell.strip() for cell in row]
+        if not any(cells):
+            continue
+        cells += [''] * (3 - len(cells))
+        if not events and cells[1].lower().startswith('start'):
+            continue  # Header row
+        events.append({'name': cells[0], 'start': cells[1], 'end': cells[2]})
+    return events
+
+
+class EventTableModel(QAbstractTableModel):
+    """Exposes a list of event dicts as a three-column table.
+
+    Edits write straight into the event dict for that row, so a keystroke
+    costs O(1) instead of rebuilding the list. Keys other than name, start
+    and end are preserved; a 'minutes' field is kept in step with the times.
+    """
+
+    def __init__(self, events=None, parent=None):
+        super().__init__(parent)
+        self.events = events if events is not None else []
+        self.row_issues = {}  # row -> (severity, tooltip)
+
+    def set_events(self, events):
+        self.beginResetModel()
+        self.events = events
+        self.row_issues = {}
+        self.endResetModel()
+
+    def set_issues(self, issues):
+        """Highlight the rows involved in the given validation issues"""
+        row_issues = {}
+        for issue in issues:
+            for row in issue.events:
+                severity, messages = row_issues.get(row, (issue.severity, []))
+                if issue.severity == ERROR:
+                    severity = ERROR
+                messages.append(issue.message)
+                row_issues[row] = (severity, messages)
+        self.row_issues = {row: (severity, "\n".join(messages))
+                           for row, (severity, messages) in row_issues.items()}
+        if self.events:
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(len(self.events) - 1, len(COLUMNS) - 1), ISSUE_ROLES)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.events)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section][1]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self.events[index.row()].get(COLUMNS[index.column()][0], '')
+        if role in ISSUE_ROLES and index.row() in self.row_issues:
+            severity, tooltip = self.row_issues[index.row()]
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return tooltip
+            return ISSUE_COLORS.get(severity)
+        return None
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        event = self.events[index.row()]
+        event[COLUMNS[index.column()][0]] = str(value).strip()
+        if 'minutes' in event and index.column() > 0:
+            start, end = time_to_minutes(event.get('start')), time_to_minutes(event.get('end'))
+            if start is not None and end is not None:
+                event['minutes'] = end - start
+        self.dataChanged.emit(index, index)
+        return True
+
+    def insertRows(self, row, count, parent=QModelIndex()):
+        self.beginInsertRows(parent, row, row + count - 1)
+        self.events[row:row] = [{'name': '', 'start': '', 'end': ''} for _ in range(count)]
+        self.endInsertRows()
+        return True
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.events[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def remove_rows(self, rows):
+        """Remove several (unordered) rows with a single model reset"""
+        rows = set(rows)
+        self.beginResetModel()
+        self.events[:] = [event for row, event in enumerate(self.events) if row not in rows]
+        self.endResetModel()
+
+    def append_events(self, events):
+        """Append many events at once (paste/import) with a single model reset"""
+        self.beginResetModel()
+        self.events.extend(events)
+        self.endResetModel()
+
+
+class EventSortProxyModel(QAbstractProxyModel):
+    """Sorted view of an EventTableModel.
+
+    The row order is computed with list.sort over the event values, so
+    sorting 10k events costs milliseconds rather than one Python callback
+    per comparison as with QSortFilterProxyModel. Rows are only re-sorted
+    by sort() and on a model reset, never while a cell is being edited.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._order = []     # proxy row -> source row
+        self._position = []  # source row -> proxy row
+        self._sort_column = None
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def setSourceModel(self, model):
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.modelReset.connect(self._source_reset)
+        model.rowsInserted.connect(self._source_rows_inserted)
+        model.rowsRemoved.connect(self._source_rows_removed)
+        model.dataChanged.connect(self._source_data_changed)
+        self._set_order(list(range(model.rowCount())))
+        self.endResetModel()
+
+    def _set_order(self, order):
+        self._order = order
+        self._position = [0] * len(order)
+        for proxy_row, source_row in enumerate(order):
+            self._position[source_row] = proxy_row
+
+    def _sorted_order(self, rows):
+        if self._sort_column is None:
+            return rows
+        field = COLUMNS[self._sort_column][0]
+        events = self.sourceModel().events
+        return sorted(rows, key=lambda row: events[row].get(field, ''),
+                      reverse=self._sort_order == Qt.SortOrder.DescendingOrder)
+
+    def _source_reset(self):
+        self.beginResetModel()
+        self._set_order(self._sorted_order(list(range(self.sourceModel().rowCount()))))
+        self.endResetModel()
+
+    def _source_rows_inserted(self, parent, first, last):
+        # New rows are shown at the end until the next sort
+        count = last - first + 1
+        self.beginResetModel()
+        order = [row + count if row >= first else row for row in self._order]
+        self._set_order(order + list(range(first, last + 1)))
+        self.endResetModel()
+
+    def _source_rows_removed(self, parent, first, last):
+        count = last - first + 1
+        self.beginResetModel()
+        self._set_order([row - count if row > last else row
+                         for row in self._order if not first <= row <= last])
+        self.endResetModel()
+
+    def _source_data_changed(self, top_left, bottom_right, roles=()):
+        # One signal covering every moved row; views only repaint what is visible
+        positions = [self._position[row] for row in range(top_left.row(), bottom_right.row() + 1)]
+        self.dataChanged.emit(self.index(min(positions), top_left.column()),
+                              self.index(max(positions), bottom_right.column()), roles)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort_column, self._sort_order = column, order
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        source_rows = [self._order[index.row()] for index in persistent]
+        self._set_order(self._sorted_order(list(self._order)))
+        self.changePersistentIndexList(
+            persistent,
+            [self.index(self._position[row], index.column())
+             for row, index in zip(source_rows, persistent)])
+        self.layoutChanged.emit()
+
+    def source_order(self):
+        """Return the source rows in display order"""
+        return list(self._order)
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(self._order[proxy_index.row()], proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        return self.index(self._position[source_index.row()], source_index.column())
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self._order) or not 0 <= column < len(COLUMNS):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        if index is None:
+            return super().parent()  # QObject.parent()
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Vertical and role == Qt.ItemDataRole.DisplayRole:
+            return section + 1
+        return self.sourceModel().headerData(section, orientation, role)
@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QFormLayout, 
-                            QLineEdit, QPushButton, QLabel, QHBoxLayout)
+                            QLineEdit, QPushButton, QLabel, QHBoxLayout, QMessageBox)
 from constants import DEFAULT_MESSAGES
+from core.message_templates import validate_messages
 
 class MessageSettingsDialog(QDialog):
     def __init__(self, settings_manager, parent=None):
@@ -60,6 +61,12 @@ class MessageSettingsDialog(QDialog):
     def save_messages(self):
         messages = {key: input_field.text() 
                    for key, input_field in self.message_inputs.items()}
+        # Reject bad placeholders here rather than on the live display
+        try:
+            validate_messages(messages)
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Message", str(e))
+            return
         self.settings_manager.save_schedule_messages(messages)
         self.accept()
         
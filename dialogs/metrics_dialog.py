@@ -0,0 +1,46 @@
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QPushButton
+from PyQt6.QtGui import QFontDatabase
+from core.instrumentation import instrumentation
+
+class MetricsDialog(QDialog):
+    """Shows the instrumentation counters and latencies"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Metrics")
+        self.resize(520, 300)
+        self.setup_ui()
+        self.refresh()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        layout.addWidget(self.text)
+
+        button_layout = QHBoxLayout()
+        refresh_button = QPushButton("Refresh")
+        reset_button = QPushButton("Reset")
+        close_button = QPushButton("Close")
+
+        refresh_button.clicked.connect(self.refresh)
+        reset_button.clicked.connect(self.reset)
+        close_button.clicked.connect(self.accept)
+
+        button_layout.addWidget(refresh_button)
+        button_layout.addWidget(reset_button)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+    def refresh(self):
+        if instrumentation.enabled:
+            header = f"Recording since {instrumentation.started:%H:%M:%S}"
+        else:
+            header = "Instrumentation is off (Debug > Enable Instrumentation)"
+        self.text.setPlainText(header + "\n\n" + instrumentation.report())
+
+    def reset(self):
+        instrumentation.reset()
+        self.refresh()
@@ -1,15 +1,24 @@
 # Schedule editor dialog
-from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
-                            QTableWidget, QTableWidgetItem, QComboBox, QHeaderView, QMessageBox, QLineEdit, QLabel)
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableView,
+                            QComboBox, QHeaderView, QMessageBox, QLineEdit, QLabel,
+                            QApplication, QFileDialog)
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QKeySequence, QShortcut
 from datetime import datetime
+import copy
+from dialogs.event_table_model import (EventTableModel, EventSortProxyModel, parse_event_rows,
+                                       ISSUE_ROLES)
+from core.schedule_validator import validate_events, validate_schedules, has_errors, ERROR, WARNING
+
+VALIDATION_DELAY_MS = 300  # Re-check the schedule once typing pauses
 
 class ScheduleEditorDialog(QDialog):
     """Dialog for editing schedule events and times"""
     def __init__(self, schedules, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Schedule Editor")
-        self.schedules = schedules.copy()  # Work with a copy
+        self.schedules = copy.deepcopy(schedules)  # Work with a copy
+        self.current_key = None
         
         # Set minimum and initial size (75% of 800x600)
         self.setMinimumSize(600, 450)  # Width: 600px, Height: 450px
@@ -24,9 +33,14 @@ class ScheduleEditorDialog(QDialog):
         
         self.schedule_combo = QComboBox()
         # Use internal schedule keys for combo box
-        self.schedule_combo.addItems(['schedule_1', 'schedule_2', 'schedule_3'])
+        self.schedule_combo.addItems(list(self.schedules))
         self.schedule_combo.currentTextChanged.connect(self.schedule_selected)
         
+        add_schedule_btn = QPushButton("Add Schedule")
+        add_schedule_btn.clicked.connect(self.add_schedule)
+        remove_schedule_btn = QPushButton("Remove Schedule")
+        remove_schedule_btn.clicked.connect(self.remove_schedule)
+        
         self.name_edit = QLineEdit()
         self.name_edit.setPlaceholderText("Schedule Name")
         self.name_edit.textChanged.connect(self.schedule_name_changed)
@@ -35,35 +49,60 @@ class ScheduleEditorDialog(QDialog):
         selector_layout.addWidget(self.schedule_combo)
         selector_layout.addWidget(QLabel("Name:"))
         selector_layout.addWidget(self.name_edit)
+        selector_layout.addWidget(add_schedule_btn)
+        selector_layout.addWidget(remove_schedule_btn)
         
         layout.addLayout(selector_layout)
         
-        # Event table
-        self.event_table = QTableWidget()
-        self.event_table.setColumnCount(3)
-        self.event_table.setHorizontalHeaderLabels(["Event", "Start Time", "End Time"])
+        # Event table: the model edits the event list in place and the
+        # proxy handles sorting without touching the list
+        self.event_model = EventTableModel(parent=self)
+        self.proxy_model = EventSortProxyModel(self)
+        self.proxy_model.setSourceModel(self.event_model)
+        
+        self.event_table = QTableView()
+        self.event_table.setModel(self.proxy_model)
+        self.event_table.setSortingEnabled(True)
         header = self.event_table.horizontalHeader()
         header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         
-        # Connect cell change handler
-        self.event_table.cellChanged.connect(self.handle_cell_change)
+        # Paste rows copied from a spreadsheet
+        paste_shortcut = QShortcut(QKeySequence.StandardKey.Paste, self.event_table)
+        paste_shortcut.activated.connect(self.paste_events)
         
         layout.addWidget(self.event_table)
         
+        # Live validation of the shown schedule
+        self.issue_label = QLabel()
+        self.issue_label.setWordWrap(True)
+        layout.addWidget(self.issue_label)
+        
+        self.validation_timer = QTimer(self)
+        self.validation_timer.setSingleShot(True)
+        self.validation_timer.setInterval(VALIDATION_DELAY_MS)
+        self.validation_timer.timeout.connect(self.validate_current)
+        self.event_model.dataChanged.connect(self.events_changed)
+        self.event_model.rowsInserted.connect(self.validation_timer.start)
+        self.event_model.rowsRemoved.connect(self.validation_timer.start)
+        self.event_model.modelReset.connect(self.validation_timer.start)
+        
         # Add buttons
         button_layout = QHBoxLayout()
         add_btn = QPushButton("Add Event")
         remove_btn = QPushButton("Remove Event")
+        import_btn = QPushButton("Import...")
         ok_btn = QPushButton("OK")
         cancel_btn = QPushButton("Cancel")
         
         add_btn.clicked.connect(self.add_event)
         remove_btn.clicked.connect(self.delete_event)
+        import_btn.clicked.connect(self.import_events)
         ok_btn.clicked.connect(self.accept)
         cancel_btn.clicked.connect(self.reject)
         
         button_layout.addWidget(add_btn)
         button_layout.addWidget(remove_btn)
+        button_layout.addWidget(import_btn)
         button_layout.addStretch()
         button_layout.addWidget(ok_btn)
         button_layout.addWidget(cancel_btn)
@@ -75,72 +114,141 @@ class ScheduleEditorDialog(QDialog):
         
     def load_schedule(self):
         schedule_key = self.schedule_combo.currentText()
+        if schedule_key not in self.schedules:
+            return
         schedule = self.schedules[schedule_key]
         
         # Update name
         self.name_edit.setText(schedule.get('name', ''))
         
-        # Sort and load events
-        events = schedule.get('events', [])
-        sorted_events = self.sort_events(events)
-        
-        # Temporarily disconnect cell change handler
-        self.event_table.cellChanged.disconnect(self.handle_cell_change)
+        # Show the events sorted by start time
+        self.event_model.set_events(schedule.setdefault('events', []))
+        self.event_table.sortByColumn(1, Qt.SortOrder.AscendingOrder)
+        self.current_key = schedule_key
+        self.validate_current()
         
-        # Clear and populate table
-        self.event_table.setRowCount(len(sorted_events))
-        for row, event in enumerate(sorted_events):
-            self.event_table.setItem(row, 0, QTableWidgetItem(event.get('name', '')))
-            self.event_table.setItem(row, 1, QTableWidgetItem(event.get('start', '')))
-            self.event_table.setItem(row, 2, QTableWidgetItem(event.get('end', '')))
+    def events_changed(self, top_left, bottom_right, roles=()):
+        if list(roles) != ISSUE_ROLES:  # Ignore our own highlighting
+            self.validation_timer.start()
             
-        # Reconnect cell change handler
-        self.event_table.cellChanged.connect(self.handle_cell_change)
-        
-    def sort_events(self, events):
-        """Sort events by start time"""
-        return sorted(events, key=lambda x: x.get('start', '') or '00:00')
+    def validate_current(self):
+        """Check the shown schedule and highlight the events with problems"""
+        self.validation_timer.stop()
+        # Check the events in display order, which is the order they are saved in
+        order = self.proxy_model.source_order()
+        events = self.event_model.events
+        issues = validate_events([events[row] for row in order], self.current_key)
+        for issue in issues:
+            issue.events = [order[i] for i in issue.events]
+        self.event_model.set_issues(issues)
+        errors = [issue for issue in issues if issue.severity == ERROR]
+        warnings = [issue for issue in issues if issue.severity == WARNING]
+        if not errors and not warnings:
+            self.issue_label.setText("No problems found")
+            return
+        shown = (errors + warnings)[:3]
+        more = len(errors) + len(warnings) - len(shown)
+        lines = [f"{len(errors)} error(s), {len(warnings)} warning(s):"]
+        lines += [issue.message for issue in shown]
+        if more:
+            lines.append(f"... and {more} more (hover a highlighted row for details)")
+        self.issue_label.setText("\n".join(lines))
+        
+    def commit_view_order(self):
+        """Store the shown schedule's events in the order they are displayed"""
+        events = self.event_model.events
+        events[:] = [events[row] for row in self.proxy_model.source_order()]
+        # The rows moved under the view; reset so it maps them afresh
+        self.event_model.set_events(events)
         
     def schedule_selected(self):
+        if self.current_key in self.schedules:
+            self.commit_view_order()
         self.load_schedule()
         
     def schedule_name_changed(self, name):
         schedule_key = self.schedule_combo.currentText()
-        self.schedules[schedule_key]['name'] = name
+        if schedule_key in self.schedules:
+            self.schedules[schedule_key]['name'] = name
+        
+    def add_schedule(self):
+        """Add a new, empty schedule and select it"""
+        n = len(self.schedules) + 1
+        while f"schedule_{n}" in self.schedules:
+            n += 1
+        schedule_key = f"schedule_{n}"
+        self.schedules[schedule_key] = {'name': f"Schedule {n}", 'events': []}
+        self.schedule_combo.addItem(schedule_key)
+        self.schedule_combo.setCurrentText(schedule_key)
+        
+    def remove_schedule(self):
+        """Remove the selected schedule after confirmation"""
+        schedule_key = self.schedule_combo.currentText()
+        if len(self.schedules) <= 1:
+            QMessageBox.warning(self, "Error", "At least one schedule is required")
+            return
+        reply = QMessageBox.question(
+            self, "Remove Schedule",
+            f"Remove '{self.schedules[schedule_key].get('name', schedule_key)}'?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            del self.schedules[schedule_key]
+            self.schedule_combo.removeItem(self.schedule_combo.currentIndex())
         
     def add_event(self):
         """Add new event to schedule"""
-        row = self.event_table.rowCount()
-        self.event_table.insertRow(row)
-        for col in range(3):
-            self.event_table.setItem(row, col, QTableWidgetItem(''))
+        row = self.event_model.rowCount()
+        self.event_model.insertRows(row, 1)
+        self.event_table.scrollToBottom()
             
     def delete_event(self):
-        """Delete selected event"""
-        current_row = self.event_table.currentRow()
-        if current_row >= 0:
-            self.event_table.removeRow(current_row)
+        """Delete the selected events"""
+        rows = {self.proxy_model.mapToSource(index).row()
+                for index in self.event_table.selectionModel().selectedIndexes()}
+        if len(rows) == 1:
+            self.event_model.removeRows(rows.pop(), 1)
+        elif rows:
+            self.event_model.remove_rows(rows)
             
-    def handle_cell_change(self, row, column):
-        self.update_schedule_data()
-        
-    def update_schedule_data(self):
-        schedule_key = self.schedule_combo.currentText()
-        events = []
-        
-        for row in range(self.event_table.rowCount()):
-            name = self.event_table.item(row, 0)
-            start = self.event_table.item(row, 1)
-            end = self.event_table.item(row, 2)
+    def paste_events(self):
+        """Append events pasted as rows of name, start and end"""
+        events = parse_event_rows(QApplication.clipboard().text())
+        if events:
+            self.event_model.append_events(events)
             
-            if name and start and end:
-                events.append({
-                    'name': name.text().strip(),
-                    'start': start.text().strip(),
-                    'end': end.text().strip()
-                })
-                
-        self.schedules[schedule_key]['events'] = events
+    def import_events(self):
+        """Append events from a CSV or tab-separated text file"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Events", "", "Event Files (*.csv *.tsv *.txt);;All Files (*.*)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, 'r', encoding='utf-8', newline='') as f:
+                events = parse_event_rows(f.read())
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"Failed to import events: {str(e)}")
+            return
+        self.event_model.append_events(events)
+        
+    def accept(self):
+        """Warn before saving schedules that have overlapping or malformed events"""
+        if self.current_key in self.schedules:
+            self.commit_view_order()
+        issues = validate_schedules(self.schedules)
+        if has_errors(issues):
+            errors = [issue for issue in issues if issue.severity == ERROR]
+            reply = QMessageBox.question(
+                self, "Schedule Problems",
+                f"The schedules have {len(errors)} error(s), for example:\n\n"
+                f"{errors[0]}\n\nSave anyway?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No)
+            if reply != QMessageBox.StandardButton.Yes:
+                self.validate_current()  # The reset cleared the highlighting
+                return
+        super().accept()
         
     def get_updated_schedules(self):
+        """Return the edited schedules; accept() has stored the shown order"""
         return self.schedules 
\ No newline at end of file
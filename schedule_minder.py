@@ -1,22 +1,106 @@
 # Main entry point and app initialization
-from PyQt6.QtWidgets import QApplication, QMainWindow, QMessageBox
+import time
+STARTUP_TIME = time.perf_counter()  # Start of the --startup-profile report
+
+import argparse
 import sys
 import os
 import json
-from constants import SCHEDULES_FILE
+from constants import SCHEDULES_FILE, STATUS_PORT, STATUS_HTTP_PORT
 
 # Add the current directory to Python path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 if current_dir not in sys.path:
     sys.path.append(current_dir)
 
-from windows.schedule_window import ScheduleWindow  # Import the window class
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule Minder")
+    parser.add_argument('--verify', metavar='TIMES_FILE',
+                        help="evaluate a test time file headlessly and print the results")
+    parser.add_argument('--expected', metavar='OUTPUT_FILE',
+                        help="with --verify, compare against this file and exit 1 on mismatch")
+    parser.add_argument('--check', action='store_true',
+                        help="check the schedules for overlaps, gaps and malformed times and exit")
+    parser.add_argument('--organization', metavar='NAME',
+                        help="with --verify, --check or --serve, the organization to use "
+                             "(default: the saved selection in the window, the default organization "
+                             "for --verify and --serve, all for --check)")
+    parser.add_argument('--schedules', metavar='PATH', default=SCHEDULES_FILE,
+                        help="schedule file to use: JSON, or an SQLite database (.db, .sqlite)")
+    parser.add_argument('--import-json', metavar='JSON_FILE',
+                        help="copy every organization from a JSON file into --schedules and exit")
+    parser.add_argument('--export-json', metavar='JSON_FILE',
+                        help="write every organization in --schedules to a JSON file and exit")
+    parser.add_argument('--serve', action='store_true',
+                        help="run headless and push schedule status to displays connected with --connect")
+    parser.add_argument('--host', default='127.0.0.1',
+                        help="with --serve, the address to listen on (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=STATUS_PORT,
+                        help="with --serve, the status port for displays (default: %(default)s)")
+    parser.add_argument('--http-port', type=int, default=STATUS_HTTP_PORT,
+                        help="with --serve, the port for GET /status and /events (default: %(default)s)")
+    parser.add_argument('--socket', metavar='PATH',
+                        help="with --serve, also listen on this Unix socket")
+    parser.add_argument('--connect', metavar='ADDRESS',
+                        help="show the status pushed by a --serve instance (host:port or unix:PATH)")
+    parser.add_argument('--instrument', action='store_true',
+                        help="start with hot-path instrumentation on (see the Debug menu)")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="print how long each startup phase took")
+    # Unknown arguments are passed through to Qt (e.g. -platform)
+    return parser.parse_known_args(argv)
 
 def main():
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args()
+    
+    if args.import_json or args.export_json:
+        import sqlite3
+        from core.schedule_storage import open_store, import_json, export_json
+        try:
+            store = open_store(args.schedules)
+            if args.import_json:
+                organizations = import_json(store, args.import_json)
+            else:
+                organizations = export_json(store, args.export_json)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Copied {len(organizations)} organization(s)")
+        sys.exit(0)
+    
+    if args.check:
+        from core.schedule_validator import run_check
+        sys.exit(run_check(args.schedules, organization=args.organization))
+    
+    if args.serve:
+        # Headless mode: never create a QApplication
+        from utils.status_server import run_server
+        sys.exit(run_server(args.schedules, args.organization, args.host, args.port,
+                            args.http_port, args.socket))
+    
+    if args.verify:
+        # Headless mode: never create a QApplication
+        from utils.verifier import run_verification
+        sys.exit(run_verification(args.verify, args.expected, args.schedules,
+                                  organization=args.organization))
+    
+    from utils.startup_profiler import startup_profiler
+    if args.startup_profile:
+        startup_profiler.enable(STARTUP_TIME)
+    
+    if args.instrument:
+        from core.instrumentation import instrumentation
+        instrumentation.enable()
+    
+    from PyQt6.QtWidgets import QApplication
+    from windows.schedule_window import ScheduleWindow  # Import the window class
+    startup_profiler.mark("import")
+    
+    app = QApplication(sys.argv[:1] + qt_args)
+    startup_profiler.mark("qt init")
     
     # Create and show the main window
-    window = ScheduleWindow(SCHEDULES_FILE)
+    window = ScheduleWindow(args.schedules, status_address=args.connect)
     window.show()
     
     # Enable normal window closing behavior
@@ -25,4 +109,4 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,22 @@
+import os
+import shutil
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+from constants import SCHEDULES_FILE
+
+
+@pytest.fixture(scope="session")
+def app():
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def schedule_file(tmp_path):
+    """A copy of the shipped schedules, so snapshots are written to tmp_path"""
+    path = tmp_path / 'schedules.json'
+    shutil.copy(SCHEDULES_FILE, path)
+    return str(path)
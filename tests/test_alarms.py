@@ -0,0 +1,135 @@
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from core.alarms import (Alarm, AlarmDispatcher, CommandSink, WebhookSink, build_alarms,
+                         parse_offsets)
+from core.clock import SimulatedClock
+from core.schedule_manager import ScheduleManager
+
+SCHEDULES = {'school': {
+    'schedule_1': {'name': 'Regular', 'events': [
+        {'name': 'P1', 'start': '08:00', 'end': '08:45'},
+        {'name': 'P2', 'start': '08:50', 'end': '09:30'}]},
+    'schedule_2': {'name': 'Delay', 'events': [
+        {'name': 'P1', 'start': '10:00', 'end': '10:30'}]},
+}}
+
+
+@pytest.fixture
+def manager(tmp_path):
+    schedule_file = tmp_path / 'schedules.json'
+    schedule_file.write_text(json.dumps(SCHEDULES), encoding='utf-8')
+    return ScheduleManager(str(schedule_file), organization='school',
+                           calendar_file=str(tmp_path / 'calendar.json'))
+
+
+class RecordingSink:
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.received = []
+
+    def deliver(self, alarm):
+        self.received.append((alarm, time.monotonic()))
+        time.sleep(self.delay)
+
+
+def test_build_alarms_applies_offsets(manager):
+    offsets = {'schedule_1': {'start': [5, 0], 'end': [2]}}
+    alarms = sorted(build_alarms(manager, date(2024, 9, 3), offsets))
+    assert [(alarm.when.strftime('%H:%M'), alarm.message) for alarm in alarms] == [
+        ('07:55', 'P1 starts in 5 minutes'), ('08:00', 'P1 starts now'),
+        ('08:43', 'P1 ends in 2 minutes'), ('08:45', 'P2 starts in 5 minutes'),
+        ('08:50', 'P2 starts now'), ('09:28', 'P2 ends in 2 minutes')]
+    assert alarms[0].label == 'Regular'
+
+
+def test_heap_holds_only_upcoming_alarms(manager):
+    clock = SimulatedClock(datetime(2024, 9, 3, 8, 30))
+    dispatcher = AlarmDispatcher(manager, offsets={'schedule_1': {'start': [0]},
+                                                   'schedule_2': {'end': [1]}}, clock=clock)
+    dispatcher.reschedule()
+    assert [alarm.when.strftime('%H:%M') for alarm in dispatcher.pending()] == ['08:50', '10:29']
+
+
+def test_slow_sinks_do_not_delay_alarms(manager):
+    # An hour a minute: the 07:59, 08:00 and 08:01 alarms ring a second apart
+    start = datetime(2024, 9, 3, 7, 58, 59)
+    clock = SimulatedClock(start, rate=60)
+    slow, fast = RecordingSink(delay=3), RecordingSink()
+    dispatcher = AlarmDispatcher(manager, [slow, fast], {'schedule_1': {'start': [1, 0]}}, clock)
+    started = time.monotonic()
+    dispatcher.start()
+    try:
+        deadline = time.monotonic() + 5
+        while len(fast.received) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        dispatcher.stop()
+    assert [alarm.message for alarm, _ in fast.received] == ['P1 starts in 1 minute',
+                                                             'P1 starts now']
+    for alarm, received in fast.received:
+        target = started + (alarm.when - start).total_seconds() / 60
+        assert abs(received - target) < 0.1
+
+
+def test_simulated_clock_skips_external_sinks(manager):
+    class ExternalSink(RecordingSink):
+        external = True
+
+    local, external = RecordingSink(), ExternalSink()
+    dispatcher = AlarmDispatcher(manager, [local, external],
+                                 clock=SimulatedClock(datetime(2024, 9, 3, 8, 50)))
+    dispatcher._executor = ThreadPoolExecutor(1)
+    alarm = Alarm(datetime(2024, 9, 3, 8, 50), 'schedule_1', 'Regular', 'P2', 'start', 0)
+    try:
+        dispatcher._ring(alarm, datetime(2024, 9, 3, 8, 50))
+    finally:
+        dispatcher._executor.shutdown(wait=True)
+    assert [alarm.message for alarm, _ in local.received] == ['P2 starts now']
+    assert external.received == []
+    assert CommandSink('true').external and WebhookSink('http://localhost/').external
+
+
+def test_webhook_and_command_sinks(tmp_path):
+    posted = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            posted.append(json.loads(self.rfile.read(int(self.headers['Content-Length']))))
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.handle_request, daemon=True)
+    thread.start()
+    alarm = Alarm(datetime(2024, 9, 3, 7, 58), 'schedule_1', 'Regular', 'P1', 'start', 2)
+    try:
+        WebhookSink(f'http://127.0.0.1:{server.server_address[1]}/alarm').deliver(alarm)
+    finally:
+        thread.join(5)
+        server.server_close()
+    assert posted == [alarm.to_dict()]
+
+    output = tmp_path / 'alarm.txt'
+    script = 'import sys; open(sys.argv[1], "w").write(sys.argv[2])'
+    CommandSink(f'"{sys.executable}" -c \'{script}\' "{output}" "{{label}}: {{message}}"').deliver(alarm)
+    assert output.read_text() == 'Regular: P1 starts in 2 minutes'
+
+
+def test_parse_offsets():
+    assert parse_offsets('0, 5 1,5') == [5, 1, 0]
+    assert parse_offsets('') == []
+    with pytest.raises(ValueError):
+        parse_offsets('two')
+    with pytest.raises(ValueError):
+        parse_offsets('-1')
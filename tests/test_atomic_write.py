@@ -0,0 +1,31 @@
+import os
+import stat
+
+import pytest
+
+from core.atomic_write import atomic_write
+
+pytestmark = pytest.mark.skipif(os.name != 'posix', reason="POSIX permissions")
+
+
+def mode_of(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_new_file_gets_the_umask_default_mode(tmp_path):
+    path = tmp_path / 'schedules.json'
+    atomic_write(str(path), b'{}')
+    plain = tmp_path / 'plain.json'
+    plain.write_bytes(b'{}')
+    assert path.read_bytes() == b'{}'
+    assert mode_of(path) == mode_of(plain)
+
+
+def test_replacing_a_file_keeps_its_mode(tmp_path):
+    path = tmp_path / 'schedules.json'
+    path.write_bytes(b'old')
+    os.chmod(path, 0o640)
+    atomic_write(str(path), b'new')
+    assert path.read_bytes() == b'new'
+    assert mode_of(path) == 0o640
+    assert os.listdir(tmp_path) == ['schedules.json']
@@ -0,0 +1,61 @@
+from datetime import datetime
+
+from core.clock import SimulatedClock
+from core.schedule_manager import ScheduleManager
+from utils.update_scheduler import UpdateScheduler
+
+
+def test_simulated_clock_rates(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('core.clock.time.monotonic', lambda: now[0])
+    clock = SimulatedClock(datetime(2024, 9, 3, 8, 0))
+    now[0] += 5
+    assert clock.now() == datetime(2024, 9, 3, 8, 0)  # Paused
+    assert clock.real_seconds(60) is None
+
+    clock.set_rate(60)
+    now[0] += 2
+    assert clock.now() == datetime(2024, 9, 3, 8, 2)
+    assert clock.real_seconds(60) == 1
+
+    clock.set_rate(0)
+    now[0] += 10
+    assert clock.now() == datetime(2024, 9, 3, 8, 2)
+
+
+def test_stepping_clock_only_moves_forward():
+    clock = SimulatedClock(datetime(2024, 9, 3, 8, 0))
+    clock.step(0.5)
+    assert clock.stepping and clock.real_seconds(3600) == 0.5
+    clock.advance_to(datetime(2024, 9, 3, 9, 0))
+    clock.advance_to(datetime(2024, 9, 3, 8, 30))
+    assert clock.now() == datetime(2024, 9, 3, 9, 0)
+
+
+def test_scheduler_steps_through_boundaries(app, schedule_file):
+    clock = SimulatedClock(datetime(2024, 9, 3, 0, 0))
+    manager = ScheduleManager(schedule_file, organization='southampton_high_school',
+                              clock=clock)
+    scheduler = UpdateScheduler(manager, clock=clock)
+    clock.step(0.1)
+    scheduler.arm()
+    assert scheduler.timer.interval() == 100
+
+    seen = []
+    scheduler.boundary_reached.connect(lambda: seen.append(clock.now()))
+    for _ in range(3):
+        deadline = scheduler.deadline
+        scheduler._on_timeout()
+        assert clock.now() == deadline
+        scheduler.arm()
+    assert seen == sorted(seen) and len(seen) == 3
+    assert manager.get_current_event('schedule_1') == manager.get_current_event(
+        'schedule_1', clock.now().strftime("%H:%M"))
+
+
+def test_paused_clock_stops_the_timer(app, schedule_file):
+    clock = SimulatedClock(datetime(2024, 9, 3, 8, 0))
+    manager = ScheduleManager(schedule_file, organization='southampton_high_school')
+    scheduler = UpdateScheduler(manager, clock=clock)
+    scheduler.arm()
+    assert not scheduler.timer.isActive()
@@ -0,0 +1,41 @@
+import shutil
+import subprocess
+import sys
+
+from constants import SCHEDULES_FILE
+from core.schedule_manager import ScheduleManager
+from core.settings import MemorySettings
+
+
+def test_engine_imports_without_qt():
+    code = (
+        "import sys\n"
+        "import core.schedule_manager, core.schedule_validator, core.instrumentation, core.alarms\n"
+        "import utils.status_server, utils.verifier\n"
+        "print(sorted(name for name in sys.modules if name.startswith('PyQt6')))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
+def test_headless_verification_runs_without_qt(tmp_path):
+    schedule_file = tmp_path / 'schedules.json'
+    shutil.copy(SCHEDULES_FILE, schedule_file)
+    times_file = tmp_path / 'times.txt'
+    times_file.write_text("07:30\n")
+    code = (
+        "import io, sys\n"
+        "from utils.verifier import run_verification\n"
+        f"assert run_verification({str(times_file)!r}, schedule_file={str(schedule_file)!r},\n"
+        "                        output=io.StringIO()) == 0\n"
+        "print(sorted(name for name in sys.modules if name.startswith('PyQt6')))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
+def test_manager_reads_injected_settings(schedule_file):
+    settings = MemorySettings('southampton_high_school', {'before_schedule': 'Soon'})
+    manager = ScheduleManager(schedule_file, settings=settings)
+    assert manager.schedules
+    assert manager.messages['before_schedule'] == 'Soon'
@@ -0,0 +1,22 @@
+from datetime import datetime, timedelta
+
+from utils.countdown_label import CountdownLabel, format_remaining
+
+
+def test_format_remaining():
+    assert format_remaining(754) == "12:34 remaining"
+    assert format_remaining(753.2) == "12:34 remaining"
+    assert format_remaining(3725) == "1:02:05 remaining"
+    assert format_remaining(-3) == "0:00 remaining"
+
+
+def test_tick_repaints_only_when_the_text_changes(app, monkeypatch):
+    countdown = CountdownLabel()
+    updates = []
+    monkeypatch.setattr(countdown, 'update', lambda: updates.append(countdown.text))
+    now = datetime(2024, 9, 3, 8, 0, 0)
+    countdown.set_deadline(now + timedelta(minutes=5), now)
+    countdown.tick(now + timedelta(milliseconds=300))
+    countdown.tick(now + timedelta(seconds=1))
+    countdown.set_deadline(None, now)
+    assert updates == ["5:00 remaining", "4:59 remaining", ""]
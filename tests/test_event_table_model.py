@@ -0,0 +1,55 @@
+from PyQt6.QtCore import Qt
+from dialogs.event_table_model import EventTableModel, EventSortProxyModel, parse_event_rows
+
+
+def make_models(events):
+    model = EventTableModel(events)
+    proxy = EventSortProxyModel()
+    proxy.setSourceModel(model)
+    return model, proxy
+
+
+def test_parse_event_rows_skips_header_and_blanks():
+    text = "Name\tStart\tEnd\nPeriod 1\t07:30\t08:15\n\nLunch\t11:00\n"
+    assert parse_event_rows(text) == [
+        {'name': 'Period 1', 'start': '07:30', 'end': '08:15'},
+        {'name': 'Lunch', 'start': '11:00', 'end': ''},
+    ]
+
+
+def test_edit_writes_through_and_updates_minutes(app):
+    events = [{'name': 'Period 1', 'start': '07:30', 'end': '08:15', 'minutes': 45}]
+    model, proxy = make_models(events)
+    proxy.setData(proxy.index(0, 2), ' 08:20 ')
+    assert events[0] == {'name': 'Period 1', 'start': '07:30', 'end': '08:20', 'minutes': 50}
+
+
+def test_sort_does_not_reorder_source_list(app):
+    events = [{'name': n, 'start': s, 'end': s} for n, s in
+              [('C', '09:00'), ('A', '07:00'), ('B', '08:00')]]
+    model, proxy = make_models(events)
+    proxy.sort(1, Qt.SortOrder.AscendingOrder)
+    assert [proxy.index(row, 0).data() for row in range(3)] == ['A', 'B', 'C']
+    assert [event['name'] for event in events] == ['C', 'A', 'B']
+
+    # A new row shows at the end until the next sort; bulk appends re-sort
+    model.insertRows(3, 1)
+    assert [proxy.index(row, 0).data() for row in range(4)] == ['A', 'B', 'C', '']
+    model.append_events([{'name': 'D', 'start': '06:00', 'end': '06:30'}])
+    assert [proxy.index(row, 0).data() for row in range(5)] == ['', 'D', 'A', 'B', 'C']
+    model.removeRows(1, 1)
+    assert proxy.source_order() == [2, 3, 1, 0]
+
+
+def test_editor_saves_the_shown_order_once(app):
+    from dialogs.schedule_editor import ScheduleEditorDialog
+    schedules = {'schedule_1': {'name': 'Regular', 'events': [
+        {'name': 'P2', 'start': '09:00', 'end': '09:45'},
+        {'name': 'P1', 'start': '08:00', 'end': '08:45'}]}}
+    editor = ScheduleEditorDialog(schedules)
+    editor.event_model.append_events([{'name': 'Early', 'start': '07:00', 'end': '07:30'},
+                                      {'name': 'Late', 'start': '10:00', 'end': '10:30'}])
+    editor.accept()
+    assert editor.result() == editor.DialogCode.Accepted
+    events = editor.get_updated_schedules()['schedule_1']['events']
+    assert [event['name'] for event in events] == ['Early', 'P1', 'P2', 'Late']
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from core.instrumentation import Histogram, hot_path, instrumentation
+from core.schedule_manager import ScheduleManager
+
+
+class Clock:
+    @hot_path('test.tick')
+    def tick(self, value):
+        return value + 1
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.enable()
+    instrumentation.reset()
+    yield instrumentation
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_methods_are_left_alone():
+    assert not instrumentation.enabled
+    assert Clock.tick.__qualname__ == 'Clock.tick'
+    assert Clock.__dict__['tick'] is Clock.tick  # No wrapper in the way
+    original = Clock.tick
+    instrumentation.enable()
+    try:
+        assert Clock.tick is not original
+    finally:
+        instrumentation.disable()
+    assert Clock.tick is original
+
+
+def test_enabled_methods_are_counted(enabled):
+    clock = Clock()
+    assert [clock.tick(i) for i in range(5)] == [1, 2, 3, 4, 5]
+    metric = enabled.snapshot()['metrics']['test.tick']
+    assert metric['count'] == 5
+    assert sum(metric['histogram'].values()) == 5
+
+
+def test_manager_hot_paths(enabled, schedule_file):
+    manager = ScheduleManager(schedule_file, organization='southampton_high_school')
+    for minute in range(0, 24 * 60, 10):
+        manager.get_current_event('schedule_1', f"{minute // 60:02d}:{minute % 60:02d}")
+    metrics = enabled.snapshot()['metrics']
+    assert metrics['schedule.load_schedules']['count'] == 1
+    assert metrics['schedule.get_current_event']['count'] == 144
+
+
+def test_counters_are_reported_and_reset(enabled):
+    from utils.render_cache import RenderCache
+    cache = RenderCache()
+    enabled.add_counters('render', cache.stats, cache.reset_stats)
+    cache.apply('title', 'A', lambda value: None)
+    cache.apply('title', 'A', lambda value: None)
+    assert enabled.snapshot()['counters'] == {'render.applied': 1, 'render.skipped': 1}
+    assert 'render.skipped' in enabled.report()
+    enabled.reset()
+    assert enabled.snapshot()['counters'] == {'render.applied': 0, 'render.skipped': 0}
+    enabled._counters.pop('render')
+
+
+def test_record_is_ignored_while_disabled():
+    before = instrumentation.histogram('timer.drift').count
+    instrumentation.record('timer.drift', 0.002)
+    assert instrumentation.histogram('timer.drift').count == before
+
+
+def test_histogram_buckets():
+    histogram = Histogram()
+    for seconds in (0.000001, 0.0003, 0.0003, 0.02, 5):
+        histogram.add(seconds)
+    summary = histogram.to_dict()
+    assert summary['count'] == 5
+    assert summary['max_ms'] == 5000
+    assert summary['histogram'] == {'<=0.01ms': 1, '<=0.5ms': 2, '<=50ms': 1, '>1000ms': 1}
+
+
+def test_dump_and_capture(enabled, tmp_path):
+    Clock().tick(1)
+    assert enabled.dump(str(tmp_path / 'metrics.json'))
+    data = json.loads((tmp_path / 'metrics.json').read_text())
+    assert data['enabled'] and data['metrics']['test.tick']['count'] == 1
+
+    enabled.start_capture()
+    sum(Clock().tick(i) for i in range(100))
+    profile_path, memory_path = enabled.stop_capture(str(tmp_path / 'profiles'))
+    assert not enabled.capturing
+    assert (tmp_path / 'profiles').is_dir()
+    assert profile_path.endswith('.prof') and memory_path.endswith('.txt')
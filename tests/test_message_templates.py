@@ -0,0 +1,35 @@
+import pytest
+
+from constants import DEFAULT_MESSAGES
+from core.message_templates import MessageTemplates, validate_messages
+
+
+def test_templates_render_and_cache():
+    templates = MessageTemplates(dict(DEFAULT_MESSAGES, during_event="Now: {event_name!s:>4}"))
+    first = templates.during_event("P1")
+    assert first == "Now:   P1"
+    assert templates.during_event("P1") is first
+    assert templates.between_events("P1", "P2") == "P1 → P2"
+    assert templates['before_schedule'] == "Before Schedule"
+
+
+@pytest.mark.parametrize('key, template', [
+    ('during_event', "{event}"),
+    ('during_event', "{prev_event}"),
+    ('between_events', "{prev_event} {"),
+    ('between_events', "{next_event.upper}"),
+    ('during_event', "{event_name:%%}"),
+])
+def test_invalid_templates_are_rejected(key, template):
+    with pytest.raises(ValueError):
+        validate_messages(dict(DEFAULT_MESSAGES, **{key: template}))
+
+
+def test_invalid_stored_template_falls_back_to_default():
+    templates = MessageTemplates(dict(DEFAULT_MESSAGES, during_event="{oops}"), strict=False)
+    assert templates.during_event("Period 1") == "Period 1"
+
+
+def test_plain_messages_are_literal():
+    templates = MessageTemplates(dict(DEFAULT_MESSAGES, after_schedule="{See you}"))
+    assert templates['after_schedule'] == "{See you}"
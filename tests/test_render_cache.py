@@ -0,0 +1,20 @@
+from utils.render_cache import RenderCache
+
+
+def test_only_changed_values_are_applied():
+    cache = RenderCache()
+    rendered = []
+    assert cache.apply('label', 'Period 1', rendered.append)
+    assert not cache.apply('label', 'Period 1', rendered.append)
+    assert cache.apply('label', 'Period 2', rendered.append)
+    assert rendered == ['Period 1', 'Period 2']
+    assert cache.stats() == {'applied': 2, 'skipped': 1}
+
+
+def test_invalidate_forces_next_apply():
+    cache = RenderCache()
+    rendered = []
+    cache.apply('title', 'Schedule Minder', rendered.append)
+    cache.invalidate('title')
+    assert cache.apply('title', 'Schedule Minder', rendered.append)
+    assert len(rendered) == 2
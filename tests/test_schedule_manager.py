@@ -1,7 +1,231 @@
-def test_get_current_event():
-    manager = ScheduleManager()
+import random
+
+import pytest
+from datetime import datetime
+
+from constants import REGULAR_SCHEDULE
+from core.schedule_manager import ScheduleManager, SCHEDULE_TYPE_KEYS, load_numpy
+from core.schedule_records import Schedule
+
+
+def test_get_current_event(schedule_file):
+    manager = ScheduleManager(schedule_file)
     event = manager.get_current_event(
         "Regular Schedule",
-        datetime.strptime("08:30", "%H:%M")
+        datetime.strptime("07:30", "%H:%M")
     )
-    assert event == "Period 1" 
\ No newline at end of file
+    assert event == "Period 1"
+
+
+def _random_events(rng, count):
+    events = []
+    for i in range(count):
+        start = rng.randrange(0, 1440)
+        end = rng.randrange(0, 1440) if rng.random() < 0.2 else min(1439, start + rng.randrange(0, 90))
+        event = {'name': f"Event {i}",
+                 'start': f"{start // 60:02d}:{start % 60:02d}",
+                 'end': f"{end // 60:02d}:{end % 60:02d}"}
+        if rng.random() < 0.1:
+            event[rng.choice(['start', 'end'])] = ''
+        events.append(event)
+    if rng.random() < 0.5:
+        events.sort(key=lambda e: e['start'])
+    return events
+
+
+def _set_events(manager, events):
+    manager.schedules['schedule_1'] = Schedule.from_dict({'name': REGULAR_SCHEDULE, 'events': events})
+
+
+def test_index_matches_linear_scan_every_minute(schedule_file):
+    manager = ScheduleManager(schedule_file)
+    rng = random.Random(1234)
+    for trial in range(40):
+        events = _random_events(rng, rng.randrange(1, 25))
+        _set_events(manager, events)
+        for minute in range(1440):
+            time_str = f"{minute // 60:02d}:{minute % 60:02d}"
+            assert (manager.get_current_event(REGULAR_SCHEDULE, time_str)
+                    == manager._scan_events(events, time_str)), (trial, time_str)
+
+
+def test_malformed_times_fall_back_to_scan(schedule_file):
+    manager = ScheduleManager(schedule_file)
+    events = [{'name': 'Odd', 'start': '7:30', 'end': '08:00'}]
+    _set_events(manager, events)
+    assert manager.get_index('schedule_1') is None
+    assert (manager.get_current_event(REGULAR_SCHEDULE, "07:45")
+            == manager._scan_events(events, "07:45"))
+
+
+def test_next_boundary_across_schedules(schedule_file):
+    manager = ScheduleManager(schedule_file)
+    manager.schedules = {
+        'schedule_1': {'name': 'A', 'events': [{'name': 'P1', 'start': '08:00', 'end': '08:45'}]},
+        'schedule_2': {'name': 'B', 'events': [{'name': 'P1', 'start': '08:30', 'end': '09:00'}]},
+        'schedule_3': {'name': 'C', 'events': []},
+    }
+    assert manager.next_boundary(7 * 60) == 8 * 60
+    assert manager.next_boundary(8 * 60) == 8 * 60 + 1
+    assert manager.next_boundary(8 * 60 + 10) == 8 * 60 + 30
+    assert manager.next_boundary(8 * 60 + 45) == 8 * 60 + 46
+    assert manager.next_boundary(9 * 60 + 1) is None
+
+
+def test_next_bell_is_the_next_start_or_end(schedule_file):
+    manager = ScheduleManager(schedule_file)
+    manager.schedules = {
+        'schedule_1': {'name': 'A', 'events': [{'name': 'P1', 'start': '08:00', 'end': '08:45'}]},
+        'schedule_2': {'name': 'B', 'events': []},
+    }
+    assert manager.next_bell('schedule_1', 7 * 60) == 8 * 60
+    assert manager.next_bell('schedule_1', 8 * 60) == 8 * 60 + 45
+    assert manager.next_bell('schedule_1', 8 * 60 + 45) is None
+    assert manager.next_bell('schedule_2', 7 * 60) is None
+
+
+def test_day_table_matches_index_lookup(schedule_file):
+    manager = ScheduleManager(schedule_file)
+    rng = random.Random(99)
+    _set_events(manager, _random_events(rng, 30))
+    table = manager.get_day_table('schedule_1')
+    assert len(table.codes) == 1440
+    for minute in range(1440):
+        assert table.status(minute) == manager._status_at('schedule_1', minute)
+
+
+def test_day_tables_are_built_on_first_lookup(tmp_path):
+    import json
+    path = tmp_path / 'schedules.json'
+    path.write_text(json.dumps({'school': {f"schedule_{n}": {'name': f"S{n}", 'events': [
+        {'name': 'P1', 'start': '08:00', 'end': '09:00'}]} for n in range(1, 4)}}))
+    manager = ScheduleManager(str(path), organization='school')
+    assert manager._day_tables == {}
+    assert manager.get_current_event('schedule_2', "08:30") == "P1"
+    assert list(manager._day_tables) == ['schedule_2']
+    manager.adopt(manager.prepare_reload())
+    assert manager._day_tables == {}
+
+
+def test_day_table_invalidated_by_messages_and_save(schedule_file):
+    manager = ScheduleManager(schedule_file)
+    manager.schedules = {'schedule_1': {'name': REGULAR_SCHEDULE, 'events': [
+        {'name': 'P1', 'start': '08:00', 'end': '08:45'}]}}
+    assert manager.get_current_event(REGULAR_SCHEDULE, "07:00") == manager.messages['before_schedule']
+    manager.messages = dict(manager.messages, before_schedule="Too Early")
+    assert manager.get_current_event(REGULAR_SCHEDULE, "07:00") == "Too Early"
+    manager.schedules = {'schedule_1': {'name': REGULAR_SCHEDULE, 'events': [
+        {'name': 'Early', 'start': '06:00', 'end': '07:30'}]}}
+    assert manager.get_current_event(REGULAR_SCHEDULE, "07:00") == "Early"
+
+
+def test_evaluate_many_matches_get_current_event(schedule_file):
+    from utils.test_file_helper import TestFileHelper
+    manager = ScheduleManager(schedule_file)
+    times = TestFileHelper.read_test_times(TestFileHelper.get_test_file_path('master_time_test.txt'))
+    names = list(SCHEDULE_TYPE_KEYS)
+    rows = manager.evaluate_many(names, times + ["25:00"])
+    for time_str, row in zip(times, rows):
+        assert row == [manager.get_current_event(name, time_str) for name in names]
+    assert rows[-1] == ["Invalid Time Format"] * len(names)
+
+
+def test_evaluate_many_accepts_minute_arrays(schedule_file):
+    manager = ScheduleManager(schedule_file)
+    minutes = list(range(1440))
+    expected = [[manager.get_current_event(REGULAR_SCHEDULE, f"{m // 60:02d}:{m % 60:02d}")]
+                for m in minutes]
+    assert manager.evaluate_many(['schedule_1'], minutes) == expected
+    np = load_numpy()
+    if np is not None:
+        assert manager.evaluate_many(['schedule_1'], np.arange(1440)) == expected
+
+
+def test_evaluate_many_rejects_fractional_minutes(schedule_file):
+    manager = ScheduleManager(schedule_file)
+    with pytest.raises(ValueError, match="integer minutes"):
+        manager.evaluate_many(['schedule_1'], [90.5])
+    np = load_numpy()
+    if np is not None:
+        with pytest.raises(ValueError, match="integer minutes"):
+            manager.evaluate_many(['schedule_1'], np.linspace(0, 100, 3))
+        # NumPy integer scalars are still accepted one by one
+        assert manager.evaluate_many(['schedule_1'], [np.int64(450)]) == \
+            manager.evaluate_many(['schedule_1'], [450])
+
+
+def _write_organizations(path):
+    import json
+    data = {
+        'north_building': {'wing_a': {'name': 'Wing A', 'events': [
+            {'name': 'Block 1', 'start': '08:00', 'end': '09:00'}]}},
+        'south_building': {'gym': {'name': 'Gym', 'events': [
+            {'name': 'Open Gym', 'start': '15:00', 'end': '17:00'}]}},
+    }
+    path.write_text(json.dumps(data))
+    return data
+
+
+def test_schedules_resolve_by_key_and_name(tmp_path):
+    path = tmp_path / 'schedules.json'
+    _write_organizations(path)
+    manager = ScheduleManager(str(path), organization='north_building')
+    assert list(manager.schedules) == ['wing_a']
+    assert manager.get_current_event('wing_a', "08:30") == "Block 1"
+    assert manager.get_current_event('Wing A', "08:30") == "Block 1"
+    assert manager.get_current_event('Gym', "15:30") == "Not in Session"
+
+
+def test_organizations_are_selectable_and_saved_independently(tmp_path):
+    import json
+    path = tmp_path / 'schedules.json'
+    data = _write_organizations(path)
+    manager = ScheduleManager(str(path), organization='north_building')
+    assert manager.organizations == ['north_building', 'south_building']
+    manager.organization = 'south_building'
+    manager.schedules = manager.load_schedules()
+    assert manager.get_current_event('gym', "15:30") == "Open Gym"
+    manager.schedules['gym'].name = 'Main Gym'
+    manager.save_schedules(manager.schedules)
+    saved = json.loads(path.read_text())
+    assert saved['north_building'] == data['north_building']
+    assert saved['south_building']['gym']['name'] == 'Main Gym'
+
+
+def test_prepare_reload_leaves_live_schedules_until_adopted(tmp_path):
+    import json
+    import pytest
+    path = tmp_path / 'schedules.json'
+    data = _write_organizations(path)
+    manager = ScheduleManager(str(path), organization='north_building')
+
+    data['north_building']['wing_a']['events'][0]['name'] = 'Block A'
+    path.write_text(json.dumps(data))
+    staging = manager.prepare_reload()
+    assert manager.get_current_event('wing_a', "08:30") == "Block 1"
+    manager.adopt(staging)
+    assert manager.get_current_event('wing_a', "08:30") == "Block A"
+
+    path.write_text('{"north_building": {"wing_a": {"events": [')
+    with pytest.raises(ValueError):
+        manager.prepare_reload()
+    assert manager.get_current_event('wing_a', "08:30") == "Block A"
+
+
+def test_background_writer_saves_latest_snapshot(tmp_path):
+    import json
+    from utils.schedule_writer import ScheduleWriter
+    path = tmp_path / 'schedules.json'
+    data = _write_organizations(path)
+    manager = ScheduleManager(str(path), organization='north_building')
+    writer = ScheduleWriter(manager)
+    schedules = manager.schedules
+    for name in ('One', 'Two', 'Three'):
+        schedules['wing_a'].name = name
+        writer.save(schedules)
+    schedules['wing_a'].name = 'Not saved'
+    writer.wait(5)
+    saved = json.loads(path.read_text())
+    assert saved['north_building']['wing_a']['name'] == 'Three'
+    assert saved['south_building'] == data['south_building']
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['schedules.json', 'schedules.snapshot']
@@ -0,0 +1,63 @@
+import copy
+import json
+
+import pytest
+
+from constants import SCHEDULES_FILE
+from core.schedule_records import Schedule, parse_schedules, schedules_to_json
+
+
+def test_schedule_file_round_trips_exactly():
+    with open(SCHEDULES_FILE, 'r') as f:
+        original = f.read()
+    data = json.loads(original)
+    parsed = {name: parse_schedules(schedules) for name, schedules in data.items()}
+    round_tripped = {name: schedules_to_json(schedules) for name, schedules in parsed.items()}
+    assert json.dumps(round_tripped, indent=4) == json.dumps(data, indent=4)
+
+
+def test_irregular_events_are_kept_verbatim():
+    events = [
+        {'name': 'Block 1', 'start': '08:00', 'end': '09:00', 'minutes': 60},
+        {'name': 'Odd', 'start': '7:30', 'end': '08:00'},
+        {'start': '09:00', 'end': '09:30'},
+        {'name': 'Lunch', 'start': '11:00', 'end': '11:30', 'minutes': 25},
+        {'end': '12:00', 'name': 'Reordered', 'start': '11:30'},
+        {'name': 'Room', 'start': '12:00', 'end': '13:00', 'room': '101'},
+        {'name': 'Open', 'start': '', 'end': ''},
+    ]
+    data = {'name': 'Mixed', 'label': 'Mix', 'color': '#fff', 'events': copy.deepcopy(events)}
+    schedule = Schedule.from_dict(data, 'mixed')
+    assert schedule.to_dict() == data
+    assert list(schedule.to_dict()['events'][4]) == ['end', 'name', 'start']
+    assert sorted(schedule.irregular) == [1, 2, 3, 4, 5]
+    assert schedule.has_malformed_times()
+    assert (schedule[0].name, schedule[0].start, schedule[0].end) == ('Block 1', 480, 540)
+    assert schedule[1].start is None and schedule[6].end is None
+
+
+def test_set_event_updates_columns():
+    schedule = Schedule.from_dict({'name': 'A', 'events': [
+        {'name': 'P1', 'start': '7:30', 'end': '08:00'}]})
+    schedule.set_event(0, {'name': 'P1', 'start': '07:30', 'end': '08:00', 'minutes': 30})
+    assert not schedule.irregular and not schedule.has_malformed_times()
+    assert schedule.columns() == (['P1'], [450], [480])
+    assert schedule.event_dicts() == [{'name': 'P1', 'start': '07:30', 'end': '08:00', 'minutes': 30}]
+
+
+def test_schedule_without_events_key():
+    schedule = Schedule.from_dict({'name': 'Empty'})
+    assert not schedule.has_events and len(schedule) == 0
+    assert schedule.to_dict() == {'name': 'Empty'}
+
+
+@pytest.mark.parametrize('schedules', [
+    [],
+    {'a': []},
+    {'a': {'events': {}}},
+    {'a': {'events': [{'name': 3, 'start': '08:00', 'end': '09:00'}]}},
+    {'a': {'events': [{'name': 'P1', 'start': None, 'end': '09:00'}]}},
+])
+def test_bad_shapes_are_rejected(schedules):
+    with pytest.raises(ValueError):
+        parse_schedules(schedules)
@@ -0,0 +1,82 @@
+import json
+import os
+
+from core import schedule_snapshot
+from core.schedule_index import ScheduleIndex
+from core.schedule_manager import ScheduleManager
+from core.schedule_snapshot import ScheduleSnapshot, snapshot_path
+
+SCHEDULES = {
+    'school': {'schedule_1': {'name': 'Regular', 'events': [
+        {'name': 'Period 1', 'start': '08:00', 'end': '08:45'},
+        {'name': 'Period 2', 'start': '08:50', 'end': '09:35'}]}},
+    'annex': {'schedule_1': {'name': 'Annex', 'events': [
+        {'name': 'Block A', 'start': '7:00', 'end': '09:00'}]}},
+}
+
+
+def _write(path, data):
+    path.write_text(json.dumps(data), encoding='utf-8')
+
+
+def test_warm_start_skips_json_and_index_compilation(tmp_path, monkeypatch):
+    path = tmp_path / 'schedules.json'
+    _write(path, SCHEDULES)
+    cold = ScheduleManager(str(path), organization='school')
+    assert os.path.exists(snapshot_path(str(path)))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("should have used the snapshot")
+    monkeypatch.setattr(schedule_snapshot.json, 'loads', fail)
+    monkeypatch.setattr(ScheduleIndex, '__init__', fail)
+    warm = ScheduleManager(str(path), organization='school')
+    assert warm.schedules == cold.schedules
+    assert warm.organizations == ['school', 'annex']
+    for minute in range(0, 1440, 7):
+        assert warm.get_index('schedule_1').lookup(minute) == cold.get_index('schedule_1').lookup(minute)
+    assert warm.get_current_event('schedule_1', '08:47') == cold.get_current_event('schedule_1', '08:47')
+
+
+def test_unindexable_schedules_are_cached_too(tmp_path):
+    path = tmp_path / 'schedules.json'
+    _write(path, SCHEDULES)
+    cold = ScheduleManager(str(path), organization='annex')
+    warm = ScheduleManager(str(path), organization='annex')
+    assert warm.store.snapshot.index_states['annex'] == {'schedule_1': None}
+    assert warm.get_index('schedule_1') is None
+    assert warm.get_current_event('schedule_1', '08:00') == cold.get_current_event('schedule_1', '08:00')
+
+
+def test_stale_snapshot_is_regenerated(tmp_path):
+    path = tmp_path / 'schedules.json'
+    _write(path, SCHEDULES)
+    snapshot = ScheduleSnapshot(str(path))
+    snapshot.load()
+    snapshot.save()
+
+    # Touching the file keeps the snapshot after a hash check
+    os.utime(path, ns=(1, 1))
+    snapshot = ScheduleSnapshot(str(path))
+    snapshot.load()
+    assert snapshot.stale and snapshot.schedules('school') == SCHEDULES['school']
+    snapshot.save()
+    snapshot = ScheduleSnapshot(str(path))
+    snapshot.load()
+    assert not snapshot.stale
+
+    # Changed content is parsed again
+    changed = dict(SCHEDULES, school={'schedule_1': {'name': 'Changed', 'events': []}})
+    _write(path, changed)
+    snapshot = ScheduleSnapshot(str(path))
+    assert snapshot.load() == ['school', 'annex']
+    assert snapshot.stale and snapshot.schedules('school') == changed['school']
+
+
+def test_corrupt_snapshot_falls_back_to_json(tmp_path):
+    path = tmp_path / 'schedules.json'
+    _write(path, SCHEDULES)
+    with open(snapshot_path(str(path)), 'wb') as f:
+        f.write(b'not a snapshot')
+    manager = ScheduleManager(str(path), organization='school')
+    assert manager.get_current_event('schedule_1', '08:10') == 'Period 1'
+    assert ScheduleSnapshot(str(path)).load() and not manager.store.snapshot.stale
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from constants import SCHEDULES_FILE
+from core.schedule_manager import ScheduleManager
+from core.schedule_storage import (SqliteScheduleStore, JsonScheduleStore, open_store,
+                                    import_json, export_json)
+
+
+def test_open_store_picks_backend_by_extension(tmp_path):
+    assert isinstance(open_store(str(tmp_path / 'schedules.db')), SqliteScheduleStore)
+    assert isinstance(open_store(str(tmp_path / 'schedules.json')), JsonScheduleStore)
+
+
+def test_json_round_trip_is_lossless(tmp_path):
+    store = open_store(str(tmp_path / 'schedules.db'))
+    import_json(store, SCHEDULES_FILE)
+    export_json(store, str(tmp_path / 'exported.json'))
+    with open(SCHEDULES_FILE, 'r') as f:
+        original = f.read()
+    assert (tmp_path / 'exported.json').read_text() == json.dumps(json.loads(original), indent=4)
+
+
+@pytest.mark.parametrize('file_name', ['schedules.json', 'schedules.db'])
+def test_backends_round_trip_the_same_data(tmp_path, file_name):
+    schedules = {'schedule_1': {'name': 'Regular', 'events': [
+                     {'name': 'P1', 'start': '08:00', 'end': '08:45', 'minutes': 45}]},
+                 'schedule_2': {'name': 'Empty', 'events': []},
+                 'schedule_3': {'name': 'No events key', 'label': 'HR'}}
+    store = open_store(str(tmp_path / file_name))
+    store.save('north', schedules)
+    store.read_organizations()
+    assert store.load('north') == schedules
+
+
+def test_json_update_event_errors_leave_the_file_alone(tmp_path):
+    path = tmp_path / 'schedules.json'
+    store = open_store(str(path))
+    store.save('north', {'wing_a': {'name': 'Wing A', 'events': [
+        {'name': 'Block 1', 'start': '08:00', 'end': '09:00'}]}})
+    saved = path.read_text()
+    event = {'name': 'Block 2', 'start': '09:00', 'end': '10:00'}
+    for organization, key, position in [('south', 'wing_a', 0), ('north', 'gym', 0),
+                                        ('north', 'wing_a', 1), ('north', 'wing_a', -1)]:
+        with pytest.raises(KeyError):
+            store.update_event(organization, key, position, event)
+    assert path.read_text() == saved
+
+    path.write_text(saved[:-20])
+    with pytest.raises(ValueError):
+        store.update_event('north', 'wing_a', 0, event)
+    assert path.read_text() == saved[:-20]
+
+
+def test_save_writes_only_changed_rows(tmp_path):
+    store = open_store(str(tmp_path / 'schedules.db'))
+    import_json(store, SCHEDULES_FILE)
+    schedules = store.load('southampton_high_school')
+    assert store.save('southampton_high_school', schedules) == 0
+
+    schedules['schedule_1']['events'][3]['end'] = '09:40'
+    assert store.save('southampton_high_school', schedules) == 1
+
+    del schedules['schedule_2']['events'][-2:]
+    schedules['schedule_3']['label'] = 'HR'
+    assert store.save('southampton_high_school', schedules) == 3  # Two deletes, one update
+    assert store.load('southampton_high_school') == schedules
+
+
+def test_json_save_refuses_to_replace_an_unreadable_file(tmp_path):
+    path = tmp_path / 'schedules.json'
+    store = open_store(str(path))
+    store.save('north', {'schedule_1': {'name': 'A', 'events': []}})
+    store.save('south', {'schedule_1': {'name': 'B', 'events': []}})
+    assert json.loads(path.read_text()) == {'north': {'schedule_1': {'name': 'A', 'events': []}},
+                                            'south': {'schedule_1': {'name': 'B', 'events': []}}}
+
+    corrupted = path.read_text()[:-20]  # e.g. caught half-written or mid hand edit
+    path.write_text(corrupted)
+    with pytest.raises(ValueError):
+        store.save('north', {'schedule_1': {'name': 'C', 'events': []}})
+    assert path.read_text() == corrupted
+
+
+def test_update_event_touches_one_row(tmp_path):
+    store = open_store(str(tmp_path / 'schedules.db'))
+    store.save('north', {'wing_a': {'name': 'Wing A', 'events': [
+        {'name': 'Block 1', 'start': '08:00', 'end': '09:00', 'minutes': 60}]}})
+    store.update_event('north', 'wing_a', 0, {'name': 'Block 1', 'start': '08:05', 'end': '09:00'})
+    assert store.load('north')['wing_a']['events'] == [
+        {'name': 'Block 1', 'start': '08:05', 'end': '09:00'}]
+    with pytest.raises(KeyError):
+        store.update_event('north', 'wing_a', 1, {'name': 'Block 2', 'start': '09:00', 'end': '10:00'})
+
+
+def test_manager_on_sqlite(tmp_path):
+    path = str(tmp_path / 'schedules.db')
+    store = open_store(path)
+    store.save('north', {'wing_a': {'name': 'Wing A', 'events': [
+        {'name': 'Block 1', 'start': '08:00', 'end': '09:00'}]}})
+    store.save('south', {'gym': {'name': 'Gym', 'events': []}})
+
+    manager = ScheduleManager(path, organization='north')
+    assert manager.organizations == ['north', 'south']
+    assert manager.get_current_event('wing_a', '08:30') == 'Block 1'
+
+    manager.save_event('wing_a', 0, {'name': 'Homeroom', 'start': '08:00', 'end': '09:00'})
+    assert manager.get_current_event('wing_a', '08:30') == 'Homeroom'
+    assert ScheduleManager(path, organization='north').get_current_event('wing_a', '08:30') == 'Homeroom'
+    assert store.load('south') == {'gym': {'name': 'Gym', 'events': []}}
@@ -0,0 +1,62 @@
+import io
+import json
+
+from core.schedule_validator import (validate_events, validate_schedules, has_errors,
+                                      run_check, ERROR, WARNING, INFO)
+
+
+def make_event(name, start, end, **extra):
+    return dict(name=name, start=start, end=end, **extra)
+
+
+def kinds(issues):
+    return sorted((issue.kind, tuple(issue.events)) for issue in issues)
+
+
+def test_handoff_at_shared_minute_is_not_an_overlap():
+    events = [make_event('Warning Bell', '07:20', '07:25', minutes=5),
+              make_event('Period 1', '07:25', '08:10', minutes=45)]
+    assert validate_events(events) == []
+
+
+def test_reports_each_problem_kind():
+    events = [make_event('Period 1', '08:00', '09:00', minutes=50),
+              make_event('Period 2', '08:30', '09:30'),
+              make_event('Lunch', '7:00', '07:30'),
+              make_event('Period 3', '11:00', '10:00'),
+              make_event('Period 4', '10:00', '10:45')]
+    issues = validate_events(events, 'schedule_1')
+    assert kinds(issues) == [('end_before_start', (3,)), ('gap', ()), ('malformed', (2,)),
+                             ('minutes', (0,)), ('overlap', (0, 1))]
+    severities = {issue.kind: issue.severity for issue in issues}
+    assert severities['overlap'] == ERROR
+    assert severities['minutes'] == WARNING
+    assert severities['gap'] == INFO
+    assert all(issue.schedule_key == 'schedule_1' for issue in issues)
+
+
+def test_times_past_midnight_are_malformed():
+    events = [make_event('Period 1', '23:00', '25:00'), make_event('Period 2', '99:59', '23:59')]
+    assert kinds(validate_events(events, 'schedule_1')) == [('malformed', (0,)), ('malformed', (1,))]
+
+
+def test_out_of_order_and_nested_overlaps():
+    events = [make_event('All day', '08:00', '15:00'),
+              make_event('B', '10:00', '11:00'),
+              make_event('A', '09:00', '09:30')]
+    issues = validate_events(events)
+    assert kinds(issues) == [('order', (1, 2)), ('overlap', (0, 1)), ('overlap', (0, 2))]
+    assert has_errors(issues)
+
+
+def test_run_check_exit_code(tmp_path):
+    schedule_file = tmp_path / 'schedules.json'
+    good = {'schedule_1': {'name': 'Regular', 'events': [make_event('Period 1', '08:00', '09:00')]}}
+    bad = {'schedule_1': {'name': 'Regular', 'events': [make_event('Period 1', '08:00', '09:00'),
+                                                        make_event('Period 2', '08:59', '10:00')]}}
+    schedule_file.write_text(json.dumps({'good': good, 'bad': bad}), encoding='utf-8')
+    assert run_check(str(schedule_file), io.StringIO(), organization='good') == 0
+    output = io.StringIO()
+    assert run_check(str(schedule_file), output) == 1
+    assert "bad/schedule_1: 'Period 1' (08:00-09:00) overlaps 'Period 2'" in output.getvalue()
+    assert not has_errors(validate_schedules(good))
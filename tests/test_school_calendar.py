@@ -0,0 +1,78 @@
+import json
+from datetime import date
+
+import pytest
+
+from core.school_calendar import SchoolCalendar
+from core.schedule_manager import ScheduleManager
+
+CALENDAR = {
+    'start': '2026-09-08', 'end': '2027-06-25',
+    'rules': [
+        {'schedule': 'schedule_1', 'freq': 'weekly', 'weekdays': ['mon', 'tue', 'wed', 'thu', 'fri']},
+        {'schedule': 'schedule_3', 'freq': 'weekly', 'weekdays': ['wed'], 'interval': 2},
+        {'schedule': 'schedule_2', 'freq': 'monthly', 'weekday': 'fri', 'nth': -1},
+    ],
+    'exceptions': [{'name': 'Winter Break', 'start': '2026-12-21', 'end': '2027-01-01'}],
+    'overrides': [{'date': '2026-12-22', 'schedule': 'schedule_2'}],
+}
+
+
+def test_rules_exceptions_and_overrides():
+    calendar = SchoolCalendar(CALENDAR)
+    assert calendar.schedule_for(date(2026, 9, 8)) == 'schedule_1'   # Tuesday
+    assert calendar.schedule_for(date(2026, 9, 9)) == 'schedule_3'   # Wednesday, first week
+    assert calendar.schedule_for(date(2026, 9, 16)) == 'schedule_1'  # Wednesday, off week
+    assert calendar.schedule_for(date(2026, 9, 23)) == 'schedule_3'
+    assert calendar.schedule_for(date(2026, 9, 25)) == 'schedule_2'  # Last Friday
+    assert calendar.schedule_for(date(2026, 9, 26)) is None          # Saturday
+    assert calendar.schedule_for(date(2026, 12, 21)) is None         # Winter break
+    assert calendar.schedule_for(date(2026, 12, 22)) == 'schedule_2'  # Override wins
+    assert calendar.schedule_for(date(2026, 9, 7)) is None           # Before the year
+    assert calendar.schedule_for(date(2027, 6, 28)) is None          # After the year
+
+
+def test_one_lookup_entry_per_day():
+    calendar = SchoolCalendar(CALENDAR)
+    assignments = list(calendar.assignments())
+    assert len(calendar.codes) == len(assignments) == 291
+    assert all(calendar.schedule_for(day) == key for day, key in assignments)
+
+
+def test_invalid_calendars_are_rejected():
+    with pytest.raises(ValueError):
+        SchoolCalendar(dict(CALENDAR, rules=[{'schedule': 'schedule_1', 'freq': 'hourly'}]))
+    with pytest.raises(ValueError):
+        SchoolCalendar(CALENDAR, schedule_keys=['schedule_1', 'schedule_2'])
+    with pytest.raises(ValueError):
+        SchoolCalendar(dict(CALENDAR, end='2026-01-01'))
+
+
+@pytest.mark.parametrize('rules', [
+    [{'schedule': 'schedule_1', 'freq': 'monthly', 'weekday': 'fri', 'nth': 'last'}],
+    [{'schedule': 'schedule_1', 'freq': 'monthly', 'weekday': 'fri', 'nth': 1.5}],
+    [{'schedule': 'schedule_1', 'freq': 'monthly', 'day': '15'}],
+    [{'schedule': 'schedule_1', 'freq': 'weekly', 'weekdays': 5}],
+    ['schedule_1'],
+    {'schedule': 'schedule_1', 'freq': 'daily'},
+])
+def test_hand_edited_rules_raise_value_error(rules):
+    with pytest.raises(ValueError):
+        SchoolCalendar(dict(CALENDAR, rules=rules))
+
+
+def test_manager_reports_active_schedule(tmp_path):
+    schedule_file = tmp_path / 'schedules.json'
+    schedule_file.write_text(json.dumps({'school': {
+        key: {'name': key, 'events': []} for key in ('schedule_1', 'schedule_2', 'schedule_3')}}),
+        encoding='utf-8')
+    calendar_file = tmp_path / 'calendar.json'
+    manager = ScheduleManager(str(schedule_file), organization='school',
+                              calendar_file=str(calendar_file))
+    assert manager.active_schedule(date(2026, 9, 8)) is None  # No calendar file
+
+    calendar_file.write_text(json.dumps({'school': CALENDAR}), encoding='utf-8')
+    staging = manager.prepare_reload()
+    manager.adopt(staging)
+    assert manager.active_schedule(date(2026, 9, 8)) == 'schedule_1'
+    assert manager.loaded_calendar_signature == manager.calendar_signature()
@@ -0,0 +1,59 @@
+from PyQt6.QtCore import QSettings
+
+from utils.settings_manager import SettingsManager, SettingsStore
+
+
+def _isolated_store(tmp_path, monkeypatch):
+    path = str(tmp_path / 'settings.ini')
+    monkeypatch.setattr(SettingsStore, '_instance', None)
+    monkeypatch.setattr('utils.settings_manager.QSettings',
+                        lambda *args: QSettings(path, QSettings.Format.IniFormat))
+    return path
+
+
+def test_instances_share_one_cache(tmp_path, monkeypatch):
+    _isolated_store(tmp_path, monkeypatch)
+    first, second = SettingsManager(), SettingsManager()
+    assert first.store is second.store
+    first.save_admin_password('secret')
+    assert second.get_admin_password() == 'secret'
+
+
+def test_writes_flush_and_external_changes_reload(tmp_path, monkeypatch):
+    path = _isolated_store(tmp_path, monkeypatch)
+    manager = SettingsManager()
+    manager.save_organization('north_building')
+    manager.store.flush()
+    assert QSettings(path, QSettings.Format.IniFormat).value('organization') == 'north_building'
+
+    other = QSettings(path, QSettings.Format.IniFormat)
+    other.setValue('organization', 'south_building')
+    other.sync()
+    manager.store._next_check = 0.0
+    manager.store._signature = None  # mtime granularity may hide the change
+    assert manager.get_organization() == 'south_building'
+
+
+def test_registry_store_is_not_checked_for_external_changes(tmp_path, monkeypatch):
+    path = str(tmp_path / 'settings.ini')
+
+    class RegistrySettings(QSettings):
+        # What the native backend reports on Windows
+        def fileName(self):
+            return '\\HKEY_CURRENT_USER\\Software\\Test\\Schedule Minder'
+
+    monkeypatch.setattr(SettingsStore, '_instance', None)
+    monkeypatch.setattr('utils.settings_manager.QSettings',
+                        lambda *args: RegistrySettings(path, QSettings.Format.IniFormat))
+    manager = SettingsManager()
+    manager.save_organization('north_building')
+    manager.store.flush()
+    assert manager.store._signature is None
+
+    other = QSettings(path, QSettings.Format.IniFormat)
+    other.setValue('organization', 'south_building')
+    other.sync()
+    manager.store._next_check = 0.0
+    assert manager.get_organization() == 'north_building'
+    manager.store.reload()
+    assert manager.get_organization() == 'south_building'
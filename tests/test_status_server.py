@@ -0,0 +1,122 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from core.clock import SimulatedClock
+from core.schedule_manager import ScheduleManager
+from utils.status_client import StatusClient, parse_address, parse_status
+from utils.status_server import StatusServer, build_status
+
+
+@pytest.fixture
+def manager(schedule_file):
+    return ScheduleManager(schedule_file, organization='southampton_high_school')
+
+
+def test_build_status_matches_manager(manager):
+    now = datetime(2024, 9, 3, 9, 15)
+    status = build_status(manager, now)
+    assert status['date'] == '2024-09-03'
+    assert [entry['key'] for entry in status['schedules']] == list(manager.schedules)
+    for entry in status['schedules']:
+        assert entry['status'] == manager.get_current_event(entry['key'], '09:15')
+
+
+def test_refresh_publishes_only_changes(manager):
+    server = StatusServer(manager)
+    assert server.refresh(datetime(2024, 9, 3, 9, 15))
+    assert not server.refresh(datetime(2024, 9, 3, 9, 15))
+    assert server.version == 1
+
+
+def test_server_pushes_status_over_tcp_and_http(manager):
+    async def scenario():
+        server = StatusServer(manager, port=0, http_port=0)
+        await server.start()
+        try:
+            (host, port), (_, http_port) = [address[:2] for address in server.addresses()]
+
+            reader, writer = await asyncio.open_connection(host, port)
+            line = await asyncio.wait_for(reader.readline(), 5)
+            writer.close()
+
+            reader, writer = await asyncio.open_connection(host, http_port)
+            writer.write(b"GET /status HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            response = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+
+            reader, writer = await asyncio.open_connection(host, http_port)
+            writer.write(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            while (await asyncio.wait_for(reader.readline(), 5)).strip():
+                pass
+            event = await asyncio.wait_for(reader.readline(), 5)
+            writer.close()
+        finally:
+            await server.stop()
+        return line, response, event
+
+    line, response, event = asyncio.run(scenario())
+    status = json.loads(line)
+    assert [entry['key'] for entry in status['schedules']] == list(manager.schedules)
+    head, body = response.split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 200 OK")
+    assert json.loads(body) == status
+    assert json.loads(event[len(b"data: "):]) == status
+
+
+def test_server_evaluates_only_at_boundaries_and_reloads(tmp_path, monkeypatch):
+    path = tmp_path / 'schedules.json'
+    path.write_text(json.dumps({'school': {'schedule_1': {'name': 'Regular', 'events': [
+        {'name': 'P1', 'start': '08:00', 'end': '09:00'}]}}}))
+    manager = ScheduleManager(str(path), organization='school',
+                              calendar_file=str(tmp_path / 'calendar.json'),
+                              clock=SimulatedClock(datetime(2024, 9, 3, 8, 30)))
+    monkeypatch.setattr('utils.status_server.FILE_CHECK_SECONDS', 0.02)
+    server = StatusServer(manager, port=None, http_port=None)
+    evaluations = []
+    refresh = server.refresh
+    monkeypatch.setattr(server, 'refresh', lambda now=None: evaluations.append(now) or refresh(now))
+
+    async def scenario():
+        await server.start()
+        try:
+            await asyncio.sleep(0.2)
+            assert len(evaluations) == 1  # Paused clock: no boundary, no file change
+            path.write_text(path.read_text().replace('P1', 'Block 1'))
+            for _ in range(100):
+                if len(evaluations) > 1:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            await server.stop()
+
+    asyncio.run(scenario())
+    assert len(evaluations) == 2
+    assert server.status['schedules'][0]['status'] == 'Block 1'
+
+
+def test_parse_address():
+    assert parse_address('unix:/tmp/minder.sock') == '/tmp/minder.sock'
+    assert parse_address('10.0.0.5:9000') == ('10.0.0.5', 9000)
+    assert parse_address(':9000') == ('127.0.0.1', 9000)
+
+
+def test_parse_status_drops_malformed_lines():
+    assert parse_status(b'{"schedules": [{"key": "schedule_1"}]}') == {'schedules': [{'key': 'schedule_1'}]}
+    for line in [b'{"schedules": [{"key": "sche', b'not json', b'[]', b'{"date": "2024-09-03"}',
+                 b'{"schedules": [{"name": "Regular"}]}', b'{"schedules": ["schedule_1"]}']:
+        assert parse_status(line) is None
+
+
+def test_client_answers_from_pushed_status(app, manager):
+    client = StatusClient('127.0.0.1:1')
+    client.reconnect_timer.stop()
+    status = build_status(manager, datetime(2024, 9, 3, 9, 15))
+    client.apply_status(status)
+    assert list(client.schedules) == list(manager.schedules)
+    for key in manager.schedules:
+        assert client.schedule_label(key) == manager.schedule_label(key)
+        assert client.get_current_event(key) == manager.get_current_event(key, '09:15')
+    assert client.next_boundary(0) is None
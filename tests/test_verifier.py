@@ -0,0 +1,26 @@
+import io
+
+from utils.test_file_helper import TestFileHelper
+from utils.verifier import run_verification
+
+MASTER_FILE = TestFileHelper.get_test_file_path('master_time_test.txt')
+
+
+def test_verify_round_trip(tmp_path, schedule_file):
+    output = io.StringIO()
+    assert run_verification(MASTER_FILE, schedule_file=schedule_file, output=output) == 0
+    expected = tmp_path / 'expected.txt'
+    expected.write_text(output.getvalue(), encoding='utf-8')
+    assert run_verification(MASTER_FILE, str(expected), schedule_file, output=io.StringIO()) == 0
+
+
+def test_verify_reports_mismatch(tmp_path, schedule_file):
+    output = io.StringIO()
+    run_verification(MASTER_FILE, schedule_file=schedule_file, output=output)
+    lines = output.getvalue().splitlines()
+    lines[1] = lines[1] + " (changed)"
+    expected = tmp_path / 'expected.txt'
+    expected.write_text("\n".join(lines), encoding='utf-8')
+    diff = io.StringIO()
+    assert run_verification(MASTER_FILE, str(expected), schedule_file, output=diff) == 1
+    assert "(changed)" in diff.getvalue()
@@ -0,0 +1,60 @@
+# Alarm sinks that need the GUI: tray balloons and sounds
+
+import sys
+from PyQt6.QtCore import QObject, QUrl, pyqtSignal
+from PyQt6.QtWidgets import QApplication, QSystemTrayIcon
+from core.alarms import AlarmSink
+from constants import ALARM_BALLOON_MS
+
+
+class GuiAlarmSink(QObject, AlarmSink):
+    """Passes alarms from the dispatcher's worker threads to the GUI thread.
+
+    deliver() only emits a signal, which Qt queues to the thread this sink
+    lives in, where show() runs.
+    """
+    alarm_rung = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.alarm_rung.connect(self.show)
+
+    def deliver(self, alarm):
+        self.alarm_rung.emit(alarm)
+
+    def show(self, alarm):
+        raise NotImplementedError
+
+
+class TraySink(GuiAlarmSink):
+    """Shows the alarm in a tray balloon"""
+
+    def __init__(self, tray_icon, parent=None):
+        super().__init__(parent)
+        self.tray_icon = tray_icon
+
+    def show(self, alarm):
+        self.tray_icon.showMessage(alarm.label, alarm.message,
+                                   QSystemTrayIcon.MessageIcon.Information, ALARM_BALLOON_MS)
+
+
+class SoundSink(GuiAlarmSink):
+    """Plays a WAV file, or beeps without one or without Qt Multimedia"""
+
+    def __init__(self, sound_file='', parent=None):
+        super().__init__(parent)
+        self.effect = None
+        if sound_file:
+            try:
+                from PyQt6.QtMultimedia import QSoundEffect
+            except ImportError:
+                print("Qt Multimedia is not available; alarms will beep instead", file=sys.stderr)
+            else:
+                self.effect = QSoundEffect(self)
+                self.effect.setSource(QUrl.fromLocalFile(sound_file))
+
+    def show(self, alarm):
+        if self.effect is not None:
+            self.effect.play()
+        else:
+            QApplication.beep()
@@ -0,0 +1,60 @@
+# Countdown to the next bell, repainted on its own once a second
+
+import math
+from PyQt6.QtWidgets import QWidget, QSizePolicy
+from PyQt6.QtGui import QPainter, QPalette
+from PyQt6.QtCore import Qt, QSize
+
+# Widest text shown; the size hint is fixed to it so ticking never relayouts
+WIDEST_TEXT = "00:00:00 remaining"
+
+
+def format_remaining(seconds):
+    """Format seconds left as 'M:SS remaining' or 'H:MM:SS remaining'"""
+    seconds = max(0, math.ceil(seconds))  # Reaches 0:00 exactly at the bell
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d} remaining"
+    return f"{minutes}:{seconds:02d} remaining"
+
+
+class CountdownLabel(QWidget):
+    """Shows the time left until a deadline, e.g. "12:34 remaining".
+
+    The window sets the deadline at each schedule boundary, from the next
+    bell the ScheduleManager already knows, and calls tick() once a second.
+    A tick only does date arithmetic and, when the text changed, repaints
+    this widget's own rectangle: no lookups, no relayout and no restyling.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("countdown")
+        self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Preferred)
+        self.deadline = None
+        self.text = ""
+
+    def set_deadline(self, deadline, now):
+        """Count down to deadline (a datetime), or show nothing for None"""
+        self.deadline = deadline
+        self.tick(now)
+
+    def tick(self, now):
+        if self.deadline is None:
+            text = ""
+        else:
+            text = format_remaining((self.deadline - now).total_seconds())
+        if text != self.text:
+            self.text = text
+            self.update()
+
+    def sizeHint(self):
+        metrics = self.fontMetrics()
+        return QSize(metrics.horizontalAdvance(WIDEST_TEXT), metrics.height())
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setPen(self.palette().color(QPalette.ColorRole.WindowText))
+        painter.drawText(self.rect(), Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
+                         self.text)
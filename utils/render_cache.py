@@ -0,0 +1,39 @@
+# Diffing layer that skips UI updates whose value has not changed
+
+
+class RenderCache:
+    """Remembers the last value pushed to each UI target.
+
+    apply() only calls the setter when the value differs from the one last
+    rendered for that target, so unchanged labels, titles and tooltips do
+    not trigger relayout or repaint. applied/skipped count both outcomes.
+    """
+
+    def __init__(self):
+        self._rendered = {}
+        self.applied = 0
+        self.skipped = 0
+
+    def apply(self, target, value, setter):
+        """Call setter(value) if value changed for target; return True if applied"""
+        if target in self._rendered and self._rendered[target] == value:
+            self.skipped += 1
+            return False
+        self._rendered[target] = value
+        setter(value)
+        self.applied += 1
+        return True
+
+    def invalidate(self, target=None):
+        """Forget one target (e.g. a recreated widget), or all targets"""
+        if target is None:
+            self._rendered.clear()
+        else:
+            self._rendered.pop(target, None)
+
+    def stats(self):
+        return {'applied': self.applied, 'skipped': self.skipped}
+
+    def reset_stats(self):
+        self.applied = 0
+        self.skipped = 0
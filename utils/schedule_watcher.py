@@ -0,0 +1,88 @@
+# Hot reload of the schedule and calendar files when they change on disk
+
+import os
+import threading
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+# Quiet period after the last change before the file is read
+RELOAD_DEBOUNCE_MS = 500
+
+
+class ScheduleWatcher(QObject):
+    """Watches the schedule file and reloads it off the GUI thread.
+
+    Bursts of change notifications are debounced into one reload. The new
+    file is parsed, validated and compiled on a worker thread into a staging
+    ScheduleManager; schedules_reloaded delivers it to the GUI thread, where
+    the receiver calls schedule_manager.adopt() and refreshes once. A file
+    that fails to parse (e.g. half written) emits reload_failed and leaves
+    the current schedules on display.
+    """
+    schedules_reloaded = pyqtSignal(object)
+    reload_failed = pyqtSignal(str)
+
+    def __init__(self, schedule_manager, parent=None):
+        super().__init__(parent)
+        self.schedule_manager = schedule_manager
+        self._reloading = False
+        self._pending = False
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(RELOAD_DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self.reload)
+
+        # Watch the directory too: atomic replaces drop the file watch
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._on_changed)
+        self.watcher.directoryChanged.connect(self._on_changed)
+        self.watch_paths()
+
+        self.schedules_reloaded.connect(self._on_reloaded)
+        self.reload_failed.connect(self._on_reloaded)
+
+    def watch_paths(self):
+        paths = []
+        for file_path in (self.schedule_manager.schedule_file, self.schedule_manager.calendar_file):
+            file_path = os.path.abspath(file_path)
+            paths.append(os.path.dirname(file_path))
+            if os.path.exists(file_path):
+                paths.append(file_path)
+        paths = list(dict.fromkeys(paths))
+        missing = [path for path in paths
+                   if path not in self.watcher.files() + self.watcher.directories()]
+        if missing:
+            self.watcher.addPaths(missing)
+
+    def _on_changed(self, path):
+        self.watch_paths()
+        self.debounce_timer.start()
+
+    def reload(self):
+        """Reload now unless the files are unchanged since they were last loaded or saved"""
+        manager = self.schedule_manager
+        signature = manager.file_signature()
+        if signature is None:
+            return
+        if (signature == manager.loaded_signature
+                and manager.calendar_signature() == manager.loaded_calendar_signature):
+            return
+        if self._reloading:
+            self._pending = True
+            return
+        self._reloading = True
+        threading.Thread(target=self._load_in_background, daemon=True).start()
+
+    def _load_in_background(self):
+        try:
+            staging = self.schedule_manager.prepare_reload()
+        except Exception as e:
+            self.reload_failed.emit(f"Failed to reload schedules: {str(e)}")
+        else:
+            self.schedules_reloaded.emit(staging)
+
+    def _on_reloaded(self, _result):
+        self._reloading = False
+        if self._pending:
+            self._pending = False
+            self.debounce_timer.start()
@@ -0,0 +1,55 @@
+# Background, coalescing writer for schedule saves
+
+import copy
+import threading
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class ScheduleWriter(QObject):
+    """Saves schedules on a worker thread so the GUI never blocks on disk.
+
+    save() snapshots the schedules and returns immediately. Saves requested
+    while a write is in progress are coalesced: only the latest snapshot per
+    organization is written. save_finished or save_failed is emitted (and
+    delivered on the GUI thread) after each write.
+    """
+    save_finished = pyqtSignal(str)
+    save_failed = pyqtSignal(str)
+
+    def __init__(self, schedule_manager, parent=None):
+        super().__init__(parent)
+        self.schedule_manager = schedule_manager
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._thread = None
+
+    def save(self, schedules, organization=None):
+        """Queue schedules for saving; returns without waiting for the write"""
+        organization = organization or self.schedule_manager.organization
+        snapshot = copy.deepcopy(schedules)
+        with self._lock:
+            self._pending[organization] = snapshot
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def wait(self, timeout=None):
+        """Block until queued saves are written (e.g. before quitting)"""
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                organization, schedules = self._pending.popitem()
+            try:
+                self.schedule_manager.save_schedules(schedules, organization)
+            except Exception as e:
+                self.save_failed.emit(f"Failed to save schedules: {str(e)}")
+            else:
+                self.save_finished.emit(organization)
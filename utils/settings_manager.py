@@ -1,55 +1,200 @@
 # Settings management and persistence 
-from PyQt6.QtCore import QSettings
-from constants import APP_ORGANIZATION, APP_NAME, DEFAULT_COLORS, DEFAULT_ADMIN_PASSWORD, ICON_PATH, DEFAULT_MESSAGES
+import atexit
+import json
+import os
+import threading
+import time
+from PyQt6 import sip
+from PyQt6.QtCore import QSettings, QCoreApplication, QThread, QTimer
+from core.settings import ScheduleSettings
+from constants import (APP_ORGANIZATION, APP_NAME, DEFAULT_COLORS, DEFAULT_ADMIN_PASSWORD, ICON_PATH,
+                       DEFAULT_MESSAGES, DEFAULT_ORGANIZATION, DEFAULT_ALARM_SETTINGS)
+
+# Delay before queued writes are flushed to the backing store
+WRITE_BEHIND_MS = 1000
+# Minimum seconds between checks for changes made by another instance
+EXTERNAL_CHECK_INTERVAL = 2.0
+# QSettings.fileName() of the Windows registry backend, which is not a file
+REGISTRY_PREFIX = '\\HKEY_'
+
+class SettingsStore:
+    """Process-wide in-memory cache of all settings.
+
+    Every key is read from QSettings once and served from memory afterwards.
+    Writes update the cache immediately and are flushed to QSettings in one
+    batch after WRITE_BEHIND_MS (or immediately when no Qt event loop is
+    available). If the backing file is changed by another instance, the
+    cache is reloaded on the next read. The Windows registry, QSettings'
+    native store there, is not a file and is not checked: changes made by
+    another instance are seen after a restart.
+    """
+    _instance = None
+    # INI file used in place of the user's settings (benchmarks, scripts)
+    settings_file = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def use_file(cls, path):
+        """Keep settings created from now on in the INI file at path"""
+        cls.settings_file = path
+        cls._instance = None
+
+    def __init__(self):
+        self._settings = None
+        self._lock = threading.RLock()
+        self._pending = {}
+        self._flush_timer = None
+        self._next_check = 0.0
+        self.reload()
+        atexit.register(self.flush)
+
+    @property
+    def settings(self):
+        # Qt deletes the QSettings object along with the QApplication
+        if self._settings is None or sip.isdeleted(self._settings):
+            if self.settings_file is not None:
+                self._settings = QSettings(self.settings_file, QSettings.Format.IniFormat)
+            else:
+                self._settings = QSettings(APP_ORGANIZATION, APP_NAME)
+        return self._settings
+
+    def reload(self):
+        """Re-read every key from the backing store"""
+        with self._lock:
+            self.settings.sync()
+            self._cache = {key: self.settings.value(key) for key in self.settings.allKeys()}
+            self._cache.update(self._pending)
+            self._signature = self._store_signature()
+
+    def _store_signature(self):
+        # Only file-backed stores (INI/plist) can be checked cheaply
+        file_name = self.settings.fileName()
+        if file_name.startswith(REGISTRY_PREFIX):
+            return None
+        try:
+            stat = os.stat(file_name)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _check_external_changes(self):
+        now = time.monotonic()
+        if now < self._next_check or self.settings.fileName().startswith(REGISTRY_PREFIX):
+            return
+        self._next_check = now + EXTERNAL_CHECK_INTERVAL
+        if self._store_signature() != self._signature:
+            self.reload()
+
+    def value(self, key, default=None):
+        with self._lock:
+            self._check_external_changes()
+            return self._cache.get(key, default)
+
+    def set_value(self, key, value):
+        with self._lock:
+            self._cache[key] = value
+            self._pending[key] = value
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        app = QCoreApplication.instance()
+        if app is None or QThread.currentThread() != app.thread():
+            self.flush()
+            return
+        if self._flush_timer is None:
+            self._flush_timer = QTimer()
+            self._flush_timer.setSingleShot(True)
+            self._flush_timer.timeout.connect(self.flush)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start(WRITE_BEHIND_MS)
+
+    def flush(self):
+        """Write queued changes to the backing store now"""
+        with self._lock:
+            if not self._pending:
+                return
+            for key, value in self._pending.items():
+                self.settings.setValue(key, value)
+            self._pending.clear()
+            self.settings.sync()
+            self._signature = self._store_signature()
+
+class SettingsManager(ScheduleSettings):
+    """Application settings stored with QSettings; also the schedule engine's settings"""
 
-class SettingsManager:
     def __init__(self):
-        self.settings = QSettings(APP_ORGANIZATION, APP_NAME)
+        # All instances share one cache, so creating a manager is cheap
+        self.store = SettingsStore.instance()
         
     def get_colors(self):
         colors = {}
         for key, default in DEFAULT_COLORS.items():
-            colors[key] = self.settings.value(key, default)
+            colors[key] = self.store.value(key, default)
         return colors
         
     def save_colors(self, colors):
         for key, value in colors.items():
-            self.settings.setValue(key, value)
+            self.store.set_value(key, value)
             
     def get_admin_password(self):
-        return self.settings.value('admin_password', DEFAULT_ADMIN_PASSWORD)
+        return self.store.value('admin_password', DEFAULT_ADMIN_PASSWORD)
         
     def save_admin_password(self, password):
-        self.settings.setValue('admin_password', password)
+        self.store.set_value('admin_password', password)
         
     def get_tray_icon_path(self):
         """Get custom tray icon path or return default"""
-        return self.settings.value('tray_icon_path', ICON_PATH)
+        return self.store.value('tray_icon_path', ICON_PATH)
         
     def save_tray_icon_path(self, path):
         """Save custom tray icon path"""
-        self.settings.setValue('tray_icon_path', path)
+        self.store.set_value('tray_icon_path', path)
         
     def get_window_size_name(self):
         """Get the saved window size name or return default"""
         # Convert the value to string to ensure we get the name, not a QSize
-        saved_size = self.settings.value('window_size', 'small')
+        saved_size = self.store.value('window_size', 'small')
         if isinstance(saved_size, str):
             return saved_size
         return 'small'  # Default if not a valid string
         
     def save_window_size_name(self, size_name):
         """Save the window size name"""
-        self.settings.setValue('window_size', size_name)
+        self.store.set_value('window_size', size_name)
         
     def get_schedule_messages(self):
         """Get customized schedule messages or return defaults"""
         messages = {}
         for key, default in DEFAULT_MESSAGES.items():
-            messages[key] = self.settings.value(f'messages/{key}', default)
+            messages[key] = self.store.value(f'messages/{key}', default)
         return messages
         
     def save_schedule_messages(self, messages):
         """Save customized schedule messages"""
         for key, message in messages.items():
-            self.settings.setValue(f'messages/{key}', message) 
\ No newline at end of file
+            self.store.set_value(f'messages/{key}', message)
+            
+    def get_alarm_settings(self):
+        """Get the alarm settings (see DEFAULT_ALARM_SETTINGS), saved or default"""
+        try:
+            saved = json.loads(self.store.value('alarms', '{}'))
+        except (TypeError, ValueError):
+            saved = {}
+        return dict(DEFAULT_ALARM_SETTINGS, **(saved if isinstance(saved, dict) else {}))
+        
+    def save_alarm_settings(self, alarms):
+        """Save the alarm settings"""
+        self.store.set_value('alarms', json.dumps(alarms))
+        
+    def get_organization(self):
+        """Get the selected organization (schedule file root key)"""
+        return self.store.value('organization', DEFAULT_ORGANIZATION)
+        
+    def save_organization(self, organization):
+        """Save the selected organization"""
+        self.store.set_value('organization', organization)
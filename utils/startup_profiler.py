@@ -0,0 +1,42 @@
+# Startup timing report (enabled with --startup-profile)
+
+import sys
+import time
+
+
+class StartupProfiler:
+    """Records named startup phases and prints how long each one took.
+
+    mark(name) closes the phase that started at the previous mark (or at
+    the process start time). Marks are ignored unless enabled.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.start_time = time.perf_counter()
+        self.marks = []
+
+    def enable(self, start_time=None):
+        self.enabled = True
+        if start_time is not None:
+            self.start_time = start_time
+
+    def mark(self, name):
+        if self.enabled:
+            self.marks.append((name, time.perf_counter()))
+
+    def report(self, stream=None):
+        """Print each phase's duration and the total, then disable"""
+        if not self.enabled:
+            return
+        stream = stream or sys.stderr
+        previous = self.start_time
+        print("Startup profile:", file=stream)
+        for name, timestamp in self.marks:
+            print(f"  {name:<20} {(timestamp - previous) * 1000:8.1f} ms", file=stream)
+            previous = timestamp
+        print(f"  {'total':<20} {(previous - self.start_time) * 1000:8.1f} ms", file=stream, flush=True)
+        self.enabled = False
+
+
+startup_profiler = StartupProfiler()
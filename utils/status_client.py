@@ -0,0 +1,124 @@
+# Thin-client connection to a status server
+
+import json
+import sys
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtNetwork import QTcpSocket, QLocalSocket, QAbstractSocket
+
+# Delay before trying again after the server went away
+RECONNECT_MS = 2000
+
+
+def parse_address(address):
+    """Split 'host:port', ':port', 'port' or 'unix:/path' into (host, port) or a socket path"""
+    if address.startswith('unix:'):
+        return address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    return (host or '127.0.0.1', int(port))
+
+
+def parse_status(line):
+    """Return the status message in a line from the server, or None if it is malformed"""
+    try:
+        status = json.loads(line)
+        if all(isinstance(entry['key'], str) for entry in status['schedules']):
+            return status
+    except (ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+class StatusClient(QObject):
+    """Receives statuses pushed by a StatusServer.
+
+    Stands in for the ScheduleManager of a thin-client ScheduleWindow: it
+    offers the read-only calls the display makes (schedules,
+    schedule_label, get_current_event, active_schedule, next_boundary,
+    next_bell),
+    answered from the last pushed status, so the window renders pushed
+    updates without reading or evaluating any schedules itself.
+    status_changed is emitted for every new status and when the
+    connection is lost; the client reconnects on its own.
+    """
+    status_changed = pyqtSignal()
+
+    def __init__(self, address, parent=None):
+        super().__init__(parent)
+        self.address = parse_address(address)
+        self.status = {}
+        self.schedules = {}
+        self.organization = None
+        self.organizations = []
+        self._statuses = {}
+        self._next_bells = {}
+        self._buffer = b''
+
+        self.socket = QLocalSocket(self) if isinstance(self.address, str) else QTcpSocket(self)
+        self.socket.errorOccurred.connect(self._on_disconnected)
+        self.socket.readyRead.connect(self._on_ready_read)
+        self.socket.disconnected.connect(self._on_disconnected)
+
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.setInterval(RECONNECT_MS)
+        self.reconnect_timer.timeout.connect(self.connect_to_server)
+        self.connect_to_server()
+
+    @property
+    def connected(self):
+        if isinstance(self.socket, QLocalSocket):
+            return self.socket.state() == QLocalSocket.LocalSocketState.ConnectedState
+        return self.socket.state() == QAbstractSocket.SocketState.ConnectedState
+
+    def connect_to_server(self):
+        self._buffer = b''
+        if isinstance(self.address, str):
+            self.socket.connectToServer(self.address)
+        else:
+            self.socket.connectToHost(*self.address)
+
+    def _on_ready_read(self):
+        self._buffer += bytes(self.socket.readAll())
+        *lines, self._buffer = self._buffer.split(b'\n')
+        # Only the newest status matters
+        for line in reversed(lines):
+            status = parse_status(line)
+            if status is not None:
+                self.apply_status(status)
+                break
+            print(f"Ignoring malformed status from the server: {line[:80]!r}", file=sys.stderr)
+
+    def _on_disconnected(self, *args):
+        self.socket.abort()
+        if not self.reconnect_timer.isActive():
+            self.reconnect_timer.start()
+        self.status_changed.emit()
+
+    def apply_status(self, status):
+        """Take over a status message from the server"""
+        self.status = status
+        self.organization = status.get('organization')
+        self.organizations = [self.organization]
+        self.schedules = {entry['key']: {'name': entry.get('name'), 'label': entry.get('label')}
+                          for entry in status.get('schedules', [])}
+        self._statuses = {entry['key']: entry.get('status', '')
+                          for entry in status.get('schedules', [])}
+        self._next_bells = {entry['key']: entry.get('next_bell')
+                            for entry in status.get('schedules', [])}
+        self.status_changed.emit()
+
+    def schedule_label(self, schedule_key):
+        schedule = self.schedules[schedule_key]
+        return schedule.get('label') or schedule.get('name') or schedule_key
+
+    def get_current_event(self, schedule_type, current_time=None):
+        return self._statuses.get(schedule_type, "")
+
+    def active_schedule(self, day=None):
+        return self.status.get('active')
+
+    def next_boundary(self, minute):
+        return None  # The server pushes every change
+
+    def next_bell(self, schedule_key, minute):
+        return self._next_bells.get(schedule_key)
@@ -0,0 +1,226 @@
+# Headless status server: evaluates the schedules once and pushes changes to displays
+
+import asyncio
+import json
+import os
+import sys
+from constants import STATUS_PORT, STATUS_HTTP_PORT
+from core.schedule_manager import ScheduleManager, next_deadline
+
+# How often the schedule and calendar files are checked for changes
+FILE_CHECK_SECONDS = 2.0
+# Longest wait between clock reads; bounds how late a wall-clock jump is noticed
+MAX_WAIT_SECONDS = 60.0
+# Idle clients are checked for disconnects, and SSE clients sent a comment
+# line so proxies keep the stream open, this often
+KEEPALIVE_SECONDS = 15.0
+
+
+def build_status(schedule_manager, now=None):
+    """Return the status message sent to displays: every schedule's current status"""
+    now = now or schedule_manager.clock.now()
+    current_time = now.strftime("%H:%M")
+    minute = now.hour * 60 + now.minute
+    return {
+        'organization': schedule_manager.organization,
+        'date': now.date().isoformat(),
+        'active': schedule_manager.active_schedule(now.date()),
+        'schedules': [
+            {'key': key,
+             'name': schedule.name or key,
+             'label': schedule_manager.schedule_label(key),
+             'status': schedule_manager.get_current_event(key, current_time),
+             'next_bell': schedule_manager.next_bell(key, minute)}
+            for key, schedule in schedule_manager.schedules.items()
+        ],
+    }
+
+
+class StatusServer:
+    """Pushes schedule status changes to any number of displays.
+
+    The schedules are evaluated in one place, at each schedule boundary,
+    and a new status is published only when it differs from the last one.
+    Displays can connect over TCP or a Unix socket, where every status is
+    one line of JSON, or over HTTP: GET /status returns the current status
+    and GET /events is a Server-Sent Events stream. Each client is sent the
+    latest status when it connects and after every change; a slow client
+    only delays itself and skips straight to the newest status.
+    """
+
+    def __init__(self, schedule_manager, host='127.0.0.1', port=STATUS_PORT,
+                 http_port=STATUS_HTTP_PORT, unix_path=None):
+        self.schedule_manager = schedule_manager
+        self.host = host
+        self.port = port
+        self.http_port = http_port
+        self.unix_path = unix_path
+        self.status = None
+        self.version = 0
+        self.servers = []
+        self._changed = None
+        self._reloaded = None
+
+    def refresh(self, now=None):
+        """Re-evaluate the schedules; returns True if a new status was published"""
+        status = build_status(self.schedule_manager, now)
+        if status == self.status:
+            return False
+        self.status = status
+        self.version += 1
+        if self._changed is not None:
+            asyncio.ensure_future(self._notify())
+        return True
+
+    async def _notify(self):
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def _wait_for_change(self, seen_version, timeout=None):
+        async with self._changed:
+            await asyncio.wait_for(
+                self._changed.wait_for(lambda: self.version > seen_version), timeout)
+
+    def _prepare_reload_if_changed(self):
+        """Return the reloaded schedules if the files changed, else None"""
+        manager = self.schedule_manager
+        if (manager.file_signature() not in (None, manager.loaded_signature)
+                or manager.calendar_signature() != manager.loaded_calendar_signature):
+            try:
+                return manager.prepare_reload()
+            except Exception as e:
+                print(f"Failed to reload schedules: {e}", file=sys.stderr)
+        return None
+
+    async def _watch_files(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(FILE_CHECK_SECONDS)
+            # Parse off the event loop, swap in on it, between evaluations
+            staging = await loop.run_in_executor(None, self._prepare_reload_if_changed)
+            if staging is not None:
+                self.schedule_manager.adopt(staging)
+                self._reloaded.set()
+
+    async def _evaluate(self):
+        clock = self.schedule_manager.clock
+        while True:
+            self._reloaded.clear()
+            evaluated = clock.now()
+            self.refresh(evaluated)
+            deadline = next_deadline(self.schedule_manager, evaluated)
+            # Sleep until the boundary or a reload; the clock is re-read now
+            # and then in case the wall clock jumps
+            now = evaluated
+            while evaluated <= now < deadline and not self._reloaded.is_set():
+                timeout = clock.real_seconds((deadline - now).total_seconds())
+                timeout = MAX_WAIT_SECONDS if timeout is None else min(timeout, MAX_WAIT_SECONDS)
+                try:
+                    await asyncio.wait_for(self._reloaded.wait(), max(0.0, timeout))
+                except asyncio.TimeoutError:
+                    pass
+                now = clock.now()
+
+    async def _send_lines(self, reader, writer):
+        sent = 0
+        try:
+            while not reader.at_eof():
+                try:
+                    await self._wait_for_change(sent, KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    continue
+                sent = self.version
+                writer.write(json.dumps(self.status).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_http(self, reader, writer):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()).strip():
+                pass  # Headers are not needed
+            parts = request_line.decode('latin-1').split()
+            method, path = (parts[0], parts[1].split('?')[0]) if len(parts) >= 2 else ('', '')
+
+            if method == 'GET' and path == '/status':
+                if self.status is None:
+                    await self._wait_for_change(0)
+                body = json.dumps(self.status).encode('utf-8')
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Access-Control-Allow-Origin: *\r\nConnection: close\r\n"
+                             + f"Content-Length: {len(body)}\r\n\r\n".encode('ascii') + body)
+            elif method == 'GET' and path == '/events':
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                             b"Cache-Control: no-cache\r\nAccess-Control-Allow-Origin: *\r\n"
+                             b"Connection: keep-alive\r\n\r\n")
+                sent = 0
+                while not reader.at_eof():
+                    try:
+                        await self._wait_for_change(sent, KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        writer.write(b": keep-alive\n\n")
+                    else:
+                        sent = self.version
+                        writer.write(b"data: " + json.dumps(self.status).encode('utf-8') + b"\n\n")
+                    await writer.drain()
+            else:
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        """Start listening and evaluating; returns once the sockets are open"""
+        self._changed = asyncio.Condition()
+        self._reloaded = asyncio.Event()
+        if self.port is not None:
+            self.servers.append(await asyncio.start_server(self._send_lines, self.host, self.port))
+        if self.unix_path:
+            if os.path.exists(self.unix_path):
+                os.remove(self.unix_path)  # Left over from an earlier run
+            self.servers.append(await asyncio.start_unix_server(self._send_lines, self.unix_path))
+        if self.http_port is not None:
+            self.servers.append(await asyncio.start_server(self._serve_http, self.host, self.http_port))
+        self._evaluator = asyncio.ensure_future(self._evaluate())
+        self._watcher = asyncio.ensure_future(self._watch_files())
+
+    def addresses(self):
+        """Return the (host, port) or socket path each server listens on"""
+        return [server.sockets[0].getsockname() for server in self.servers]
+
+    async def stop(self):
+        self._evaluator.cancel()
+        self._watcher.cancel()
+        for server in self.servers:
+            server.close()
+        self.servers = []
+
+    async def serve_forever(self):
+        await self.start()
+        for address in self.addresses():
+            print(f"Serving schedule status on {address}", flush=True)
+        await self._evaluator
+
+
+def run_server(schedule_file=None, organization=None, host='127.0.0.1', port=STATUS_PORT,
+               http_port=STATUS_HTTP_PORT, unix_path=None):
+    """Run the status server until interrupted; returns the process exit code"""
+    try:
+        manager = ScheduleManager(schedule_file, organization=organization)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    server = StatusServer(manager, host, port, http_port, unix_path)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
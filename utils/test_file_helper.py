@@ -1,4 +1,5 @@
 import os
+from datetime import datetime
 from constants import TEST_FILES_DIR
 
 class TestFileHelper:
@@ -9,4 +10,20 @@ class TestFileHelper:
     @staticmethod
     def get_available_test_files():
         """Returns a list of available test files"""
-        return [f for f in os.listdir(TEST_FILES_DIR) if f.endswith('_time_test.txt')] 
\ No newline at end of file
+        return [f for f in os.listdir(TEST_FILES_DIR) if f.endswith('_time_test.txt')]
+
+    @staticmethod
+    def read_test_times(file_path):
+        """Read a test file and return its valid 'HH:MM' times in order"""
+        times = []
+        with open(file_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    datetime.strptime(line, "%H:%M")  # Validate time format
+                except ValueError:
+                    continue
+                times.append(line)
+        return times
@@ -2,9 +2,13 @@
 
 from PyQt6.QtWidgets import QLabel, QWidget, QVBoxLayout, QHBoxLayout
 from PyQt6.QtCore import Qt
+from utils.countdown_label import CountdownLabel
 
 def create_event_display(label_text, name):
-    """Create a labeled event display"""
+    """Create a labeled event display
+
+    Returns (container, type_label, event_label, countdown).
+    """
     container = QWidget()
     layout = QVBoxLayout(container)  # Change to VBoxLayout for vertical arrangement
     layout.setSpacing(1)
@@ -15,13 +19,22 @@ def create_event_display(label_text, name):
     type_label.setMinimumWidth(80)
     type_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
     
+    # Time left to the next bell, beside the schedule type
+    countdown = CountdownLabel()
+    header = QHBoxLayout()
+    header.setSpacing(4)
+    header.setContentsMargins(0, 0, 0, 0)
+    header.addWidget(type_label, 1)
+    header.addWidget(countdown)
+    
     # Create event display
     event_label = QLabel()
-    event_label.setObjectName(name)  # Set object name for styling
+    event_label.setObjectName(name)
+    event_label.setProperty("eventDisplay", True)  # Matched by the event display style
     event_label.setMinimumHeight(30)
     event_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
     
-    layout.addWidget(type_label)
+    layout.addLayout(header)
     layout.addWidget(event_label)
     
-    return container, event_label 
\ No newline at end of file
+    return container, type_label, event_label, countdown 
\ No newline at end of file
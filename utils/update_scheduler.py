@@ -0,0 +1,89 @@
+# Boundary-driven refresh timer for the schedule display
+
+import math
+import time
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+from core.clock import system_clock
+from core.instrumentation import instrumentation
+from core.schedule_manager import next_deadline
+
+# Longest single sleep; bounds how late a wall-clock jump or resume is noticed
+MAX_SLEEP_MS = 5 * 60 * 1000
+# Wall-clock vs monotonic disagreement treated as a clock jump or suspend
+CLOCK_JUMP_TOLERANCE = 2.0
+
+
+class UpdateScheduler(QObject):
+    """Arms one single-shot timer for the next schedule start/end.
+
+    Instead of polling every minute, the scheduler asks the ScheduleManager
+    for the next minute at which any loaded schedule changes and sleeps until
+    exactly then. boundary_reached is emitted at each transition and whenever
+    the wall clock is found to have jumped (clock change, suspend/resume);
+    the receiver refreshes the display and calls arm() again.
+
+    Time comes from clock (see core.clock). With a SimulatedClock the sleep
+    is scaled to the clock's rate, a paused clock is not waited on at all,
+    and a stepping clock is moved straight to each boundary when the timer
+    fires.
+    """
+    boundary_reached = pyqtSignal()
+
+    def __init__(self, schedule_manager, parent=None, clock=None):
+        super().__init__(parent)
+        self.schedule_manager = schedule_manager
+        self.clock = clock or system_clock
+        self.deadline = None
+        self._armed_wall = None
+        self._armed_monotonic = None
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._on_timeout)
+
+    def next_deadline(self, now):
+        """Return the datetime of the next schedule boundary after now"""
+        return next_deadline(self.schedule_manager, now)
+
+    def arm(self, now=None):
+        """(Re)start the timer for the next boundary"""
+        now = now or self.clock.now()
+        self.deadline = self.next_deadline(now)
+        self._arm_for(now)
+
+    def stop(self):
+        self.timer.stop()
+        self.deadline = None
+
+    def _arm_for(self, now):
+        delay = self.clock.real_seconds((self.deadline - now).total_seconds())
+        if delay is None:
+            self.timer.stop()  # Paused simulation: nothing happens until it resumes
+            return
+        # Round up so a fast clock is never woken just short of the boundary
+        delay_ms = math.ceil(delay * 1000)
+        self._armed_wall = now
+        self._armed_monotonic = time.monotonic()
+        self.timer.start(max(0, min(delay_ms, MAX_SLEEP_MS)))
+
+    def _clock_jumped(self, now):
+        if self.clock.simulated:
+            return False  # Simulated time is only moved by test mode, which re-arms
+        wall_elapsed = (now - self._armed_wall).total_seconds()
+        monotonic_elapsed = time.monotonic() - self._armed_monotonic
+        return abs(wall_elapsed - monotonic_elapsed) > CLOCK_JUMP_TOLERANCE
+
+    def _on_timeout(self):
+        self.clock.advance_to(self.deadline)
+        now = self.clock.now()
+        if self._clock_jumped(now):
+            self.boundary_reached.emit()
+        elif now >= self.deadline:
+            if not self.clock.simulated:
+                # How late the timer fired
+                instrumentation.record('timer.drift', (now - self.deadline).total_seconds())
+            self.boundary_reached.emit()
+        else:
+            # Woke early (capped sleep or timer slack): keep waiting
+            self._arm_for(now)
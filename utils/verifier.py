@@ -0,0 +1,56 @@
+# Headless verification of test time files against the loaded schedules
+
+import difflib
+import sqlite3
+import sys
+from core.schedule_manager import ScheduleManager
+from utils.test_file_helper import TestFileHelper
+
+
+def format_status_table(schedule_names, times, rows):
+    """Return tab-separated table lines: a header, then one line per time"""
+    lines = ["\t".join(["Time"] + list(schedule_names))]
+    for time_str, row in zip(times, rows):
+        lines.append("\t".join([time_str] + list(row)))
+    return lines
+
+
+def run_verification(times_file, expected_file=None, schedule_file=None, output=None,
+                     organization=None):
+    """Evaluate every time in times_file against every schedule
+
+    Prints the status table, or a diff against expected_file if given.
+    Returns the process exit code: 0 on success, 1 on a mismatch or error.
+    """
+    output = output or sys.stdout
+    try:
+        times = TestFileHelper.read_test_times(times_file)
+        manager = ScheduleManager(schedule_file, organization=organization)
+    except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    schedule_keys = list(manager.schedules)
+    schedule_names = [manager.schedules[key].name or key for key in schedule_keys]
+    rows = manager.evaluate_many(schedule_keys, times)
+    actual = format_status_table(schedule_names, times, rows)
+
+    if expected_file is None:
+        for line in actual:
+            print(line, file=output)
+        return 0
+
+    try:
+        with open(expected_file, 'r', encoding='utf-8') as f:
+            expected = [line.rstrip("\r\n") for line in f if line.strip()]
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    diff = list(difflib.unified_diff(expected, actual, expected_file, 'actual', lineterm=''))
+    if diff:
+        for line in diff:
+            print(line, file=output)
+        return 1
+    print(f"OK: {len(times)} times x {len(schedule_keys)} schedules match", file=output)
+    return 0
@@ -2,42 +2,76 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QSystemTrayIcon, 
                             QMenu, QPushButton, QHBoxLayout, QSizePolicy,
                             QInputDialog, QLineEdit, QMessageBox, QTimeEdit,
-                            QDialog, QSpinBox, QFileDialog, QWIDGETSIZE_MAX)
-from PyQt6.QtCore import QTimer, Qt, QTime
-from PyQt6.QtGui import QIcon, QAction
+                            QDialog, QDoubleSpinBox, QFileDialog, QScrollArea, QWIDGETSIZE_MAX,
+                            QDateEdit, QComboBox)
+from PyQt6.QtCore import QTimer, Qt, QTime, QDate, QEvent, QObject
+from PyQt6.QtGui import QIcon, QAction, QActionGroup
 from windows.base_window import BaseWindow
-from dialogs.color_settings import ColorSettingsDialog
-from dialogs.schedule_editor import ScheduleEditorDialog
-from utils.schedule_manager import ScheduleManager
+from core.clock import system_clock, SimulatedClock
+from core.schedule_manager import ScheduleManager
+from core.schedule_records import schedules_to_json
 from utils.settings_manager import SettingsManager
 from utils.test_file_helper import TestFileHelper
+from utils.update_scheduler import UpdateScheduler
+from utils.render_cache import RenderCache
+from utils.schedule_watcher import ScheduleWatcher
+from utils.schedule_writer import ScheduleWriter
 from utils.ui_helper import create_event_display
+from utils.startup_profiler import startup_profiler
+from core.instrumentation import instrumentation, hot_path, DUMP_INTERVAL_SECONDS
 from constants import (ICON_PATH, DEFAULT_WINDOW_SIZE, DEFAULT_TEST_SIZE, 
                     COMMON_STYLES, TEST_FILES_DIR, ASSETS_DIR, WINDOW_SIZES, APP_NAME,
-                    REGULAR_SCHEDULE, DELAY_SCHEDULE, HOMEROOM_SCHEDULE)
-from datetime import datetime
+                    METRICS_FILE, PROFILES_DIR, SIMULATION_SPEEDS)
+from datetime import datetime, timedelta
 from PyQt6.QtWidgets import QApplication
 from pathlib import Path
 import os
-from dialogs.window_size_dialog import WindowSizeDialog
-from dialogs.about_dialog import AboutDialog
-from dialogs.message_settings import MessageSettingsDialog
+
+# Fallback for deferred setup if the window is never painted (e.g. hidden)
+DEFERRED_SETUP_FALLBACK_MS = 1000
 
 class ScheduleWindow(BaseWindow):
-    def __init__(self, schedule_file, enable_test_mode=False):
+    def __init__(self, schedule_file, enable_test_mode=False, status_address=None):
         super().__init__()
         self.setWindowTitle(APP_NAME)
         self.setWindowFlags(Qt.WindowType.WindowStaysOnTopHint)
         
+        # Where the time comes from; test mode swaps in a SimulatedClock
+        self.clock = system_clock
+        
         # Initialize managers
         self.settings_manager = SettingsManager()
-        self.schedule_manager = ScheduleManager(schedule_file)
+        startup_profiler.mark("settings")
+        # A thin client only renders statuses pushed by a status server
+        self.thin_client = status_address is not None
+        if self.thin_client:
+            from utils.status_client import StatusClient
+            self.schedule_manager = StatusClient(status_address, self)
+            self.schedule_manager.status_changed.connect(self.status_pushed)
+        else:
+            self.schedule_manager = ScheduleManager(schedule_file, settings=self.settings_manager)
+        startup_profiler.mark("schedule parse")
+        
+        # Last rendered text per label/title/tooltip
+        self.render_cache = RenderCache()
+        # Shown in Debug > Show Metrics and the metrics file
+        instrumentation.add_counters('render', self.render_cache.stats,
+                                     self.render_cache.reset_stats)
         
         # Test mode initialization
-        self.test_mode = False
-        self.test_time = datetime.now()
         self.test_container = None
         
+        # Non-critical pieces are created after the first frame
+        self.tray_icon = None
+        self.schedule_watcher = None
+        # Set while the schedule files on disk could not be reloaded
+        self.reload_error = None
+        self.reported_reload_failure = None
+        self.alarm_dispatcher = None
+        self.alarm_sinks = []
+        self.enable_test_mode = enable_test_mode
+        self.deferred_setup_done = False
+        
         # Create menu bar
         self.create_menu_bar()
         
@@ -49,85 +83,153 @@ class ScheduleWindow(BaseWindow):
         # Set up UI
         self.setup_ui()
         
-        # Set up system tray
-        self.setup_system_tray()
-        
         # Set up timer
         self.setup_timer()
         
+        # Save schedules in the background
+        self.schedule_writer = ScheduleWriter(self.schedule_manager, self)
+        self.schedule_writer.save_failed.connect(
+            lambda message: QMessageBox.critical(self, "Error", message))
+        
         # Restore window position
         self.restore_window_position()
+        startup_profiler.mark("window setup")
+        QTimer.singleShot(DEFERRED_SETUP_FALLBACK_MS, self.deferred_setup)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.deferred_setup_done:
+            startup_profiler.mark("first render")
+            QTimer.singleShot(0, self.deferred_setup)
+
+    def deferred_setup(self):
+        """Create the tray icon, file watcher and test controls after the first frame"""
+        if self.deferred_setup_done:
+            return
+        self.deferred_setup_done = True
+        
+        # Set up system tray
+        self.setup_system_tray()
+        
+        # Reload the schedule file when it changes on disk
+        if not self.thin_client:
+            self.schedule_watcher = ScheduleWatcher(self.schedule_manager, self)
+            self.schedule_watcher.schedules_reloaded.connect(self.schedules_reloaded)
+            self.schedule_watcher.reload_failed.connect(self.reload_failed)
+            self.setup_alarms()
         
         # If test mode is enabled, set up test controls
-        if enable_test_mode:
+        if self.enable_test_mode and not self.thin_client:
             self.setup_test_controls()
+        
+        startup_profiler.mark("deferred setup")
+        startup_profiler.report()
             
     def setup_ui(self):
         schedule_container = QWidget()
-        schedule_layout = QVBoxLayout(schedule_container)
-        schedule_layout.setSpacing(1)
-        schedule_layout.setContentsMargins(1, 1, 1, 1)
+        schedule_container.setObjectName("schedule_container")
+        self.schedule_layout = QVBoxLayout(schedule_container)
+        self.schedule_layout.setSpacing(1)
+        self.schedule_layout.setContentsMargins(1, 1, 1, 1)
         
-        # Create displays using helper function
-        regular_container, self.regular_label = create_event_display("Regular", "regular_label")
-        delay_container, self.delay_label = create_event_display("2-Hr Delay", "delay_label")
-        homeroom_container, self.homeroom_label = create_event_display("Homeroom", "homeroom_label")
+        # One display per schedule, keyed by schedule key
+        self.schedule_displays = {}
+        self.rebuild_schedule_displays()
         
-        schedule_layout.addWidget(regular_container)
-        schedule_layout.addWidget(delay_container)
-        schedule_layout.addWidget(homeroom_container)
+        # Scroll when there are more schedules than fit in the window
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setFrameShape(QScrollArea.Shape.NoFrame)
+        scroll_area.setWidget(schedule_container)
         
-        self.main_layout.addWidget(schedule_container)
+        self.main_layout.addWidget(scroll_area)
         
         # Set window properties
         self.setMinimumWidth(300)
         self.setMinimumHeight(200)
-        self.resize(DEFAULT_WINDOW_SIZE)
+        self.resize(*DEFAULT_WINDOW_SIZE)
         
         # Set window size from settings
         size_name = self.settings_manager.get_window_size_name()
-        self.resize(WINDOW_SIZES[size_name])
+        self.resize(*WINDOW_SIZES[size_name])
         
         # Apply styles
         self.apply_styles()
 
+    def rebuild_schedule_displays(self):
+        """Create displays for new schedules and remove those no longer loaded"""
+        schedules = self.schedule_manager.schedules
+        for key in list(self.schedule_displays):
+            if key not in schedules:
+                container, _, _, _ = self.schedule_displays.pop(key)
+                self.schedule_layout.removeWidget(container)
+                container.deleteLater()
+                self.render_cache.invalidate(('event', key))
+        
+        for position, key in enumerate(schedules):
+            label_text = self.schedule_manager.schedule_label(key)
+            if key not in self.schedule_displays:
+                self.schedule_displays[key] = create_event_display(label_text, f"{key}_label")
+            container, type_label, _, _ = self.schedule_displays[key]
+            type_label.setText(label_text)
+            self.render_cache.invalidate(('label', key))
+            # Keep display order in step with the schedule file
+            self.schedule_layout.insertWidget(position, container)
+
     def create_menu_bar(self):
         menubar = self.menuBar()
         tools_menu = menubar.addMenu('Tools')
         
         # Add menu items in alphabetical order (except Exit which goes last):
-        # 1. Change Admin Password
+        # 1. Alarm Settings
+        alarm_settings_action = QAction('Alarm Settings', self)
+        alarm_settings_action.triggered.connect(self.show_alarm_settings)
+        tools_menu.addAction(alarm_settings_action)
+        
+        # 2. Change Admin Password
         change_password_action = QAction('Change Admin Password', self)
         change_password_action.triggered.connect(self.change_password)
         tools_menu.addAction(change_password_action)
         
-        # 2. Change Tray Icon
+        # 3. Change Tray Icon
         change_icon_action = QAction('Change Tray Icon', self)
         change_icon_action.triggered.connect(self.change_tray_icon)
         tools_menu.addAction(change_icon_action)
         
-        # 3. Color Settings
+        # 4. Color Settings
         color_settings_action = QAction('Color Settings', self)
         color_settings_action.triggered.connect(self.show_color_settings)
         tools_menu.addAction(color_settings_action)
         
-        # 4. Enable Test Mode
+        # 5. Enable Test Mode
         self.test_mode_action = QAction('Enable Test Mode', self)
         self.test_mode_action.setCheckable(True)
         self.test_mode_action.triggered.connect(self.toggle_test_mode)
         tools_menu.addAction(self.test_mode_action)
         
-        # 5. Message Settings (moved here for alphabetical order)
+        # 6. Message Settings (moved here for alphabetical order)
         message_settings_action = QAction('Message Settings', self)
         message_settings_action.triggered.connect(self.show_message_settings)
         tools_menu.addAction(message_settings_action)
         
-        # 6. Schedule Editor
+        # 7. Organization
+        self.organization_menu = tools_menu.addMenu('Organization')
+        self.organization_group = QActionGroup(self)
+        self.organization_group.setExclusive(True)
+        self.organization_menu.aboutToShow.connect(self.populate_organization_menu)
+        
+        # 8. Schedule Editor
         edit_schedules_action = QAction('Schedule Editor', self)
         edit_schedules_action.triggered.connect(self.show_schedule_editor)
         tools_menu.addAction(edit_schedules_action)
         
-        # 7. Window Size
+        # Schedules, messages and the clock belong to the server in a thin client
+        if self.thin_client:
+            for action in (alarm_settings_action, self.test_mode_action, message_settings_action,
+                           self.organization_menu.menuAction(), edit_schedules_action):
+                action.setVisible(False)
+        
+        # 8. Window Size
         window_size_action = QAction('Window Size', self)
         window_size_action.triggered.connect(self.change_window_size)
         tools_menu.addAction(window_size_action)
@@ -137,6 +239,31 @@ class ScheduleWindow(BaseWindow):
         exit_action.triggered.connect(self.quit_application)
         tools_menu.addAction(exit_action)
         
+        # Add Debug menu
+        debug_menu = menubar.addMenu('Debug')
+        
+        self.instrumentation_action = QAction('Enable Instrumentation', self)
+        self.instrumentation_action.setCheckable(True)
+        self.instrumentation_action.triggered.connect(self.toggle_instrumentation)
+        debug_menu.addAction(self.instrumentation_action)
+        
+        show_metrics_action = QAction('Show Metrics', self)
+        show_metrics_action.triggered.connect(self.show_metrics)
+        debug_menu.addAction(show_metrics_action)
+        
+        self.profile_action = QAction('Capture Profile', self)
+        self.profile_action.setCheckable(True)
+        self.profile_action.triggered.connect(self.toggle_profile_capture)
+        debug_menu.addAction(self.profile_action)
+        
+        # Already on when started with --instrument
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.setInterval(DUMP_INTERVAL_SECONDS * 1000)
+        self.metrics_timer.timeout.connect(self.dump_metrics)
+        if instrumentation.enabled:
+            self.instrumentation_action.setChecked(True)
+            self.metrics_timer.start()
+        
         # Add Help menu
         help_menu = menubar.addMenu('Help')
         
@@ -157,36 +284,181 @@ class ScheduleWindow(BaseWindow):
         self.tray_icon.setIcon(icon)
         self.tray_icon.show()
         self.tray_icon.activated.connect(self.tray_icon_activated)
+        
+        # Fill in the tooltip skipped while there was no tray icon
+        self.render_cache.invalidate('tooltip')
+        self.update_events()
 
     def setup_timer(self):
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_events)
-        self.timer.start(60000)  # Update every minute
+        # Wake only at schedule boundaries instead of polling every minute
+        self.update_scheduler = UpdateScheduler(self.schedule_manager, self, self.clock)
+        # Looked up on each call so instrumentation can wrap update_events
+        self.update_scheduler.boundary_reached.connect(lambda: self.update_events())
+        
+        # Ticks the countdowns once a second while the window is on screen
+        self.countdown_timer = QTimer(self)
+        self.countdown_timer.setSingleShot(True)
+        self.countdown_timer.timeout.connect(lambda: self.tick_countdowns())
+        
+        # Moves the clock in the title and tooltip on at each full minute
+        self.clock_timer = QTimer(self)
+        self.clock_timer.setSingleShot(True)
+        self.clock_timer.timeout.connect(lambda: self.update_clock_text())
+        self.status_lines = []
         self.update_events()  # Initial update
 
+    @hot_path('window.update_events')
     def update_events(self):
         """Update all event displays"""
-        current_time = self.get_current_time()
-        regular = self.schedule_manager.get_current_event(REGULAR_SCHEDULE, current_time)
-        delay = self.schedule_manager.get_current_event(DELAY_SCHEDULE, current_time)
-        homeroom = self.schedule_manager.get_current_event(HOMEROOM_SCHEDULE, current_time)
-        
-        time_status = "TEST MODE" if self.test_mode else "LIVE"
-        
-        self.regular_label.setText(regular)
-        self.delay_label.setText(delay)
-        self.homeroom_label.setText(homeroom)
-        
-        self.setWindowTitle(f"{APP_NAME} - {current_time} ({time_status})")
-        
-        tooltip = f"Current Time: {current_time} ({time_status})\nRegular: {regular}\n2-Hour Delay: {delay}\nHomeroom: {homeroom}"
-        self.tray_icon.setToolTip(tooltip)
+        now = self.clock.now()
+        current_time = now.strftime("%H:%M")
+        
+        # Mark the schedule the school calendar assigns to today, if any
+        active_key = self.schedule_manager.active_schedule(now.date())
+        
+        # Countdowns run to each schedule's next bell, looked up only here
+        minute = now.hour * 60 + now.minute
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        
+        status_lines = []
+        for key, (_, type_label, event_label, countdown) in self.schedule_displays.items():
+            label_text = self.schedule_manager.schedule_label(key)
+            if key == active_key:
+                label_text += " (Today)"
+            self.render_cache.apply(('label', key), label_text, type_label.setText)
+            status = self.schedule_manager.get_current_event(key, current_time)
+            self.render_cache.apply(('event', key), status, event_label.setText)
+            status_lines.append(f"{label_text}: {status}")
+            bell = self.schedule_manager.next_bell(key, minute)
+            countdown.set_deadline(None if bell is None else midnight + timedelta(minutes=bell), now)
+        
+        self.status_lines = status_lines
+        self.update_clock_text(now)
+        
+        # Sleep until the next start/end across all schedules
+        self.update_scheduler.arm()
+        self.update_countdown_timer()
+
+    def update_clock_text(self, now=None):
+        """Show the time in the title and tooltip, then wait for the next minute
+
+        Only the clock text is rebuilt here, from the statuses of the last
+        boundary, so the per-minute wakeup does no lookups.
+        """
+        now = now or self.clock.now()
+        if self.clock.simulated:
+            time_status = "TEST MODE"
+            current_time = f"{now:%a %H:%M}"
+        elif self.thin_client and not self.schedule_manager.connected:
+            time_status = "DISCONNECTED"
+            current_time = f"{now:%H:%M}"
+        else:
+            time_status = "LIVE"
+            current_time = f"{now:%H:%M}"
+        if self.reload_error is not None:
+            time_status += ", RELOAD FAILED"
+        title = f"{APP_NAME} - {current_time} ({time_status})"
+        tooltip = f"Current Time: {current_time} ({time_status})\n" + "\n".join(self.status_lines)
+        
+        # Only touch widgets whose text actually changed
+        self.render_cache.apply('title', title, self.setWindowTitle)
+        if self.tray_icon is not None:
+            self.render_cache.apply('tooltip', tooltip, self.tray_icon.setToolTip)
+        
+        # A simulated clock's time only moves on at boundaries
+        if self.clock.simulated:
+            self.clock_timer.stop()
+        else:
+            self.clock_timer.start(60000 - (now.second * 1000 + now.microsecond // 1000))
+
+    @hot_path('window.tick_countdowns')
+    def tick_countdowns(self):
+        """Repaint the countdowns whose text changed, then wait for the next second"""
+        now = self.clock.now()
+        for _, _, _, countdown in self.schedule_displays.values():
+            countdown.tick(now)
+        self.update_countdown_timer(now)
+
+    def update_countdown_timer(self, now=None):
+        """Tick on the next full second, or stop while hidden or nothing counts down"""
+        counting = any(countdown.deadline is not None
+                       for _, _, _, countdown in self.schedule_displays.values())
+        if not (counting and self.isVisible() and not self.isMinimized()):
+            self.countdown_timer.stop()
+            return
+        if self.clock.simulated:
+            delay_ms = 1000  # Simulated seconds do not line up with real ones
+        else:
+            now = now or self.clock.now()
+            delay_ms = 1000 - now.microsecond // 1000
+        self.countdown_timer.start(delay_ms)
 
     def get_current_time(self):
-        if self.test_mode:
-            return self.test_time.strftime("%H:%M")
-        return datetime.now().strftime("%H:%M")
+        return self.clock.now().strftime("%H:%M")
+
+    def set_clock(self, clock):
+        """Read the time from clock from now on (the system clock or a SimulatedClock)"""
+        self.clock = clock
+        if not self.thin_client:
+            self.schedule_manager.clock = clock
+        self.update_scheduler.clock = clock
+        if self.alarm_dispatcher is not None:
+            self.alarm_dispatcher.clock = clock
+            self.reschedule_alarms()
+        self.update_events()
+
+    def setup_alarms(self):
+        """Create the pre-bell alarm dispatcher and start it if alarms are enabled"""
+        from core.alarms import AlarmDispatcher
+        self.alarm_dispatcher = AlarmDispatcher(self.schedule_manager, clock=self.clock)
+        self.apply_alarm_settings()
+
+    def apply_alarm_settings(self):
+        """(Re)configure the alarm offsets and sinks from the settings"""
+        from core.alarms import CommandSink, WebhookSink
+        from utils.alarm_sinks import TraySink, SoundSink
+        alarms = self.settings_manager.get_alarm_settings()
+        for sink in self.alarm_sinks:
+            if isinstance(sink, QObject):
+                sink.deleteLater()
+        
+        sinks = []
+        if alarms['tray'] and self.tray_icon is not None:
+            sinks.append(TraySink(self.tray_icon, self))
+        if alarms['sound']:
+            sinks.append(SoundSink(alarms['sound_file'], self))
+        if alarms['command']:
+            sinks.append(CommandSink(alarms['command']))
+        if alarms['webhook']:
+            sinks.append(WebhookSink(alarms['webhook']))
+        self.alarm_sinks = sinks
+        
+        self.alarm_dispatcher.sinks = sinks
+        self.alarm_dispatcher.offsets = alarms['schedules']
+        if alarms['enabled'] and sinks:
+            if self.alarm_dispatcher.running:
+                self.alarm_dispatcher.reschedule()
+            else:
+                self.alarm_dispatcher.start()
+        else:
+            self.alarm_dispatcher.stop()
+
+    def reschedule_alarms(self):
+        """Recompute today's alarms after the schedules or the time changed"""
+        if self.alarm_dispatcher is not None and self.alarm_dispatcher.running:
+            self.alarm_dispatcher.reschedule()
 
+    def show_alarm_settings(self):
+        # Alarms can run commands and call URLs, so they are admin-only
+        if not self.check_admin_password('Alarm Settings Access',
+                                         'Enter password to access alarm settings:'):
+            return
+        from dialogs.alarm_settings import AlarmSettingsDialog
+        dialog = AlarmSettingsDialog(self.settings_manager, self.schedule_manager, self)
+        if dialog.exec() == QDialog.DialogCode.Accepted and self.alarm_dispatcher is not None:
+            self.apply_alarm_settings()
+
+    @hot_path('window.apply_styles')
     def apply_styles(self):
         # Apply styles to the window and widgets
         colors = self.settings_manager.get_colors()
@@ -203,6 +475,10 @@ class ScheduleWindow(BaseWindow):
             time_control = QHBoxLayout()
             time_control.setSpacing(2)
             
+            self.date_edit = QDateEdit(QDate.currentDate())
+            self.date_edit.setDisplayFormat("ddd yyyy-MM-dd")
+            self.date_edit.setMinimumHeight(20)
+            
             self.time_edit = QTimeEdit()
             self.time_edit.setDisplayFormat("HH:mm")  # Use 24-hour format
             self.time_edit.setMinimumHeight(20)
@@ -219,6 +495,7 @@ class ScheduleWindow(BaseWindow):
             stop_btn.setMinimumWidth(40)
             stop_btn.clicked.connect(self.stop_test)
             
+            time_control.addWidget(self.date_edit)
             time_control.addWidget(self.time_edit)
             time_control.addWidget(set_time_btn)
             time_control.addWidget(stop_btn)  # Add stop button here
@@ -228,14 +505,23 @@ class ScheduleWindow(BaseWindow):
             test_controls = QHBoxLayout()
             test_controls.setSpacing(2)
             
+            # Simulation speed; the delay is also the pause at each transition
+            self.speed_combo = QComboBox()
+            for label, _ in SIMULATION_SPEEDS:
+                self.speed_combo.addItem(label)
+            self.speed_combo.setMinimumHeight(20)
+            self.speed_combo.currentIndexChanged.connect(self.change_simulation_speed)
+            
             # Add delay spinner with label
             delay_label = QLabel("Delay (seconds):")
-            self.delay_spinner = QSpinBox()
-            self.delay_spinner.setMinimum(1)
+            self.delay_spinner = QDoubleSpinBox()
+            self.delay_spinner.setDecimals(1)
+            self.delay_spinner.setMinimum(0.1)  # Fast enough to step through a week
             self.delay_spinner.setMaximum(3600)  # Allow up to 1 hour in seconds
             self.delay_spinner.setValue(1)
             self.delay_spinner.setMinimumHeight(20)
             self.delay_spinner.setMinimumWidth(40)
+            self.delay_spinner.valueChanged.connect(self.change_simulation_speed)
             
             # Add test file load button
             load_file_btn = QPushButton("Load File")
@@ -243,6 +529,7 @@ class ScheduleWindow(BaseWindow):
             load_file_btn.setMinimumWidth(60)
             load_file_btn.clicked.connect(self.load_test_file)
             
+            test_controls.addWidget(self.speed_combo)
             test_controls.addWidget(delay_label)
             test_controls.addWidget(self.delay_spinner)
             test_controls.addWidget(load_file_btn)
@@ -253,12 +540,11 @@ class ScheduleWindow(BaseWindow):
             self.main_layout.addWidget(self.test_container)
             
             # Resize window to accommodate test controls
-            self.resize(DEFAULT_TEST_SIZE)
+            self.resize(*DEFAULT_TEST_SIZE)
             
-            self.test_mode = True
             self.test_timer = None  # For automated testing
+            self.set_clock(SimulatedClock())
             self.set_test_time()
-            self.update_events()
 
     def tray_icon_activated(self, reason):
         if reason in (QSystemTrayIcon.ActivationReason.Trigger, 
@@ -269,30 +555,30 @@ class ScheduleWindow(BaseWindow):
                 self.show()
                 self.activateWindow()
 
-    def show_schedule_editor(self):
-        password, ok = QInputDialog.getText(
-            self, 
-            'Schedule Editor Access',
-            'Enter password to access schedule editor:',
-            QLineEdit.EchoMode.Password
-        )
-        
+    def check_admin_password(self, title, prompt):
+        """Ask for the admin password; return True if it was entered correctly"""
+        password, ok = QInputDialog.getText(self, title, prompt, QLineEdit.EchoMode.Password)
         if not ok:
-            return
-        
+            return False
         if password != self.settings_manager.get_admin_password():
             QMessageBox.warning(self, 'Error', 'Incorrect password')
+            return False
+        return True
+
+    def show_schedule_editor(self):
+        if not self.check_admin_password('Schedule Editor Access',
+                                         'Enter password to access schedule editor:'):
             return
         
-        editor = ScheduleEditorDialog(self.schedule_manager.schedules, self)
+        from dialogs.schedule_editor import ScheduleEditorDialog
+        editor = ScheduleEditorDialog(schedules_to_json(self.schedule_manager.schedules), self)
         if editor.exec() == QDialog.DialogCode.Accepted:
-            try:
-                updated_schedules = editor.get_updated_schedules()
-                self.schedule_manager.schedules = updated_schedules  # Update in memory first
-                self.schedule_manager.save_schedules(updated_schedules)  # Then save to file
-                self.update_events()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save schedules: {str(e)}")
+            updated_schedules = editor.get_updated_schedules()
+            self.schedule_manager.schedules = updated_schedules  # Update in memory first
+            self.schedule_writer.save(updated_schedules)  # Then save to file in the background
+            self.rebuild_schedule_displays()
+            self.update_events()
+            self.reschedule_alarms()
 
     def change_password(self):
         current_pwd, ok = QInputDialog.getText(
@@ -336,17 +622,121 @@ class ScheduleWindow(BaseWindow):
         self.settings_manager.save_admin_password(new_pwd)
         QMessageBox.information(self, 'Success', 'Password changed successfully')
 
+    def status_pushed(self):
+        """Render a status pushed by the status server (thin client mode)"""
+        if hasattr(self, 'update_scheduler'):
+            # Most pushes only change statuses; keep the widgets unless the schedules changed
+            manager = self.schedule_manager
+            if list(self.schedule_displays) != list(manager.schedules) or any(
+                    type_label.text() != manager.schedule_label(key)
+                    for key, (_, type_label, _, _) in self.schedule_displays.items()):
+                self.rebuild_schedule_displays()
+            self.update_events()
+
+    def reload_failed(self, message):
+        """Flag that the edited files were rejected and the old schedules are shown
+
+        The title says so until a reload succeeds; the details are shown
+        once per version of the files.
+        """
+        self.reload_error = message
+        self.update_clock_text()
+        signature = (self.schedule_manager.file_signature(),
+                     self.schedule_manager.calendar_signature())
+        if signature == self.reported_reload_failure:
+            return
+        self.reported_reload_failure = signature
+        details = f"{message}\n\nThe previous schedules are still shown."
+        if self.tray_icon is not None and not self.isVisible() and self.tray_icon.supportsMessages():
+            self.tray_icon.showMessage('Schedules Not Reloaded', details,
+                                       QSystemTrayIcon.MessageIcon.Warning)
+        else:
+            box = QMessageBox(QMessageBox.Icon.Warning, 'Schedules Not Reloaded', details,
+                              QMessageBox.StandardButton.Ok, self)
+            box.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+            box.open()  # Does not block the display updates
+
+    def schedules_reloaded(self, staging):
+        """Swap in schedules reloaded from disk and refresh once"""
+        self.reload_error = None
+        self.reported_reload_failure = None
+        self.schedule_manager.adopt(staging)
+        self.rebuild_schedule_displays()
+        self.update_events()
+        self.reschedule_alarms()
+
+    def populate_organization_menu(self):
+        """List the organizations in the schedule file, checking the active one"""
+        self.organization_menu.clear()
+        for organization in self.schedule_manager.organizations:
+            action = QAction(organization.replace('_', ' ').title(), self)
+            action.setCheckable(True)
+            action.setChecked(organization == self.schedule_manager.organization)
+            action.triggered.connect(
+                lambda checked, org=organization: self.change_organization(org))
+            self.organization_group.addAction(action)
+            self.organization_menu.addAction(action)
+
+    def change_organization(self, organization):
+        """Show the schedules of another organization"""
+        if organization == self.schedule_manager.organization:
+            return
+        try:
+            self.schedule_manager.set_organization(organization)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load organization: {str(e)}")
+            return
+        self.rebuild_schedule_displays()
+        self.update_events()
+        self.reschedule_alarms()
+
     def show_color_settings(self):
+        from dialogs.color_settings import ColorSettingsDialog
         dialog = ColorSettingsDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.apply_styles()
 
+    def toggle_instrumentation(self, checked):
+        """Time the hot paths and write them to the metrics file every minute"""
+        if checked:
+            instrumentation.enable()
+            self.metrics_timer.start()
+        else:
+            self.dump_metrics()
+            self.metrics_timer.stop()
+            instrumentation.disable()
+
+    def dump_metrics(self):
+        if instrumentation.enabled:
+            instrumentation.dump(METRICS_FILE)
+
+    def show_metrics(self):
+        from dialogs.metrics_dialog import MetricsDialog
+        MetricsDialog(self).exec()
+
+    def toggle_profile_capture(self, checked):
+        """Start a cProfile/tracemalloc capture, or stop and save it"""
+        if checked:
+            instrumentation.start_capture()
+            return
+        try:
+            profile_path, memory_path = instrumentation.stop_capture(PROFILES_DIR)
+        except OSError as e:
+            QMessageBox.warning(self, 'Error', f'Could not save the profile: {e}')
+            return
+        QMessageBox.information(self, 'Profile Saved',
+                                f'Profile: {profile_path}\nMemory: {memory_path}')
+
     def closeEvent(self, event):
         """Handle the window close event"""
         reply = QMessageBox.question(self, 'Exit', 'Are you sure you want to exit?',
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                                      QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
+            self.schedule_writer.wait(5)  # Finish any pending save
+            if self.alarm_dispatcher is not None:
+                self.alarm_dispatcher.stop()
+            self.dump_metrics()
             event.accept()
             QApplication.quit()  # Ensure the application quits
         else:
@@ -372,7 +762,7 @@ class ScheduleWindow(BaseWindow):
                 self.pre_test_size_name = self.settings_manager.get_window_size_name()
                 self.setup_test_controls()
                 # Force test mode size
-                self.resize(WINDOW_SIZES['test_mode'])
+                self.resize(*WINDOW_SIZES['test_mode'])
             else:
                 self.test_mode_action.setChecked(False)
                 if ok:  # Only show error if user didn't cancel
@@ -385,23 +775,63 @@ class ScheduleWindow(BaseWindow):
                 self.test_container = None
                 # Restore previous size
                 saved_size = self.settings_manager.get_window_size_name()
-                self.resize(WINDOW_SIZES[saved_size])
-            self.test_mode = False
-            self.update_events()
+                self.resize(*WINDOW_SIZES[saved_size])
+            self.stop_test()
+            self.set_clock(system_clock)
 
     def restore_window_position(self):
         super().restore_window_position()
 
+    def showEvent(self, event):
+        """Refresh on show, e.g. after restoring from the tray or resuming"""
+        super().showEvent(event)
+        if hasattr(self, 'update_scheduler'):
+            self.update_events()
+
+    def hideEvent(self, event):
+        """Stop the countdowns while the window is hidden (e.g. in the tray)"""
+        super().hideEvent(event)
+        if hasattr(self, 'countdown_timer'):
+            self.countdown_timer.stop()
+
+    def changeEvent(self, event):
+        """Pause the countdowns while minimized and catch up when restored"""
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange and hasattr(self, 'countdown_timer'):
+            if self.isMinimized():
+                self.countdown_timer.stop()
+            else:
+                self.tick_countdowns()
+
     def set_test_time(self):
-        if self.test_mode:
+        """Move the simulated clock to the date and time entered"""
+        if self.clock.simulated:
+            day = self.date_edit.date().toPyDate()
             time = self.time_edit.time()
-            self.test_time = datetime.now().replace(
-                hour=time.hour(),
-                minute=time.minute(),
-                second=0
-            )
+            self.clock.set_time(datetime(day.year, day.month, day.day, time.hour(), time.minute()))
+            self.reschedule_alarms()
             self.update_events()
 
+    def change_simulation_speed(self):
+        """Run, pause or step the simulated clock as chosen in the speed box"""
+        if not self.clock.simulated:
+            return
+        rate = SIMULATION_SPEEDS[self.speed_combo.currentIndex()][1]
+        if rate is None:
+            self.clock.step(self.delay_spinner.value())
+        else:
+            self.clock.set_rate(rate)
+        if not rate:
+            self.show_test_time()
+        self.reschedule_alarms()
+        self.update_events()
+
+    def show_test_time(self):
+        """Put the simulated time in the date and time boxes, e.g. when paused"""
+        now = self.clock.now()
+        self.date_edit.setDate(QDate(now.year, now.month, now.day))
+        self.time_edit.setTime(QTime(now.hour, now.minute))
+
     def load_test_file(self):
         """Load and process a test file"""
         file_dialog = QFileDialog()
@@ -414,25 +844,14 @@ class ScheduleWindow(BaseWindow):
         
         if file_path:
             try:
-                with open(file_path, 'r') as f:
-                    times = f.readlines()
-                
-                # Clean up times and validate format
-                self.test_times = []
-                for t in times:
-                    t = t.strip()
-                    if t:
-                        try:
-                            # Validate time format
-                            datetime.strptime(t, "%H:%M")
-                            self.test_times.append(t)
-                        except ValueError:
-                            continue
+                self.test_times = TestFileHelper.read_test_times(file_path)
                 
                 if self.test_times:
                     self.current_test_index = 0
-                    self.test_time = datetime.strptime(self.test_times[0], "%H:%M")
-                    self.time_edit.setTime(QTime(self.test_time.hour, self.test_time.minute))
+                    self.speed_combo.setCurrentIndex(0)  # Paused: the file sets the times
+                    test_time = datetime.strptime(self.test_times[0], "%H:%M")
+                    self.time_edit.setTime(QTime(test_time.hour, test_time.minute))
+                    self.set_test_time()
                     
                     # Start timer for automated testing
                     if self.test_timer is None:
@@ -440,15 +859,16 @@ class ScheduleWindow(BaseWindow):
                         self.test_timer.timeout.connect(self.advance_test_time)
                     
                     delay_seconds = self.delay_spinner.value()
-                    self.test_timer.start(delay_seconds * 1000)  # Convert to milliseconds
-                    self.update_events()
+                    self.test_timer.start(int(delay_seconds * 1000))  # Convert to milliseconds
                 else:
                     QMessageBox.warning(self, "Error", "No valid times found in file")
             except Exception as e:
                 QMessageBox.warning(self, "Error", f"Failed to load test file: {str(e)}")
 
     def stop_test(self):
-        """Stop automated testing"""
+        """Stop automated testing and pause the simulated clock"""
+        if self.test_container is not None and self.speed_combo.currentIndex():
+            self.speed_combo.setCurrentIndex(0)
         if self.test_timer:
             self.test_timer.stop()
             self.test_timer = None
@@ -462,8 +882,8 @@ class ScheduleWindow(BaseWindow):
             if self.current_test_index < len(self.test_times):
                 try:
                     time_str = self.test_times[self.current_test_index].strip()
-                    self.test_time = datetime.strptime(time_str, "%H:%M")
-                    self.time_edit.setTime(QTime(self.test_time.hour, self.test_time.minute))
+                    test_time = datetime.strptime(time_str, "%H:%M")
+                    self.time_edit.setTime(QTime(test_time.hour, test_time.minute))
                     self.set_test_time()  # This will trigger the proper period updates
                 except ValueError as e:
                     print(f"Error parsing time: {e}")
@@ -492,7 +912,8 @@ class ScheduleWindow(BaseWindow):
                 self.settings_manager.save_tray_icon_path(file_path)
                 
                 # Update the tray icon
-                self.tray_icon.setIcon(icon)
+                if self.tray_icon is not None:
+                    self.tray_icon.setIcon(icon)
                 
                 QMessageBox.information(self, "Success", "Tray icon updated successfully")
             except Exception as e:
@@ -501,6 +922,7 @@ class ScheduleWindow(BaseWindow):
     def change_window_size(self):
         """Show dialog to change window size"""
         current_size = self.settings_manager.get_window_size_name()
+        from dialogs.window_size_dialog import WindowSizeDialog
         dialog = WindowSizeDialog(current_size, self)
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
@@ -508,8 +930,7 @@ class ScheduleWindow(BaseWindow):
             self.settings_manager.save_window_size_name(size_name)
             
             # Resize the window
-            new_size = WINDOW_SIZES[size_name]
-            self.setFixedSize(new_size)  # Force the size
+            self.setFixedSize(*WINDOW_SIZES[size_name])  # Force the size
             self.adjustSize()  # Make sure contents adjust
             
             # After a brief delay, remove the fixed size constraint
@@ -520,6 +941,7 @@ class ScheduleWindow(BaseWindow):
             
     def show_about(self):
         """Show the About dialog"""
+        from dialogs.about_dialog import AboutDialog
         dialog = AboutDialog(self)
         dialog.exec()
 
@@ -548,6 +970,7 @@ class ScheduleWindow(BaseWindow):
             )
 
     def show_message_settings(self):
+        from dialogs.message_settings import MessageSettingsDialog
         dialog = MessageSettingsDialog(self.settings_manager, self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             # Refresh messages in schedule manager